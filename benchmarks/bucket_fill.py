@@ -0,0 +1,133 @@
+"""
+Bucket Fill Benchmark
+Time per fill, and per-frame upkeep, for a session that alternates drawing
+closed shapes and filling them: the cached region map against OpenCV's
+flood fill and against labeling the whole canvas on every fill
+
+Usage:
+    python benchmarks/bucket_fill.py [--sizes 1280x720 3840x2160] [--shapes 60]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT, FILL_TILES_PER_FRAME  # noqa: E402
+from utils.canvas import Canvas  # noqa: E402
+
+METHODS = ['flood fill', 'label canvas', 'region map']
+
+
+def session(shapes, seed):
+    """
+    Closed shapes to draw, in display pixels
+
+    Returns:
+        List of (stroke points, point inside the shape)
+    """
+    rng = np.random.default_rng(seed)
+    result = []
+    for _ in range(shapes):
+        cx = rng.uniform(120, CAMERA_WIDTH - 120)
+        cy = rng.uniform(160, CAMERA_HEIGHT - 120)
+        rx, ry = rng.uniform(20, 110), rng.uniform(20, 90)
+        # One fingertip point per frame, a little past closing the loop
+        angles = np.linspace(0, 2.1 * np.pi, 45) + rng.uniform(0, 2 * np.pi)
+        points = np.column_stack([cx + rx * np.cos(angles), cy + ry * np.sin(angles)])
+        result.append((points, (cx, cy)))
+    return result
+
+
+def fill_once(method, canvas, point):
+    """Fill at a display point with the current ink, the way a method would"""
+    if method == 'region map':
+        return canvas.fill(point)
+
+    x = int(round(point[0] * canvas.scale_x))
+    y = int(round(point[1] * canvas.scale_y))
+    if canvas.canvas[y, x].any():
+        return None
+    if method == 'flood fill':
+        return cv2.floodFill(canvas.canvas, None, (x, y), canvas.current_color,
+                             (0, 0, 0), (0, 0, 0), 4)[0]
+    empty = cv2.inRange(canvas.canvas, (0, 0, 0), (0, 0, 0))
+    _, labels = cv2.connectedComponents(empty, connectivity=4)
+    region = labels == labels[y, x]
+    canvas.canvas[region] = canvas.current_color
+    return int(np.count_nonzero(region))
+
+
+def run(method, size, shapes):
+    """
+    Draw and fill every shape, then fill what is left of the background
+
+    Returns:
+        Dictionary of fill seconds, per-frame upkeep seconds, background
+        fill seconds, filled pixels and tiles relabeled
+    """
+    canvas = Canvas(*size)
+    canvas.set_display_size(CAMERA_WIDTH, CAMERA_HEIGHT)
+    canvas.fill_mode = method == 'region map'
+    rng = np.random.default_rng(1)
+
+    fills = []
+    upkeep = []
+    filled = 0
+    for points, inside in shapes:
+        canvas.current_color = (255, 255, 255)
+        for point in points:
+            canvas.draw(point)
+            start = time.perf_counter()
+            if canvas.fill_mode:
+                canvas.update_regions()
+            upkeep.append(time.perf_counter() - start)
+        canvas.reset_previous_point()
+
+        canvas.current_color = tuple(int(value) for value in rng.integers(40, 256, 3))
+        start = time.perf_counter()
+        painted = fill_once(method, canvas, inside)
+        fills.append(time.perf_counter() - start)
+        filled += painted or 0
+
+    canvas.current_color = (60, 40, 20)
+    start = time.perf_counter()
+    painted = fill_once(method, canvas, (5, CAMERA_HEIGHT - 5))
+    background = time.perf_counter() - start
+    filled += painted or 0
+
+    return {'fills': np.array(fills), 'upkeep': np.array(upkeep), 'background': background,
+            'filled': filled, 'relabeled': canvas.regions.relabeled_tiles}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', default=['1280x720', '3840x2160'],
+                        help="Canvas sizes, WIDTHxHEIGHT")
+    parser.add_argument('--shapes', type=int, default=60)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    shapes = session(args.shapes, args.seed)
+    print(f"{args.shapes} shapes drawn and filled, then the background; "
+          f"{FILL_TILES_PER_FRAME} tiles relabeled per frame while the tool is on")
+    print(f"{'canvas':>9} {'method':<12} | {'fill ms':>7} {'max':>6} | "
+          f"{'frame ms':>8} {'max':>6} | {'bg ms':>6} | {'pixels':>9} {'tiles':>6}")
+    for size_text in args.sizes:
+        size = tuple(int(value) for value in size_text.split('x'))
+        for method in METHODS:
+            result = run(method, size, shapes)
+            print(f"{size_text:>9} {method:<12} | {result['fills'].mean() * 1e3:>7.2f} "
+                  f"{result['fills'].max() * 1e3:>6.2f} | "
+                  f"{result['upkeep'].mean() * 1e3:>8.3f} {result['upkeep'].max() * 1e3:>6.2f} | "
+                  f"{result['background'] * 1e3:>6.1f} | {result['filled']:>9} "
+                  f"{result['relabeled']:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+Canvas Sync Benchmark
+Runs several synced stations on localhost and reports bandwidth, latency
+and whether every station ended with the same pixels, then checks that
+operations delivered late (replayed from checkpoints) give the same
+pixels as in-order delivery
+
+Usage:
+    python benchmarks/canvas_sync.py [--stations 4] [--strokes 50]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from config.settings import COLORS  # noqa: E402
+from utils.canvas_sync import (  # noqa: E402
+    SyncedCanvas, OP_SEGMENT, OP_STATE, NO_START, encode_op, decode_op
+)
+
+# Ink opacities the stations draw with (translucent ink must converge too)
+OPACITIES = [1.0, 0.5, 0.35]
+
+SENT_AT = {}
+
+
+class TimedCanvas(SyncedCanvas):
+    """Records when each local operation was created"""
+
+    def _local_op(self, op_type, payload):
+        SENT_AT[(self.lamport + 1, self.site)] = time.perf_counter()
+        super()._local_op(op_type, payload)
+
+
+def join(host, port):
+    """Create a joining station while the host keeps admitting"""
+    done = threading.Event()
+
+    def admit():
+        while not done.is_set():
+            host.poll()
+            time.sleep(0.001)
+
+    thread = threading.Thread(target=admit)
+    thread.start()
+    try:
+        return TimedCanvas(host='127.0.0.1', port=port)
+    finally:
+        done.set()
+        thread.join()
+
+
+def poll_all(stations, latencies):
+    """Apply received operations everywhere and record their latency"""
+    for station in stations:
+        for op in station.poll():
+            sent = SENT_AT.get((op[2], op[1]))
+            if sent is not None:
+                latencies.append(time.perf_counter() - sent)
+
+
+def settle(stations, latencies, seconds=2.0):
+    """Keep polling until the last messages have arrived"""
+    deadline = time.time() + seconds
+    while time.time() < deadline:
+        poll_all(stations, latencies)
+        time.sleep(0.01)
+
+
+def same_pixels(stations):
+    """Whether every station shows the first one's pixels"""
+    return all(np.array_equal(stations[0].canvas, station.canvas) for station in stations)
+
+
+def delivery_orders_match(count, late, delay, seed=0):
+    """
+    Apply the same operations in order and with some delivered late
+
+    Args:
+        count: Number of segment operations
+        late: Number of operations held back
+        delay: Operations that arrive before each held back one
+
+    Returns:
+        True if both stations end with the same pixels
+    """
+    rng = random.Random(seed)
+    ops = []
+    lamport = 0
+    for site in (1, 2):
+        lamport += 1
+        color = COLORS[rng.choice(list(COLORS))]
+        state = (color, rng.randint(2, 12), False, rng.choice(OPACITIES))
+        # As received over the wire
+        ops.append(decode_op(encode_op((OP_STATE, site, lamport, state))))
+    pen = (640, 360)
+    for _ in range(count):
+        lamport += 1
+        start = pen if rng.random() > 0.1 else (NO_START, NO_START)
+        pen = (min(1279, max(0, pen[0] + rng.randint(-40, 40))),
+               min(719, max(0, pen[1] + rng.randint(-40, 40))))
+        ops.append((OP_SEGMENT, rng.choice((1, 2)), lamport, (*start, *pen)))
+
+    # Each held back operation arrives after the next `delay` ones
+    order = list(range(len(ops)))
+    for index in sorted(rng.sample(range(2, len(ops) - delay), late)):
+        position = order.index(index)
+        order.insert(position + delay, order.pop(position))
+
+    stations = [SyncedCanvas(port=0), SyncedCanvas(port=0)]
+    try:
+        for op in ops:
+            stations[0]._apply(op)
+        for index in order:
+            stations[1]._apply(ops[index])
+        return np.array_equal(stations[0].canvas, stations[1].canvas)
+    finally:
+        for station in stations:
+            station.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--stations', type=int, default=4)
+    parser.add_argument('--strokes', type=int, default=50)
+    parser.add_argument('--points', type=int, default=40, help="Points per stroke")
+    parser.add_argument('--order-ops', type=int, default=400,
+                        help="Operations in the delivery order check")
+    args = parser.parse_args()
+
+    random.seed(0)
+    host = TimedCanvas(port=0)
+    port = host.transport.port
+    stations = [host] + [join(host, port) for _ in range(args.stations - 1)]
+    latencies = []
+
+    # Every station draws strokes at the same time, interleaved per frame
+    for _ in range(args.strokes):
+        for station in stations:
+            station.set_color(random.choice(list(COLORS)))
+            station.set_brush_size(random.randint(2, 12))
+            station.set_opacity(random.choice(OPACITIES))
+            station.reset_previous_point()
+            station.pen = (random.randint(0, 1279), random.randint(0, 719))
+        for _ in range(args.points):
+            for station in stations:
+                x, y = station.pen
+                station.pen = (min(1279, max(0, x + random.randint(-15, 15))),
+                               min(719, max(0, y + random.randint(-15, 15))))
+                station.draw(station.pen)
+            poll_all(stations, latencies)
+    settle(stations, latencies)
+    strokes_converged = same_pixels(stations)
+    stations[1].clear()
+
+    for station in stations:
+        station.reset_previous_point()
+    for i in range(args.points):
+        stations[0].draw((100 + i * 5, 300))
+        poll_all(stations, latencies)
+
+    settle(stations, latencies)
+
+    # The late joiner's catch-up is history, not live latency
+    late = join(host, port)
+    stations.append(late)
+    late.poll()
+
+    sent = sum(station.transport.bytes_sent for station in stations)
+    _, png = cv2.imencode('.png', host.canvas)
+    converged = same_pixels(stations)
+    latencies_ms = np.array(latencies) * 1000
+
+    print(f"Stations: {len(stations)} (1 late joiner)")
+    print(f"Operations in host log: {len(host.log)}")
+    print(f"Bytes sent (all stations): {sent}  "
+          f"({sent / max(1, len(latencies)):.1f} B per delivered op)")
+    print(f"One PNG of the canvas: {len(png)} B; raw frame: {host.canvas.nbytes} B")
+    if len(latencies_ms):
+        print(f"Latency ms: p50 {np.percentile(latencies_ms, 50):.2f}  "
+              f"p95 {np.percentile(latencies_ms, 95):.2f}  "
+              f"max {latencies_ms.max():.2f}")
+    print(f"Converged after the strokes: {strokes_converged}, at the end: {converged}")
+
+    for station in stations:
+        station.close()
+
+    same = delivery_orders_match(args.order_ops, late=8, delay=40)
+    print(f"Late delivery ({args.order_ops} ops, 8 held back 40 ops) "
+          f"gives the in-order pixels: {same}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Frame Memory Benchmark
+Measures per-frame image allocations of the detection and render path
+
+Usage:
+    python benchmarks/frame_memory.py [--frames 200] [--scale 0.5]
+
+The app's own frame path (run() from the mirrored frame to the finished
+output: HandDetector's inference buffers, the Compositor and the in-place
+UI) is compared against the old path that allocated a new frame at every
+stage. The MediaPipe graph is replaced by a stub that reports the same
+hand on every frame, so only the app's buffers are measured. Numpy
+reports its buffers to tracemalloc, so the per-frame peak shows transient
+image allocations.
+"""
+
+import argparse
+import os
+import sys
+import tracemalloc
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT, MIRROR_MODE  # noqa: E402
+from main import GestureDrawingApp  # noqa: E402
+from ui.manager import UIManager  # noqa: E402
+from utils.canvas import Canvas  # noqa: E402
+from utils.hand_detector import HandDetector  # noqa: E402
+from utils.synthetic_hands import hand_points  # noqa: E402
+
+
+class StubHands:
+    """Stands in for MediaPipe's Hands graph: the same hand on every frame"""
+
+    def __init__(self, **options):
+        # Hovering below the toolbar, so no button fires
+        points = hand_points('SELECT', (CAMERA_WIDTH * 0.6, CAMERA_HEIGHT * 0.6))
+        landmark = [SimpleNamespace(x=x / CAMERA_WIDTH, y=y / CAMERA_HEIGHT, z=0.0)
+                    for x, y in points]
+        self.results = SimpleNamespace(
+            multi_hand_landmarks=[SimpleNamespace(landmark=landmark)])
+
+    def process(self, rgb):
+        return self.results
+
+    def close(self):
+        pass
+
+
+def stub_detector(scale):
+    """A real HandDetector whose MediaPipe graph is a StubHands"""
+    mediapipe = SimpleNamespace(solutions=SimpleNamespace(
+        hands=SimpleNamespace(Hands=StubHands)))
+    with mock.patch.dict(sys.modules, {'mediapipe': mediapipe}):
+        detector = HandDetector()
+    detector.set_inference_scale(scale)
+    return detector
+
+
+class FrameHarness(GestureDrawingApp):
+    """The app's per-frame path, without camera or window"""
+
+    def __init__(self, detector):
+        self.sources = []
+        self.sync = None
+        self.hand_detector = detector
+        self._init_core()
+
+    def render(self, raw):
+        """One frame of run(), from the camera frame to the output"""
+        frame = self.compositor.mirror(raw) if MIRROR_MODE == 'pixels' else raw
+        landmarks_list = self._detect_landmarks(frame)
+        self.canvas.set_display_size(frame.shape[1], frame.shape[0])
+        self._process_landmarks(landmarks_list)
+        return self._render_frame(frame, landmarks_list)
+
+
+def legacy_frame(raw, hands, canvas, ui, scale):
+    """One frame of the original path (new array per stage)"""
+    frame = cv2.flip(raw, 1)
+    small = frame
+    if scale < 1.0:
+        small = cv2.resize(frame, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    hands.process(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+    output = cv2.addWeighted(frame, 0.5, canvas.get_preview(), 0.8, 0)
+    overlay = output.copy()
+    cv2.addWeighted(overlay, 0.7, output, 0.3, 0, output)
+    ui.draw_ui(output, canvas.current_color, canvas.brush_size, 'SELECTION', 'SELECT')
+
+
+def measure(render, frames):
+    """Return (mean transient peak bytes per frame, net bytes retained per frame)"""
+    # Warm up so pooled buffers exist before measuring
+    for _ in range(5):
+        render()
+
+    tracemalloc.start()
+    start_current, _ = tracemalloc.get_traced_memory()
+    transient = 0
+    for _ in range(frames):
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        render()
+        _, peak = tracemalloc.get_traced_memory()
+        transient += peak - before
+    end_current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return transient / frames, (end_current - start_current) / frames
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--frames', type=int, default=200)
+    parser.add_argument('--scale', type=float, default=1.0,
+                        help="Inference scale (below 1.0 adds the resize buffer)")
+    args = parser.parse_args()
+
+    raw = np.random.randint(0, 255, (CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    canvas, ui, hands = Canvas(), UIManager(), StubHands()
+    app = FrameHarness(stub_detector(args.scale))
+    paths = (
+        ('legacy', lambda: legacy_frame(raw, hands, canvas, ui, args.scale)),
+        ('pooled', lambda: app.render(raw)),
+    )
+
+    print(f"Frame size: {CAMERA_WIDTH}x{CAMERA_HEIGHT}, {args.frames} frames, "
+          f"inference scale {args.scale}")
+    for name, render in paths:
+        transient, retained = measure(render, args.frames)
+        print(f"  {name:<8} {transient / 1e6:>8.2f} MB transient peak/frame  "
+              f"{retained:>8.0f} B retained/frame")
+    print(f"Detector buffers: {app.hand_detector.pool.allocations} allocations, "
+          f"{app.hand_detector.pool.nbytes() / 1e6:.2f} MB held")
+
+
+if __name__ == "__main__":
+    main()
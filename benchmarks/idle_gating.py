@@ -0,0 +1,208 @@
+"""
+Idle Gating Benchmark
+CPU per frame with and without idle gating on a synthetic kiosk scene
+(static background, sensor noise, slow lighting drift, and a hand that
+walks in, draws and leaves), plus false wake-ups and wake-up latency
+
+Usage:
+    python benchmarks/idle_gating.py [--cycles 3] [--static 20] [--noise 3]
+                                     [--drift 12] [--no-inference]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT, IDLE_TIMEOUT  # noqa: E402
+from utils.idle_gate import IdleGate  # noqa: E402
+from utils.synthetic_hands import hand_points  # noqa: E402
+
+SKIN = (150, 180, 220)
+
+# Landmark chains painted as the synthetic hand
+HAND_CHAINS = [[0, 1, 2, 3, 4], [0, 5, 6, 7, 8], [9, 10, 11, 12],
+               [13, 14, 15, 16], [0, 17, 18, 19, 20], [5, 9, 13, 17]]
+
+
+class KioskScene:
+    """
+    Camera frames of an empty station that someone visits now and then
+
+    Each cycle is `static` seconds of empty scene followed by a visit: the
+    hand walks in from the right, draws for a while and walks out.
+    """
+
+    def __init__(self, fps, static, visit, noise, drift, seed):
+        self.fps = fps
+        self.static_frames = int(static * fps)
+        self.visit_frames = int(visit * fps)
+        self.noise = noise
+        self.drift = drift
+        self.rng = np.random.default_rng(seed)
+
+        # Smooth texture so the background is not a flat color
+        texture = self.rng.uniform(40, 160, (CAMERA_HEIGHT // 40, CAMERA_WIDTH // 40, 3))
+        background = cv2.resize(texture.astype(np.float32), (CAMERA_WIDTH, CAMERA_HEIGHT),
+                                interpolation=cv2.INTER_CUBIC)
+        # A few noisy copies, cycled (lighting is added per frame)
+        self.noisy = [np.clip(background + self.rng.normal(
+            0, noise, (CAMERA_HEIGHT, CAMERA_WIDTH, 1)), 0, 255).astype(np.uint8)
+            for _ in range(8)]
+        self.frame = np.empty((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+
+    def tip(self, frame_id):
+        """Index fingertip position, or None when nobody is there"""
+        cycle = self.static_frames + self.visit_frames
+        t = frame_id % cycle - self.static_frames
+        if t < 0:
+            return None
+        # Walk in for a fifth of the visit, draw, walk out for a fifth
+        walk = self.visit_frames // 5
+        enter_x = CAMERA_WIDTH + 200
+        if t < walk:
+            x = enter_x - (enter_x - 700) * t / walk
+        elif t >= self.visit_frames - walk:
+            x = 700 + (enter_x - 700) * (t - (self.visit_frames - walk)) / walk
+        else:
+            x = 700 - 200 * np.sin(2 * np.pi * (t - walk) / (2 * self.fps))
+        return (x, 360 + 80 * np.cos(2 * np.pi * t / (3 * self.fps)))
+
+    def render(self, frame_id):
+        """
+        Paint one frame
+
+        Returns:
+            Tuple (BGR frame, whether any of the hand is in view)
+        """
+        light = self.drift * np.sin(2 * np.pi * frame_id / (60 * self.fps))
+        cv2.add(self.noisy[frame_id % len(self.noisy)], (light, light, light, 0),
+                dst=self.frame)
+
+        tip = self.tip(frame_id)
+        in_view = False
+        if tip is not None:
+            points = hand_points('DRAW', tip, hand_size=130).astype(np.int32)
+            in_view = bool((points[:, 0] < CAMERA_WIDTH).any())
+            for chain in HAND_CHAINS:
+                cv2.polylines(self.frame, [points[chain]], False, SKIN, 22)
+        return self.frame, in_view
+
+
+def run(scene, frames, gated, detector):
+    """
+    Push the scene through the gate and detection
+
+    Returns:
+        Dictionary of CPU seconds in static and visit frames, frame counts,
+        wake-ups, false wake-ups, visit frames skipped and wake-up delays
+    """
+    clock = [0.0]
+    gate = IdleGate(clock=lambda: clock[0]) if gated else None
+    cpu = {'static': 0.0, 'visit': 0.0}
+    counts = {'static': 0, 'visit': 0}
+    missed = 0
+    false_wakes = 0
+    delays = []
+    entered = None
+
+    for frame_id in range(frames):
+        frame, in_view = scene.render(frame_id)
+        clock[0] = frame_id / scene.fps
+        phase = 'visit' if in_view else 'static'
+        if in_view and entered is None:
+            entered = frame_id
+        elif not in_view:
+            entered = None
+
+        start = time.process_time()
+        was_idle = gate.idle if gate else False
+        run_detection = gate.update(frame) if gate else True
+        if run_detection:
+            found = detector(frame) if detector else in_view
+            if gate:
+                gate.report_hands(found)
+        cpu[phase] += time.process_time() - start
+        counts[phase] += 1
+
+        if gate and was_idle and not gate.idle:
+            if in_view:
+                delays.append(frame_id - entered)
+            else:
+                false_wakes += 1
+        if in_view and not run_detection:
+            missed += 1
+
+    return {'cpu': cpu, 'counts': counts, 'missed': missed,
+            'false_wakes': false_wakes, 'delays': delays,
+            'skipped': gate.skipped_frames if gate else 0}
+
+
+def mediapipe_detector():
+    """Hand check backed by MediaPipe: a function of a frame, True if it has a hand"""
+    from utils.hand_detector import HandDetector
+
+    hand_detector = HandDetector()
+
+    def detect(frame):
+        _, results = hand_detector.find_hands(frame, draw=False)
+        return bool(hand_detector.get_landmarks(results, frame.shape))
+
+    return detect
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--cycles', type=int, default=3)
+    parser.add_argument('--static', type=float, default=20.0,
+                        help="Seconds of empty scene before each visit")
+    parser.add_argument('--visit', type=float, default=8.0, help="Seconds per visit")
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--noise', type=float, default=3.0,
+                        help="Sensor noise (gray levels, standard deviation)")
+    parser.add_argument('--drift', type=float, default=12.0,
+                        help="Lighting drift amplitude (gray levels, one minute period)")
+    parser.add_argument('--no-inference', action='store_true',
+                        help="Skip MediaPipe (only the gate's own cost is measured)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    detector = None if args.no_inference else mediapipe_detector()
+
+    scene = KioskScene(args.fps, args.static, args.visit, args.noise, args.drift, args.seed)
+    frames = args.cycles * (scene.static_frames + scene.visit_frames)
+    print(f"{args.cycles} visits after {args.static:.0f} s of empty scene, "
+          f"{args.fps:.0f} fps, noise {args.noise}, drift ±{args.drift}, "
+          f"idle after {IDLE_TIMEOUT:.0f} s, "
+          f"inference {'off' if args.no_inference else 'MediaPipe'}")
+
+    print(f"{'':<12} | {'empty scene':>22} | {'visit':>22}")
+    print(f"{'':<12} | {'ms/frame':>10} {'% core':>11} | {'ms/frame':>10} {'% core':>11}")
+    results = {}
+    for gated in (False, True):
+        result = run(scene, frames, gated, detector)
+        results[gated] = result
+        row = []
+        for phase in ('static', 'visit'):
+            per_frame = result['cpu'][phase] / max(1, result['counts'][phase])
+            row.append(f"{per_frame * 1e3:>10.2f} {100 * per_frame * args.fps:>10.1f}%")
+        print(f"{'idle gating' if gated else 'always on':<12} | {row[0]} | {row[1]}")
+
+    gated = results[True]
+    delays = gated['delays']
+    print(f"\nframes not sent to detection: {gated['skipped']} of {frames}")
+    print(f"wake-ups on a visit: {len(delays)} of {args.cycles}, "
+          f"false wake-ups: {gated['false_wakes']}, "
+          f"visit frames skipped: {gated['missed']}")
+    if delays:
+        print(f"wake-up delay after the hand enters: mean {np.mean(delays):.1f} frames, "
+              f"max {max(delays)} frames")
+
+
+if __name__ == "__main__":
+    main()
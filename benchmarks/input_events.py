@@ -0,0 +1,133 @@
+"""
+Input Events Benchmark
+Handler work per displayed frame when hand sources deliver results faster
+than the display, with only the newest result handled (what multi-source
+mode did before the event bus), with every result handled, and with every
+result handled and move events coalesced
+
+Usage:
+    python benchmarks/input_events.py [--sources 1 2 4] [--rate 120] [--display 30]
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT  # noqa: E402
+from main import GestureDrawingApp  # noqa: E402
+from gestures.events import BEGIN, MOVE  # noqa: E402
+from utils.synthetic_hands import SyntheticHandStream  # noqa: E402
+
+MODES = ['latest only', 'all results', 'all, coalesced']
+
+GESTURES = ('DRAW', 'SELECT', 'CLEAR', 'ADJUST')
+
+
+class EventHarness(GestureDrawingApp):
+    """The app's gesture handlers on a shared canvas, without camera or window"""
+
+    def __init__(self, sources, clock, coalesce):
+        self.sources = list(range(sources))
+        self.sync = None
+        self.hand_detector = None
+        self._init_core()
+
+        self.canvas.set_display_size(CAMERA_WIDTH, CAMERA_HEIGHT)
+        self.ui_manager.clock = clock
+        self.source_states = [{'canvas': self.canvas, 'previous_point': None,
+                               'current_mode': 'NONE', 'current_gesture': 'NONE'}
+                              for _ in range(sources)]
+
+        self.events.clock = clock
+        if not coalesce:
+            for subscription in self.events.subscriptions:
+                subscription['coalesce'] = False
+
+        # Counted after the app's handlers: gestures seen and points inked
+        self.begins = 0
+        self.ink = 0
+        self.events.subscribe(self._count_begin, kinds=(BEGIN,))
+        self.events.subscribe(self._count_ink, names=('DRAW',), kinds=(MOVE,))
+
+    def _count_begin(self, event):
+        self.begins += 1
+
+    def _count_ink(self, event):
+        self.ink += 1
+
+
+def run(mode, sources, rate, display, seconds, seed):
+    """
+    Feed every source's results into the handlers once per displayed frame
+
+    Returns:
+        Dictionary with handler calls and seconds per displayed frame,
+        gestures begun, points inked and moves coalesced
+    """
+    clock_time = [0.0]
+    harness = EventHarness(sources, lambda: clock_time[0],
+                           coalesce=mode == 'all, coalesced')
+    streams = [SyntheticHandStream(hands=1, rate=rate, gestures=GESTURES,
+                                   seed=seed + source) for source in range(sources)]
+
+    frames = int(seconds * display)
+    per_frame = rate / display
+    produced = 0.0
+    calls = 0
+    elapsed = 0.0
+    with contextlib.redirect_stdout(io.StringIO()):
+        for frame in range(frames):
+            # Results that arrived since the previous displayed frame
+            due = int((frame + 1) * per_frame) - int(produced)
+            produced += per_frame
+            backlogs = [[streams[source].next_frame()[0] for _ in range(due)]
+                        for source in range(sources)]
+            clock_time[0] = (frame + 1) / display
+
+            start = time.perf_counter()
+            for source, backlog in enumerate(backlogs):
+                if mode == 'latest only':
+                    backlog = backlog[-1:]
+                harness._enter_source(source)
+                for landmarks_list in backlog:
+                    harness._publish_landmarks(landmarks_list, source)
+                calls += harness.events.dispatch()
+                harness._leave_source(source)
+            elapsed += time.perf_counter() - start
+
+    return {'calls': calls / frames, 'seconds': elapsed / frames,
+            'begins': harness.begins, 'ink': harness.ink,
+            'coalesced': harness.events.coalesced}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sources', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--rate', type=float, default=120.0,
+                        help="Results per second from each source")
+    parser.add_argument('--display', type=float, default=30.0,
+                        help="Frames per second the loop displays")
+    parser.add_argument('--seconds', type=float, default=20.0,
+                        help="Stream length (in stream time, not wall time)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{args.rate:.0f} results/s per source, displayed at {args.display:.0f} fps, "
+          f"{args.seconds:.0f} s")
+    print(f"{'sources':>7} {'mode':<15} | {'calls/frame':>11} {'ms/frame':>9} | "
+          f"{'gestures':>8} {'ink pts':>8} {'coalesced':>9}")
+    for sources in args.sources:
+        for mode in MODES:
+            result = run(mode, sources, args.rate, args.display, args.seconds, args.seed)
+            print(f"{sources:>7} {mode:<15} | {result['calls']:>11.1f} "
+                  f"{result['seconds'] * 1e3:>9.2f} | {result['begins']:>8} "
+                  f"{result['ink']:>8} {result['coalesced']:>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,365 @@
+"""
+Motion-to-Photon Latency Benchmark
+Drives the full app from a synthetic camera whose fingertip path is known
+and measures how long each captured frame takes to show up as ink
+
+Usage:
+    python benchmarks/latency.py [--seconds 10] [--mode async] [--scale 0.5]
+                                 [--complexity 0] [--mirror landmarks]
+                                 [--no-inference] [--no-adaptive]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2  # noqa: E402
+import numpy as np  # noqa: E402
+
+import main as app_module  # noqa: E402
+from config.settings import (  # noqa: E402
+    CAMERA_WIDTH, CAMERA_HEIGHT, DEFAULT_BRUSH_SIZE, MODEL_COMPLEXITY
+)
+from utils.synthetic_hands import hand_points, to_landmarks  # noqa: E402
+
+# Frame id tag: one block per bit along the top edge, written from both
+# sides so it reads the same whether or not the frame was mirrored
+TAG_BITS = 24
+TAG_BLOCK = 8
+
+BACKGROUND = (60, 60, 60)
+SKIN = (150, 180, 220)
+
+# Landmark chains painted as the synthetic hand
+HAND_CHAINS = [[0, 1, 2, 3, 4], [0, 5, 6, 7, 8], [9, 10, 11, 12],
+               [13, 14, 15, 16], [0, 17, 18, 19, 20], [5, 9, 13, 17]]
+
+# Frames whose ink has not appeared after this long count as missed
+MISS_AFTER = 1.0
+
+
+class FingertipPath:
+    """
+    Back-and-forth sweep in display pixels
+
+    Rows are further apart than a stroke is wide, so the path never runs
+    over its own ink and new ink at a point belongs to exactly one frame.
+    """
+
+    def __init__(self, speed, fps, width=CAMERA_WIDTH, height=CAMERA_HEIGHT,
+                 margin=100, top=200, row_gap=40):
+        self.step = speed / fps
+        self.x0, self.x1 = margin, width - margin
+        self.top = top
+        self.row_gap = row_gap
+        self.rows = (height - margin // 2 - top) // row_gap + 1
+
+    def point(self, frame_id):
+        """
+        Fingertip position at a frame
+
+        Returns:
+            Tuple (x, y) in display pixels, or None past the end of the path
+        """
+        row_length = self.x1 - self.x0
+        distance = frame_id * self.step
+        row, along = divmod(distance, row_length + self.row_gap)
+        row = int(row)
+        if row >= self.rows - 1 and along > row_length:
+            return None
+
+        y = self.top + row * self.row_gap
+        if along <= row_length:
+            offset = along
+        else:
+            offset = row_length
+            y += along - row_length
+        x = self.x0 + offset if row % 2 == 0 else self.x1 - offset
+        return (int(round(x)), int(round(y)))
+
+
+def write_tag(image, frame_id):
+    """Stamp a frame id into the top edge (mirror-symmetric)"""
+    width = image.shape[1]
+    for bit in range(TAG_BITS):
+        value = 255 if (frame_id >> bit) & 1 else 0
+        x = bit * TAG_BLOCK
+        image[:TAG_BLOCK, x:x + TAG_BLOCK] = value
+        image[:TAG_BLOCK, width - x - TAG_BLOCK:width - x] = value
+    # Orientation mark: bright bottom-left corner on the raw frame
+    image[-TAG_BLOCK:, :TAG_BLOCK] = 255
+    image[-TAG_BLOCK:, -TAG_BLOCK:] = 0
+
+
+def read_tag(image):
+    """
+    Recover the frame id stamped by write_tag
+
+    Returns:
+        Tuple (frame_id, flipped)
+    """
+    frame_id = 0
+    for bit in range(TAG_BITS):
+        x = bit * TAG_BLOCK + TAG_BLOCK // 2
+        if image[TAG_BLOCK // 2, x, 0] > 127:
+            frame_id |= 1 << bit
+    flipped = image[-TAG_BLOCK // 2, -TAG_BLOCK // 2, 0] > 127
+    return frame_id, bool(flipped)
+
+
+class SyntheticCamera:
+    """
+    cv2.VideoCapture stand-in that paints a hand following a FingertipPath
+
+    Frames are "captured" on a fixed clock. A slow reader gets the newest
+    frame (like a camera with a one-frame buffer) and the frames in between
+    are dropped; a fast reader waits for the next one.
+    """
+
+    def __init__(self, path, fps, seconds, mirror_mode):
+        self.path = path
+        self.fps = fps
+        self.frame_limit = int(seconds * fps)
+        self.mirror_mode = mirror_mode
+
+        self.start = None
+        self.last_id = -1
+        self.dropped = 0
+        # (frame_id, capture_time) handed out and not yet claimed by the probe
+        self.delivered = []
+
+    def isOpened(self):
+        return True
+
+    def set(self, prop, value):
+        return False
+
+    def release(self):
+        pass
+
+    @property
+    def finished(self):
+        """Whether the next read would run past the end of the session"""
+        next_id = self.last_id + 1
+        return next_id >= self.frame_limit or self.path.point(next_id) is None
+
+    def read(self, image=None):
+        """Return the newest frame, waiting for it if necessary"""
+        now = time.perf_counter()
+        if self.start is None:
+            self.start = now
+
+        frame_id = int((now - self.start) * self.fps)
+        if frame_id <= self.last_id:
+            frame_id = self.last_id + 1
+            time.sleep(max(0.0, self.start + frame_id / self.fps - now))
+        if frame_id >= self.frame_limit:
+            return False, None
+        tip = self.path.point(frame_id)
+        if tip is None:
+            return False, None
+
+        self.dropped += frame_id - self.last_id - 1
+        self.last_id = frame_id
+
+        if image is None or image.shape != (CAMERA_HEIGHT, CAMERA_WIDTH, 3):
+            image = np.empty((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+        self._paint(image, frame_id, tip)
+
+        self.delivered.append((frame_id, self.start + frame_id / self.fps))
+        return True, image
+
+    def _paint(self, image, frame_id, tip):
+        """Draw the hand as the raw (unmirrored) camera would see it"""
+        image[:] = BACKGROUND
+        points = hand_points('DRAW', tip, mirrored=self.mirror_mode != 'none')
+        if self.mirror_mode != 'none':
+            points[:, 0] = CAMERA_WIDTH - 1 - points[:, 0]
+        points = np.rint(points).astype(np.int32)
+
+        cv2.polylines(image, [points[chain] for chain in HAND_CHAINS],
+                      False, SKIN, 18)
+        # Dark joint dots give optical flow something to lock on to
+        for x, y in points:
+            cv2.circle(image, (int(x), int(y)), 3, (40, 60, 90), -1)
+        write_tag(image, frame_id)
+
+
+class ScriptedDetector:
+    """
+    Hand detector that reports the pose the synthetic camera painted
+
+    When wrapping a real HandDetector, inference still runs on every frame
+    it is given, so the pipeline pays the real cost of the chosen model and
+    resolution; only the landmarks come from the script.
+    """
+
+    def __init__(self, path, mirror_mode, detector=None):
+        self.path = path
+        self.mirror_mode = mirror_mode
+        self.detector = detector
+
+    def set_inference_scale(self, scale):
+        if self.detector:
+            self.detector.set_inference_scale(scale)
+
+    def set_model_complexity(self, model_complexity):
+        if self.detector:
+            self.detector.set_model_complexity(model_complexity)
+
+    def warm_up(self, frame_shape):
+        if self.detector:
+            self.detector.warm_up(frame_shape)
+
+    def find_hands(self, frame, draw=True):
+        results = None
+        if self.detector:
+            frame, results = self.detector.find_hands(frame, draw=False)
+        return frame, (read_tag(frame), results)
+
+    def draw_hands(self, frame, results):
+        if self.detector and results[1] is not None:
+            self.detector.draw_hands(frame, results[1])
+        return frame
+
+    def get_landmarks(self, results, frame_shape):
+        (frame_id, flipped), _ = results
+        tip = self.path.point(frame_id)
+        if tip is None:
+            return []
+
+        points = hand_points('DRAW', tip, mirrored=self.mirror_mode != 'none')
+        # Report coordinates of the frame that was actually seen; the app
+        # mirrors them itself in 'landmarks' mode
+        if self.mirror_mode != 'none' and not flipped:
+            points[:, 0] = frame_shape[1] - 1 - points[:, 0]
+        return [to_landmarks(points)]
+
+    def close(self):
+        if self.detector:
+            self.detector.close()
+
+
+class LatencyProbeApp(app_module.GestureDrawingApp):
+    """
+    GestureDrawingApp fed by a SyntheticCamera, with the display replaced
+    by an ink probe
+
+    Each frame is shown right after compositing, so the probe looks at the
+    canvas preview that was just blended into the output. A captured frame
+    has landed once ink appears within tolerance of its fingertip.
+    """
+
+    def __init__(self, camera, detector, tolerance):
+        self.camera = camera
+        self.scripted_detector = detector
+        self.tolerance = tolerance
+
+        self.pending = {}  # frame_id -> (capture_time, display point)
+        self.latencies = []
+        self.missed = 0
+        self.frames_shown = 0
+        super().__init__()
+
+    def _create_detector(self):
+        return self.scripted_detector
+
+    def _open_camera(self):
+        self.cap = self.camera
+        self.profiler.mark('camera_opened')
+
+    def _show_frame(self, frame):
+        shown = time.perf_counter()
+        for frame_id, captured in self.camera.delivered:
+            self.pending[frame_id] = (captured, self.camera.path.point(frame_id))
+        self.camera.delivered.clear()
+
+        ink = self.canvas.get_preview()
+        for frame_id, (captured, point) in list(self.pending.items()):
+            if self._has_ink(ink, point):
+                self.latencies.append(shown - captured)
+                del self.pending[frame_id]
+            elif shown - captured > MISS_AFTER:
+                self.missed += 1
+                del self.pending[frame_id]
+
+        self.frames_shown += 1
+        if self.camera.finished:
+            self.running = False
+        return 0xFF
+
+    def _has_ink(self, ink, point):
+        """Whether any canvas pixel near point is painted"""
+        x, y = point
+        t = self.tolerance
+        return bool(ink[max(0, y - t):y + t + 1, max(0, x - t):x + t + 1].any())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--fps', type=float, default=30.0, help="Camera frame rate")
+    parser.add_argument('--speed', type=float, default=480.0,
+                        help="Fingertip speed in pixels per second")
+    parser.add_argument('--mode', choices=['every_frame', 'interval', 'async'],
+                        default=app_module.INFERENCE_MODE)
+    parser.add_argument('--mirror', choices=['pixels', 'landmarks', 'none'],
+                        default=app_module.MIRROR_MODE)
+    parser.add_argument('--scale', type=float, default=1.0, help="Inference scale")
+    parser.add_argument('--complexity', type=int, choices=[0, 1],
+                        default=MODEL_COMPLEXITY)
+    parser.add_argument('--tolerance', type=int, default=3,
+                        help="Pixels between the true fingertip and its ink")
+    parser.add_argument('--no-inference', action='store_true',
+                        help="Skip MediaPipe (measures the rest of the pipeline)")
+    parser.add_argument('--no-adaptive', action='store_true',
+                        help="Keep the quality level fixed")
+    args = parser.parse_args()
+
+    # The app reads these module-level settings
+    app_module.INFERENCE_MODE = args.mode
+    app_module.MIRROR_MODE = args.mirror
+
+    path = FingertipPath(args.speed, args.fps)
+    if path.step < 2 * (args.tolerance + DEFAULT_BRUSH_SIZE):
+        print("⚠️  Fingertip moves less than a stroke width per frame; "
+              "raise --speed or latencies will read low")
+
+    detector = None
+    if not args.no_inference:
+        from utils.hand_detector import HandDetector
+        detector = HandDetector(model_complexity=args.complexity)
+        detector.set_inference_scale(args.scale)
+
+    camera = SyntheticCamera(path, args.fps, args.seconds, args.mirror)
+    app = LatencyProbeApp(camera, ScriptedDetector(path, args.mirror, detector),
+                          args.tolerance)
+    if args.no_adaptive:
+        app.quality_controller = None
+
+    started = time.perf_counter()
+    app.run()
+    elapsed = time.perf_counter() - started
+
+    latencies_ms = np.array(app.latencies) * 1000
+    print("\n" + "=" * 60)
+    print(f"Mode: {args.mode} | mirror: {args.mirror} | inference: "
+          f"{'off' if args.no_inference else f'scale {args.scale}, complexity {args.complexity}'}")
+    print(f"Camera: {args.fps:.0f} fps, {camera.last_id + 1} captured, "
+          f"{camera.dropped} dropped | loop: {app.frames_shown / elapsed:.1f} fps")
+    print(f"Ink landed: {len(latencies_ms)} | missed: {app.missed} | "
+          f"pending at exit: {len(app.pending)}")
+    if len(latencies_ms):
+        print(f"Latency ms: mean {latencies_ms.mean():.1f}  "
+              f"p50 {np.percentile(latencies_ms, 50):.1f}  "
+              f"p95 {np.percentile(latencies_ms, 95):.1f}  "
+              f"p99 {np.percentile(latencies_ms, 99):.1f}  "
+              f"max {latencies_ms.max():.1f}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Multi-Source Scaling Benchmark
+Measures detection throughput of MultiSourceDetector as sources are added
+
+Usage:
+    python benchmarks/multi_source_scaling.py VIDEO [--max-sources 4] [--seconds 10]
+
+Each "camera" is a copy of the same video file, so the numbers show how
+well the worker processes spread across cores.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.multi_source import MultiSourceDetector  # noqa: E402
+
+
+def measure(video, num_sources, seconds):
+    """Run num_sources copies of the video and return detections per second"""
+    detector = MultiSourceDetector([video] * num_sources)
+    try:
+        # Let every worker finish loading its model before timing
+        while sum(detector.frame_counts) < num_sources:
+            detector.poll()
+            if detector.all_finished():
+                break
+
+        start_counts = sum(detector.frame_counts)
+        start = time.time()
+        while time.time() - start < seconds and not detector.all_finished():
+            detector.poll()
+        elapsed = time.time() - start
+        return (sum(detector.frame_counts) - start_counts) / elapsed
+    finally:
+        detector.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('video', help="Video file standing in for a camera")
+    parser.add_argument('--max-sources', type=int, default=os.cpu_count() or 4)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'sources':>8} {'fps':>10} {'speedup':>8} {'efficiency':>10}")
+    for num_sources in range(1, args.max_sources + 1):
+        fps = measure(args.video, num_sources, args.seconds)
+        baseline = baseline or fps
+        speedup = fps / baseline if baseline else 0
+        print(f"{num_sources:>8} {fps:>10.1f} {speedup:>8.2f} "
+              f"{speedup / num_sources:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
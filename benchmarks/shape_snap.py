@@ -0,0 +1,134 @@
+"""
+Shape Snap Benchmark
+Per-point cost of incremental shape fitting, the pause when a stroke ends
+(fit, undo of the freehand ink and redraw) and recognition accuracy, for
+strokes of hundreds to thousands of points
+
+Usage:
+    python benchmarks/shape_snap.py [--lengths 200 250 1000 4000 10000] [--noise 2]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from utils.canvas import Canvas  # noqa: E402
+from utils.shapes import ShapeFitter  # noqa: E402
+
+SHAPES = ['line', 'circle', 'ellipse', 'rectangle', 'triangle', 'scribble']
+
+# What each test shape should be recognized as
+EXPECTED = {'line': 'line', 'circle': 'circle', 'ellipse': 'ellipse',
+            'rectangle': 'rectangle', 'triangle': 'polygon', 'scribble': None}
+
+
+def outline(kind, count, rng):
+    """Points along a test shape, in drawing order"""
+    t = np.linspace(0.0, 1.0, count)
+    if kind == 'line':
+        return np.c_[200 + 800 * t, 150 + 400 * t]
+    if kind == 'circle':
+        angle = 2 * np.pi * t
+        return np.c_[640 + 250 * np.cos(angle), 360 + 250 * np.sin(angle)]
+    if kind == 'ellipse':
+        angle = 2 * np.pi * t
+        x, y = 380 * np.cos(angle), 180 * np.sin(angle)
+        return np.c_[640 + x * 0.94 - y * 0.34, 360 + x * 0.34 + y * 0.94]
+    if kind in ('rectangle', 'triangle'):
+        corners = np.array([(340, 160), (940, 160), (940, 560), (340, 560)]
+                           if kind == 'rectangle' else
+                           [(340, 560), (940, 560), (640, 140)], dtype=np.float64)
+        corners = np.vstack([corners, corners[:1]])
+        position = t * (len(corners) - 1)
+        index = np.minimum(position.astype(int), len(corners) - 2)
+        frac = (position - index)[:, None]
+        return corners[index] * (1 - frac) + corners[index + 1] * frac
+    # Scribble: a wandering path that is no shape at all
+    steps = rng.normal(0, 1, (count, 2)) * 6
+    steps = np.cumsum(np.cumsum(steps, axis=0) * 0.05, axis=0)
+    path = 640 + steps - steps.mean(axis=0)
+    return np.clip(path, 20, (1260, 700))
+
+
+def run(kind, count, noise, rng):
+    """
+    Draw one stroke on a canvas with snapping on
+
+    Returns:
+        Dictionary with per-point and end-of-stroke timings, the fit from
+        scratch for comparison, and the recognized shape
+    """
+    points = outline(kind, count, rng) + rng.normal(0, noise, (count, 2))
+    canvas = Canvas()
+    canvas.snap_shapes = True
+
+    per_point = []
+    for point in points:
+        start = time.perf_counter()
+        canvas.draw(tuple(point))
+        per_point.append(time.perf_counter() - start)
+    # Time only the fitting share of the per-point cost
+    fitter = ShapeFitter(5)
+    fit_per_point = time.perf_counter()
+    for point in points.astype(int):
+        fitter.add((int(point[0]), int(point[1])))
+    fit_per_point = (time.perf_counter() - fit_per_point) / count
+
+    # The pause when the stroke ends: fit, undo the freehand ink, redraw
+    start = time.perf_counter()
+    shape = canvas._snap_shape()
+    end_pause = time.perf_counter() - start
+    canvas.previous_point = None
+
+    # Without incremental state everything happens when the stroke ends
+    start = time.perf_counter()
+    scratch = ShapeFitter(5)
+    for point in points.astype(int):
+        scratch.add((int(point[0]), int(point[1])))
+    scratch.fit()
+    from_scratch = time.perf_counter() - start
+
+    return {
+        'draw': np.mean(per_point),
+        'fit_point': fit_per_point,
+        'end': end_pause,
+        'scratch': from_scratch,
+        'shape': shape['kind'] if shape else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lengths', type=int, nargs='+', default=[200, 250, 1000, 4000, 10000])
+    parser.add_argument('--noise', type=float, default=2.0,
+                        help="Fingertip jitter (pixels, standard deviation)")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'points':>6} {'shape':>10} | {'draw/pt':>8} {'fit/pt':>8} | "
+          f"{'stroke end':>10} {'from scratch':>12} | recognized")
+    mismatches = []
+    for count in args.lengths:
+        for kind in SHAPES:
+            result = run(kind, count, args.noise, rng)
+            mark = '✓' if result['shape'] == EXPECTED[kind] else '✗'
+            if result['shape'] != EXPECTED[kind]:
+                mismatches.append(f"{count}-point {kind} as {result['shape']}")
+            print(f"{count:>6} {kind:>10} | {result['draw'] * 1e6:>6.1f}us "
+                  f"{result['fit_point'] * 1e6:>6.1f}us | "
+                  f"{result['end'] * 1e3:>8.2f}ms {result['scratch'] * 1e3:>10.2f}ms | "
+                  f"{result['shape']} {mark}")
+
+    if mismatches:
+        print(f"⚠️  Misrecognized: {', '.join(mismatches)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
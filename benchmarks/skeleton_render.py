@@ -0,0 +1,109 @@
+"""
+Skeleton Render Benchmark
+Per-frame cost of drawing hand skeletons with MediaPipe's drawing helper
+versus the batched SkeletonRenderer
+
+Usage:
+    python benchmarks/skeleton_render.py [--hands 1 2 4] [--frames 500]
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT  # noqa: E402
+from utils.skeleton import SkeletonRenderer  # noqa: E402
+from utils.synthetic_hands import SyntheticHandStream  # noqa: E402
+
+
+def mediapipe_drawer():
+    """
+    Wrap whichever MediaPipe drawing helper is installed
+
+    Returns:
+        Function (frame, normalized (hands, 21, 2) array) -> None, or None
+        if MediaPipe is not installed
+    """
+    try:
+        import mediapipe as mp
+    except ImportError:
+        return None
+
+    if hasattr(mp, 'solutions'):
+        # Legacy solutions API (what HandDetector used before)
+        from mediapipe.framework.formats import landmark_pb2
+        drawing = mp.solutions.drawing_utils
+        connections = mp.solutions.hands.HAND_CONNECTIONS
+
+        def draw(frame, hands):
+            for hand in hands:
+                landmark_list = landmark_pb2.NormalizedLandmarkList()
+                for x, y in hand:
+                    landmark_list.landmark.add(x=float(x), y=float(y))
+                drawing.draw_landmarks(frame, landmark_list, connections)
+        return draw
+
+    # Tasks API
+    from mediapipe.tasks.python.components.containers import landmark
+    from mediapipe.tasks.python.vision import drawing_utils
+    from mediapipe.tasks.python.vision.hand_landmarker import HandLandmarksConnections
+    connections = HandLandmarksConnections.HAND_CONNECTIONS
+
+    def draw(frame, hands):
+        for hand in hands:
+            landmark_list = [landmark.NormalizedLandmark(x=float(x), y=float(y))
+                             for x, y in hand]
+            drawing_utils.draw_landmarks(frame, landmark_list, connections)
+    return draw
+
+
+def time_per_frame(draw, frame, frames_of_hands):
+    """Average milliseconds per frame of a draw function"""
+    start = time.perf_counter()
+    for hands in frames_of_hands:
+        draw(frame, hands)
+    return (time.perf_counter() - start) * 1000 / len(frames_of_hands)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hands', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--frames', type=int, default=500)
+    args = parser.parse_args()
+
+    size = np.array([CAMERA_WIDTH, CAMERA_HEIGHT], dtype=np.float32)
+    frame = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+    renderer = SkeletonRenderer()
+    mp_draw = mediapipe_drawer()
+    if mp_draw is None:
+        print("⚠️  MediaPipe not installed; timing SkeletonRenderer only")
+
+    def batched(frame, hands):
+        # Includes the normalized -> pixel conversion HandDetector does
+        renderer.draw(frame, hands * size)
+
+    print(f"{'hands':>5} | {'mediapipe':>10} {'batched':>10} {'speed-up':>8}")
+    for hands in args.hands:
+        stream = SyntheticHandStream(hands=hands, dropout=0, seed=0)
+        frames_of_hands = []
+        for _ in range(args.frames):
+            landmarks_list, _ = stream.next_frame()
+            points = np.array([[(lm[i]['x'], lm[i]['y']) for i in range(21)]
+                               for lm in landmarks_list], dtype=np.float32)
+            frames_of_hands.append(points / size)
+
+        ours = time_per_frame(batched, frame, frames_of_hands)
+        if mp_draw:
+            theirs = time_per_frame(mp_draw, frame, frames_of_hands)
+            print(f"{hands:>5} | {theirs:>8.3f}ms {ours:>8.3f}ms {theirs / ours:>7.1f}x")
+        else:
+            print(f"{hands:>5} | {'-':>10} {ours:>8.3f}ms {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
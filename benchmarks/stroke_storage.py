@@ -0,0 +1,151 @@
+"""
+Stroke Storage Benchmark
+Size of recorded strokes as JSON, as live sync segments and in the binary
+stroke format (with and without simplification), and the per-point cost
+of the online simplifier
+
+Usage:
+    python benchmarks/stroke_storage.py [--strokes 200] [--noise 1.0] [--window 64]
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT, STROKE_SIMPLIFY_WINDOW  # noqa: E402
+from utils.canvas_sync import SEGMENT, STATE  # noqa: E402
+from utils.strokes import (  # noqa: E402
+    StrokeSimplifier, stroke_tolerance, encode_strokes, decode_strokes
+)
+
+BRUSH_SIZES = [3, 5, 10, 20]
+
+
+def make_strokes(count, fps, noise, seed):
+    """
+    Hand-drawn-like strokes sampled once per frame
+
+    Smooth curves with a wandering direction and speed, plus per-frame
+    landmark jitter, rounded to whole pixels like get_drawing_point.
+    """
+    rng = np.random.default_rng(seed)
+    strokes = []
+    clock = 0.0
+    for _ in range(count):
+        frames = int(rng.uniform(1.0, 6.0) * fps)
+        heading = rng.uniform(0, 2 * np.pi) + np.cumsum(rng.normal(0, 0.08, frames))
+        speed = np.clip(400 + np.cumsum(rng.normal(0, 20, frames)), 100, 900) / fps
+        steps = np.stack([np.cos(heading), np.sin(heading)], axis=1) * speed[:, None]
+        path = rng.uniform((200, 150), (CAMERA_WIDTH - 200, CAMERA_HEIGHT - 150)) + \
+            np.cumsum(steps, axis=0)
+        path += rng.normal(0, noise, path.shape)
+        path = np.clip(np.rint(path), 0, (CAMERA_WIDTH - 1, CAMERA_HEIGHT - 1)).astype(int)
+
+        times = clock + np.arange(frames) / fps
+        clock = times[-1] + rng.uniform(0.3, 2.0)
+        strokes.append({
+            'color': (255, 0, 0),
+            'brush_size': int(rng.choice(BRUSH_SIZES)),
+            'opacity': 1.0,
+            'eraser': False,
+            'points': [(int(x), int(y), float(t)) for (x, y), t in zip(path, times)],
+        })
+    return strokes
+
+
+def simplify(strokes, window):
+    """
+    Run every stroke through the online simplifier, timing each point
+
+    Returns:
+        Simplified strokes and an array of per-point seconds
+    """
+    simplified = []
+    timings = []
+    for stroke in strokes:
+        simplifier = StrokeSimplifier(stroke_tolerance(stroke['brush_size']), window)
+        kept = []
+        for x, y, t in stroke['points']:
+            start = time.perf_counter()
+            kept += simplifier.add((x, y), t)
+            timings.append(time.perf_counter() - start)
+        kept += simplifier.finish()
+        simplified.append(dict(stroke, points=kept))
+    return simplified, np.array(timings)
+
+
+def max_deviation(raw, kept):
+    """Largest distance from a raw point to the simplified polyline"""
+    points = np.array([p[:2] for p in raw], dtype=np.float64)
+    vertices = np.array([p[:2] for p in kept], dtype=np.float64)
+    if len(vertices) < 2:
+        return float(np.linalg.norm(points - vertices[0], axis=1).max())
+
+    starts, ends = vertices[:-1], vertices[1:]
+    direction = ends - starts                                  # (S, 2)
+    offsets = points[:, None, :] - starts[None, :, :]          # (P, S, 2)
+    length_sq = np.maximum((direction ** 2).sum(axis=1), 1e-12)
+    t = np.clip((offsets * direction).sum(axis=2) / length_sq, 0, 1)
+    distance = np.linalg.norm(offsets - t[..., None] * direction, axis=2)
+    return float(distance.min(axis=1).max())
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--strokes', type=int, default=200)
+    parser.add_argument('--fps', type=float, default=30.0)
+    parser.add_argument('--noise', type=float, default=1.0,
+                        help="Landmark jitter (pixels, standard deviation)")
+    parser.add_argument('--window', type=int, default=STROKE_SIMPLIFY_WINDOW)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    strokes = make_strokes(args.strokes, args.fps, args.noise, args.seed)
+    points = sum(len(s['points']) for s in strokes)
+
+    sizes = {
+        'JSON (per-frame points)': len(json.dumps(
+            [dict(s, points=[[x, y, round(t, 3)] for x, y, t in s['points']])
+             for s in strokes]).encode()),
+        'sync segments (live)': points * SEGMENT.size + len(strokes) * STATE.size,
+        'binary': len(encode_strokes(strokes)),
+    }
+    simplified, timings = simplify(strokes, args.window)
+    encoded = encode_strokes(simplified)
+    sizes['binary + simplified'] = len(encoded)
+    kept = sum(len(s['points']) for s in simplified)
+
+    # Round trip and accuracy
+    decoded = decode_strokes(encoded)
+    assert [p[:2] for s in decoded for p in s['points']] == \
+        [p[:2] for s in simplified for p in s['points']], "codec round trip failed"
+    time_error = max(abs(a[2] - b[2]) for s, d in zip(simplified, decoded)
+                     for a, b in zip(s['points'], d['points']))
+    worst = max(max_deviation(s['points'], k['points']) / stroke_tolerance(s['brush_size'])
+                for s, k in zip(strokes, simplified))
+
+    print(f"{args.strokes} strokes, {points} points at {args.fps:.0f} fps, "
+          f"jitter {args.noise} px")
+    print(f"{'format':<26} {'bytes':>9} {'B/point':>8} {'vs JSON':>8}")
+    for name, size in sizes.items():
+        print(f"{name:<26} {size:>9} {size / points:>8.2f} "
+              f"{sizes['JSON (per-frame points)'] / size:>7.1f}x")
+
+    print(f"\nkept {kept} of {points} points ({points / kept:.1f}x fewer)")
+    print(f"max deviation: {worst:.2f} x tolerance, "
+          f"max timestamp error: {time_error * 1000:.1f} ms")
+    micros = timings * 1e6
+    print(f"simplifier per point: mean {micros.mean():.1f}us, "
+          f"p99 {np.percentile(micros, 99):.1f}us, "
+          f"p99.9 {np.percentile(micros, 99.9):.1f}us "
+          f"(window {args.window})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+"""
+Synthetic Load Benchmark
+Feeds generated hand landmarks through the recognizer, canvas and UI to
+measure how the per-frame Python work scales with hand count and frame
+rate, and how stable gesture recognition is
+
+Usage:
+    python benchmarks/synthetic_load.py [--hands 1 2 4 8] [--rates 30 60]
+                                        [--seconds 20] [--noise 1.5]
+                                        [--min-accuracy 0.99]
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT  # noqa: E402
+from gestures.recognizer import GestureRecognizer  # noqa: E402
+from ui.manager import UIManager  # noqa: E402
+from utils.canvas import Canvas  # noqa: E402
+from utils.synthetic_hands import SyntheticHandStream  # noqa: E402
+
+STAGES = ['generate', 'recognize', 'canvas', 'ui']
+
+
+def run(hands, rate, seconds, noise, dropout, seed):
+    """
+    Push one stream through the pipeline
+
+    Returns:
+        Dictionary of per-stage seconds, frame count and recognition stats
+    """
+    stream = SyntheticHandStream(hands=hands, rate=rate, noise=noise,
+                                 dropout=dropout, seed=seed)
+    recognizer = GestureRecognizer()
+    canvas = Canvas()
+    canvas.set_display_size(CAMERA_WIDTH, CAMERA_HEIGHT)
+    ui_manager = UIManager()
+    frame = np.zeros((CAMERA_HEIGHT, CAMERA_WIDTH, 3), dtype=np.uint8)
+
+    timings = dict.fromkeys(STAGES, 0.0)
+    frames = int(seconds * rate)
+    correct = Counter()
+    seen = Counter()
+    flickers = 0
+
+    # Per-hand stroke and gesture state (the canvas has one pen)
+    previous_points = {}
+    previous_gestures = {}
+
+    for _ in range(frames):
+        t0 = time.perf_counter()
+        landmarks_list, labels = stream.next_frame()
+        t1 = time.perf_counter()
+        gestures = [recognizer.recognize(landmarks) for landmarks in landmarks_list]
+        t2 = time.perf_counter()
+
+        for hand, landmarks, gesture in zip(stream.visible_hands,
+                                            landmarks_list, gestures):
+            canvas.previous_point = previous_points.get(hand)
+            if gesture == 'DRAW':
+                canvas.draw(recognizer.get_drawing_point(landmarks))
+            else:
+                canvas.reset_previous_point()
+                if gesture == 'CLEAR' and previous_gestures.get(hand) != 'CLEAR':
+                    canvas.clear()
+            previous_points[hand] = canvas.previous_point
+        for hand in set(previous_points) - set(stream.visible_hands):
+            previous_points[hand] = None
+        canvas.get_preview()
+        t3 = time.perf_counter()
+
+        frame[:] = 0
+        for landmarks, gesture in zip(landmarks_list, gestures):
+            if gesture == 'SELECT':
+                ui_manager.check_hover_activation(
+                    recognizer.get_selection_point(landmarks))
+        ui_manager.draw_ui(frame, canvas.current_color, canvas.brush_size,
+                           'DRAWING', gestures[0] if gestures else 'NONE')
+        t4 = time.perf_counter()
+
+        timings['generate'] += t1 - t0
+        timings['recognize'] += t2 - t1
+        timings['canvas'] += t3 - t2
+        timings['ui'] += t4 - t3
+
+        # A flicker is a change of recognized gesture while the hand is
+        # holding one steady pose
+        for hand, label, gesture in zip(stream.visible_hands, labels, gestures):
+            if label != 'TRANSITION':
+                seen[label] += 1
+                correct[label] += gesture == label
+                if previous_gestures.get(hand) not in (None, gesture) and \
+                        previous_gestures.get(hand) == label:
+                    flickers += 1
+            previous_gestures[hand] = gesture
+        for hand in set(previous_gestures) - set(stream.visible_hands):
+            previous_gestures[hand] = None
+
+    return {'timings': timings, 'frames': frames, 'seen': seen,
+            'correct': correct, 'flickers': flickers}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--hands', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--rates', type=float, nargs='+', default=[30, 60, 120])
+    parser.add_argument('--seconds', type=float, default=20.0,
+                        help="Stream length (in stream time, not wall time)")
+    parser.add_argument('--noise', type=float, default=1.5,
+                        help="Landmark jitter in pixels")
+    parser.add_argument('--dropout', type=float, default=0.01,
+                        help="Per-frame chance of a hand being occluded")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--min-accuracy', type=float, default=None,
+                        help="Exit with status 1 if accuracy drops below this")
+    args = parser.parse_args()
+
+    print(f"{'hands':>5} {'rate':>5} | " +
+          " ".join(f"{stage:>9}" for stage in STAGES) +
+          f" | {'ms/frame':>8} {'budget':>7} | {'accuracy':>8} {'flicker/s':>9}")
+
+    worst_accuracy = 1.0
+    for hands in args.hands:
+        for rate in args.rates:
+            result = run(hands, rate, args.seconds, args.noise,
+                         args.dropout, args.seed)
+            per_frame = {stage: seconds * 1000 / result['frames']
+                         for stage, seconds in result['timings'].items()}
+            total = sum(per_frame.values())
+            seen = sum(result['seen'].values())
+            accuracy = sum(result['correct'].values()) / max(1, seen)
+            worst_accuracy = min(worst_accuracy, accuracy)
+
+            print(f"{hands:>5} {rate:>5.0f} | " +
+                  " ".join(f"{per_frame[stage]:>7.3f}ms" for stage in STAGES) +
+                  f" | {total:>8.3f} {total * rate / 10:>6.1f}%"
+                  f" | {accuracy:>8.2%} {result['flickers'] / args.seconds:>9.2f}")
+
+    print("\nbudget = share of the frame interval (1/rate) spent in these stages")
+    if args.min_accuracy is not None and worst_accuracy < args.min_accuracy:
+        print(f"❌ Recognition accuracy {worst_accuracy:.2%} is below "
+              f"{args.min_accuracy:.2%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
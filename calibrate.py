@@ -0,0 +1,247 @@
+"""
+Hardware Calibration
+Measures camera modes, hand inference and rendering on this machine and
+writes a machine profile that config/settings.py loads at startup
+
+Usage:
+    python calibrate.py [--camera 0] [--target-fps 30] [--dry-run]
+"""
+
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from config.settings import (
+    CAMERA_INDEX, CAMERA_WIDTH, CAMERA_HEIGHT, MACHINE_PROFILE_PATH
+)
+from config.machine_profile import save_machine_profile
+from ui.manager import UIManager
+from utils.canvas import Canvas
+from utils.compositor import Compositor
+
+# Camera modes to try, largest first
+CAMERA_MODES = [(1920, 1080), (1280, 720), (960, 540), (640, 480)]
+
+# (model complexity, inference scale) from best landmarks to cheapest
+INFERENCE_CANDIDATES = [(1, 1.0), (1, 0.75), (0, 1.0), (1, 0.5), (0, 0.75), (0, 0.5)]
+
+# Share of the frame interval the pipeline may use (the rest is slack for
+# the OS, the gesture logic and frame-to-frame jitter)
+FRAME_BUDGET_SHARE = 0.85
+
+SAMPLE_FRAMES = 30
+
+
+def measure_camera_modes(camera_index, seconds):
+    """
+    Open the camera at each mode and count delivered frames
+
+    Returns:
+        List of dicts (requested, actual, fps) and a dict of sample frames
+        per actual mode; both empty if the camera cannot be opened
+    """
+    modes = []
+    samples = {}
+    for width, height in CAMERA_MODES:
+        cap = cv2.VideoCapture(camera_index)
+        if not cap.isOpened():
+            print(f"⚠️  Camera {camera_index} could not be opened")
+            return [], {}
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        # The first frames include exposure settling
+        for _ in range(5):
+            success, frame = cap.read()
+        if not success:
+            cap.release()
+            continue
+
+        actual = (frame.shape[1], frame.shape[0])
+        frames = []
+        count = 0
+        start = time.perf_counter()
+        while time.perf_counter() - start < seconds:
+            success, frame = cap.read()
+            if not success:
+                break
+            count += 1
+            if len(frames) < SAMPLE_FRAMES:
+                frames.append(frame.copy())
+        fps = count / (time.perf_counter() - start)
+        cap.release()
+
+        modes.append({'requested': [width, height], 'actual': list(actual),
+                      'fps': round(fps, 1)})
+        samples.setdefault(actual, frames)
+        print(f"📷 {width}x{height}: got {actual[0]}x{actual[1]} at {fps:.1f} fps")
+    return modes, samples
+
+
+def choose_camera_mode(modes, target_fps):
+    """Largest supported mode that keeps (nearly) the best frame rate"""
+    supported = [m for m in modes if m['requested'] == m['actual']]
+    if not supported:
+        return None
+    best_fps = min(target_fps, max(m['fps'] for m in supported))
+    fast_enough = [m for m in supported if m['fps'] >= best_fps * 0.9]
+    return max(fast_enough, key=lambda m: m['actual'][0] * m['actual'][1])
+
+
+def measure_inference(frames, repeats):
+    """
+    Time MediaPipe on the sample frames for each inference candidate
+
+    Returns:
+        Dict {(complexity, scale): median milliseconds}, empty if
+        MediaPipe is unavailable
+    """
+    try:
+        from utils.hand_detector import HandDetector
+        HandDetector(model_complexity=0).close()
+    except (ImportError, AttributeError) as error:
+        print(f"⚠️  MediaPipe unavailable, skipping inference tuning: {error}")
+        return {}
+
+    timings = {}
+    for complexity in sorted({c for c, _ in INFERENCE_CANDIDATES}, reverse=True):
+        detector = HandDetector(model_complexity=complexity)
+        detector.warm_up(frames[0].shape)
+        for c, scale in INFERENCE_CANDIDATES:
+            if c != complexity:
+                continue
+            detector.set_inference_scale(scale)
+            samples = []
+            for _ in range(repeats):
+                for frame in frames:
+                    start = time.perf_counter()
+                    detector.find_hands(frame, draw=False)
+                    samples.append(time.perf_counter() - start)
+            timings[(complexity, scale)] = float(np.median(samples) * 1000)
+            print(f"🧠 complexity {complexity}, scale {scale:.2f}: "
+                  f"{timings[(complexity, scale)]:.1f} ms")
+        detector.close()
+    return timings
+
+
+def measure_render(frame, repeats=60):
+    """
+    Time canvas preview, compositing and UI drawing at the frame size
+
+    Returns:
+        Dict {blend_mode: median milliseconds}
+    """
+    height, width = frame.shape[:2]
+    canvas = Canvas()
+    canvas.set_display_size(width, height)
+    for i in range(50):
+        canvas.draw((100 + i * 10, 200 + (i % 7) * 20))
+    compositor = Compositor()
+    ui_manager = UIManager(width, height)
+
+    timings = {}
+    for blend_mode in ('weighted', 'overlay'):
+        samples = []
+        for i in range(repeats):
+            # Keep a little ink changing so the preview is not free
+            canvas.draw((100 + i * 5, 400))
+            start = time.perf_counter()
+            output = compositor.compose(frame, canvas.get_preview(), blend_mode)
+            ui_manager.draw_ui(output, canvas.current_color, canvas.brush_size,
+                               'DRAWING', 'DRAW')
+            samples.append(time.perf_counter() - start)
+        timings[blend_mode] = float(np.median(samples) * 1000)
+        print(f"🖼️  render ({blend_mode}): {timings[blend_mode]:.1f} ms")
+    return timings
+
+
+def choose_inference(inference, render_ms, camera_fps):
+    """
+    Pick model, scale and inference mode for the frame budget
+
+    Returns:
+        Dict of settings
+    """
+    budget_ms = 1000.0 / camera_fps * FRAME_BUDGET_SHARE
+
+    # Best candidate that fits next to rendering on every frame
+    for candidate in INFERENCE_CANDIDATES:
+        cost = inference[candidate] + render_ms
+        if cost <= budget_ms:
+            complexity, scale = candidate
+            return {'MODEL_COMPLEXITY': complexity, 'INFERENCE_SCALE': scale,
+                    'INFERENCE_MODE': 'every_frame',
+                    'TARGET_FPS': int(min(camera_fps, 1000.0 / cost))}
+
+    # Too slow for every frame: detect in the background and let the
+    # tracker fill in; prefer a model that still detects every few frames
+    affordable = [c for c in INFERENCE_CANDIDATES
+                  if inference[c] <= 3 * 1000.0 / camera_fps]
+    complexity, scale = affordable[0] if affordable else \
+        min(INFERENCE_CANDIDATES, key=inference.get)
+    return {'MODEL_COMPLEXITY': complexity, 'INFERENCE_SCALE': scale,
+            'INFERENCE_MODE': 'async',
+            'TARGET_FPS': int(min(camera_fps, 1000.0 / render_ms))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Calibrate performance settings")
+    parser.add_argument('--camera', type=int, default=CAMERA_INDEX)
+    parser.add_argument('--target-fps', type=float, default=30.0,
+                        help="Highest frame rate worth aiming for")
+    parser.add_argument('--seconds', type=float, default=2.0,
+                        help="Time spent measuring each camera mode")
+    parser.add_argument('--repeats', type=int, default=2,
+                        help="Passes over the sample frames per inference setting")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Print the chosen settings without saving them")
+    args = parser.parse_args()
+
+    print("🔧 Calibrating (keep a hand in view for realistic inference timing)...")
+    settings = {}
+    measurements = {}
+
+    modes, samples = measure_camera_modes(args.camera, args.seconds)
+    measurements['camera_modes'] = modes
+    mode = choose_camera_mode(modes, args.target_fps)
+    if mode:
+        width, height = mode['actual']
+        camera_fps = min(args.target_fps, mode['fps'])
+        frames = samples[(width, height)]
+        settings['CAMERA_WIDTH'], settings['CAMERA_HEIGHT'] = width, height
+    else:
+        # No usable camera: time the rest on noise frames at the current size
+        width, height = CAMERA_WIDTH, CAMERA_HEIGHT
+        camera_fps = args.target_fps
+        rng = np.random.default_rng(0)
+        frames = [rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+                  for _ in range(SAMPLE_FRAMES)]
+
+    render = measure_render(frames[0])
+    measurements['render_ms'] = render
+    inference = measure_inference(frames, args.repeats)
+    measurements['inference_ms'] = {f"complexity={c} scale={s}": ms
+                                    for (c, s), ms in inference.items()}
+
+    if inference:
+        settings.update(choose_inference(inference, render['weighted'], camera_fps))
+    else:
+        settings['TARGET_FPS'] = int(min(camera_fps, 1000.0 / render['weighted']))
+
+    print("\n" + "=" * 60)
+    print("CALIBRATED SETTINGS:")
+    for name, value in settings.items():
+        print(f"   {name} = {value!r}")
+    print("=" * 60)
+
+    if args.dry_run:
+        print("Dry run: nothing saved")
+        return
+    save_machine_profile(MACHINE_PROFILE_PATH, settings, measurements)
+    print(f"💾 Profile saved to {MACHINE_PROFILE_PATH} (delete it to restore defaults)")
+
+
+if __name__ == "__main__":
+    main()
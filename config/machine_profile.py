@@ -0,0 +1,107 @@
+"""
+Machine Profile Module
+Reads and writes the per-machine settings chosen by calibrate.py
+"""
+
+import json
+import os
+import platform
+import time
+
+# Settings a profile may override, with the check a value must pass;
+# anything else in the file is ignored
+TUNABLE_SETTINGS = {
+    'CAMERA_WIDTH': lambda value: value > 0,
+    'CAMERA_HEIGHT': lambda value: value > 0,
+    'MODEL_COMPLEXITY': lambda value: value in (0, 1),
+    'INFERENCE_SCALE': lambda value: 0 < value <= 1,
+    'INFERENCE_MODE': lambda value: value in ('every_frame', 'interval', 'async'),
+    'TARGET_FPS': lambda value: value > 0,
+}
+
+
+def _convert(default, value):
+    """
+    Give a profile value the type of the setting's default
+
+    Raises:
+        TypeError: If the value is not a number for a numeric setting or
+            not a string for a text setting
+        ValueError: If the value does not fit the type
+    """
+    if isinstance(default, str):
+        if not isinstance(value, str):
+            raise TypeError(f"expected a string, got {value!r}")
+        return value
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise TypeError(f"expected a number, got {value!r}")
+    # JSON has no int/float distinction
+    if isinstance(default, int) and value != int(value):
+        raise ValueError(f"expected a whole number, got {value!r}")
+    return type(default)(value)
+
+
+def apply_machine_profile(settings, path):
+    """
+    Override settings with the values stored in a profile
+
+    Args:
+        settings: Namespace to update (the settings module's globals())
+        path: Profile file; nothing happens if it does not exist
+
+    Returns:
+        Dictionary of the settings that were overridden
+    """
+    if not os.path.exists(path):
+        return {}
+
+    try:
+        with open(path) as f:
+            profile = json.load(f)
+    except (OSError, ValueError) as error:
+        print(f"⚠️  Ignoring unreadable machine profile {path}: {error}")
+        return {}
+    if not isinstance(profile, dict) or not isinstance(profile.get('settings', {}), dict):
+        print(f"⚠️  Ignoring malformed machine profile {path}")
+        return {}
+
+    applied = {}
+    for name, value in profile.get('settings', {}).items():
+        if name not in TUNABLE_SETTINGS or name not in settings:
+            continue
+        try:
+            value = _convert(settings[name], value)
+        except (TypeError, ValueError, OverflowError) as error:
+            print(f"⚠️  Ignoring {name} from machine profile {path}: {error}")
+            continue
+        if not TUNABLE_SETTINGS[name](value):
+            print(f"⚠️  Ignoring {name} from machine profile {path}: "
+                  f"{value!r} is out of range")
+            continue
+        settings[name] = value
+        applied[name] = value
+
+    if applied and profile.get('machine') != platform.node():
+        print(f"⚠️  Machine profile was calibrated on {profile.get('machine')}; "
+              f"run 'python calibrate.py' to recalibrate this machine")
+    return applied
+
+
+def save_machine_profile(path, settings, measurements):
+    """
+    Write a profile
+
+    Args:
+        path: Profile file
+        settings: Dictionary of TUNABLE_SETTINGS values to override
+        measurements: Raw calibration numbers, kept for reference
+    """
+    profile = {
+        'machine': platform.node(),
+        'created': time.strftime("%Y-%m-%d %H:%M:%S"),
+        'settings': {name: value for name, value in settings.items()
+                     if name in TUNABLE_SETTINGS},
+        'measurements': measurements,
+    }
+    with open(path, 'w') as f:
+        json.dump(profile, f, indent=2)
@@ -3,20 +3,107 @@ Configuration file for Gesture Drawing Application
 Contains all constants, colors, and settings
 """
 
+import os
+
 # Camera Settings
 CAMERA_WIDTH = 1280
 CAMERA_HEIGHT = 720
 CAMERA_INDEX = 0
+# 'pixels'    = flip each frame before detection (classic mirror view)
+# 'landmarks' = detect on the raw frame, mirror landmark coordinates and
+#               fold the pixel flip into compositing (one less frame pass)
+# 'none'      = no mirroring at all
+MIRROR_MODE = 'pixels'
+
+# Multi-Source Settings (one detector process per source)
+MULTI_SOURCES = []  # e.g. [0, 1] or video file paths; empty = single camera
+MULTI_SOURCE_LAYOUT = 'shared'  # 'shared' = one canvas, 'separate' = one per source
+FRAME_RING_SLOTS = 4  # Shared-memory frame slots per source
+
+# Canvas Sync (several stations drawing on one canvas over the LAN)
+SYNC_PORT = 50555
+SYNC_CHECKPOINT_INTERVAL = 64  # Operations between replay checkpoints
+SYNC_MAX_CHECKPOINTS = 4  # Checkpoints kept (bounds the replay window)
+
+# Timelapse Export (video of how the drawing was made)
+TIMELAPSE_ENABLED = False  # Record every session (or pass --timelapse)
+TIMELAPSE_CAPTURE_INTERVAL = 0.1  # Seconds between canvas snapshots
+TIMELAPSE_SPEEDUP = 10  # Video plays this many times faster than the session
+TIMELAPSE_FPS = 30
+TIMELAPSE_FORMAT = 'mp4'  # 'mp4' (mp4v) or 'avi' (MJPG)
+TIMELAPSE_MAX_WIDTH = 1920  # Larger canvases are scaled down in the video
+TIMELAPSE_PIP = True  # Show the camera in a corner of the video
+TIMELAPSE_PIP_SCALE = 0.25  # Inset width as a fraction of the video width
+TIMELAPSE_END_HOLD = 2.0  # Seconds the finished drawing stays on screen
+
+# Stroke Storage (simplified, delta-encoded stroke files)
+STROKE_SIMPLIFY_TOLERANCE = 0.5  # Max deviation from the drawn path, in brush widths
+STROKE_SIMPLIFY_MIN_TOLERANCE = 1.0  # Canvas pixels (keeps thin brushes from storing jitter)
+STROKE_SIMPLIFY_WINDOW = 64  # Max points held back before one is kept (bounds per-point cost)
+STROKE_TIME_QUANTUM = 0.01  # Seconds per stored timestamp tick
+
+# Shape Snapping (a finished stroke that is close to a line, circle,
+# ellipse, rectangle or polygon is redrawn as that shape; dense canvas only)
+SHAPE_SNAP_ENABLED = False
+SHAPE_SNAP_TOLERANCE = 0.03  # RMS distance from the shape, as a fraction of the stroke's size
+SHAPE_LINE_MAX_BOW = 0.02  # Largest sideways bend of a line stroke, as a fraction of its size
+SHAPE_MIN_SIZE = 40  # Canvas pixels (bounding box diagonal); smaller strokes stay freehand
+SHAPE_CLOSE_DISTANCE = 0.2  # Largest gap between the ends of a closed shape (fraction of size)
+SHAPE_MAX_POLYGON_VERTICES = 8
+SHAPE_RIGHT_ANGLE_TOLERANCE = 15  # Degrees off 90 at which a quadrilateral is still a rectangle
+
+# Bucket Fill (FILL button, then point at an enclosed area; dense canvas only)
+FILL_TILE_SIZE = 64  # Canvas pixels per side of the tiles the fill regions are labeled in
+FILL_TILES_PER_FRAME = 16  # Tiles changed by strokes that are relabeled per frame while the tool is on
 
 # MediaPipe Hand Detection Settings
 DETECTION_CONFIDENCE = 0.7
 TRACKING_CONFIDENCE = 0.7
 MAX_HANDS = 1
+MODEL_COMPLEXITY = 1  # 0 = lite model, 1 = full model
+INFERENCE_SCALE = 1.0  # Fraction of the frame size fed to MediaPipe
+
+# Hand Skeleton Overlay
+SKELETON_ON_OUTPUT = False  # Draw on the composited output instead of the camera frame
+SKELETON_LINE_COLOR = (224, 224, 224)
+SKELETON_LINE_THICKNESS = 2
+SKELETON_JOINT_COLOR = (0, 0, 255)  # BGR
+SKELETON_JOINT_RADIUS = 4  # Filled joint radius (plus a 1px light border)
+
+# Inference Scheduling
+# 'every_frame' = run MediaPipe on each frame
+# 'interval'    = run MediaPipe every INFERENCE_INTERVAL frames
+# 'async'       = run MediaPipe in a worker thread whenever it is free
+INFERENCE_MODE = 'every_frame'
+INFERENCE_INTERVAL = 3
+LANDMARK_OPTICAL_FLOW = True  # Refine predicted landmarks with LK flow
+MAX_PREDICTED_FRAMES = 8  # Drop the hand after this many frames without detection
+VELOCITY_DAMPING = 0.8  # Per-frame decay of extrapolated landmark velocity
+FLOW_WINDOW_SIZE = 21  # Lucas-Kanade search window (pixels)
+FLOW_PYRAMID_LEVELS = 2
+
+# Idle Gating (no hand detection while the scene is static and no hand
+# was seen recently; the first frame with motion wakes it up)
+IDLE_GATING_ENABLED = False  # Gate every session (or pass --idle)
+IDLE_TIMEOUT = 5.0  # Seconds without motion or hands before going idle
+IDLE_MOTION_SIZE = (80, 45)  # Frames are shrunk to this for the motion check
+IDLE_MOTION_THRESHOLD = 12  # Gray level change that counts (shrinking averages noise away)
+IDLE_MOTION_AREA = 0.003  # Fraction of the shrunk frame that must change
+IDLE_BACKGROUND_RATE = 0.05  # Weight of each frame in the background (absorbs lighting drift)
 
 # Canvas Settings
+# Independent of the camera: e.g. 3840x2160 for print-quality saves. The
+# display shows a preview downsampled from the dirty regions only.
 CANVAS_WIDTH = 1280
 CANVAS_HEIGHT = 720
 
+# Tiled Canvas (sparse, pannable/zoomable surface beyond the camera view)
+TILED_CANVAS = False
+TILE_SIZE = 256  # Tile edge in world pixels
+ZOOM_LEVELS = [0.25, 0.5, 1.0, 2.0, 4.0]  # TILE_SIZE * zoom must be whole
+DEFAULT_ZOOM_INDEX = 2  # 1.0x
+TILE_CACHE_SIZE = 512  # Scaled tile renders kept across zoom levels
+
 # Drawing Settings
 DEFAULT_BRUSH_SIZE = 5
 MIN_BRUSH_SIZE = 1
@@ -53,11 +140,35 @@ FINGER_TIP_THRESHOLD = 0.1  # Distance threshold for finger tip detection
 PINCH_THRESHOLD = 40  # Pixel distance for pinch gesture
 SMOOTHING_FACTOR = 0.5  # For smoothing drawing lines
 
+# Pinch Parameter Control (thumb + index up = ADJUST gesture)
+PINCH_CONTROL_ENABLED = True
+PINCH_TARGETS = ['SIZE', 'OPACITY', 'ZOOM']  # ZOOM needs TILED_CANVAS
+DEFAULT_PINCH_TARGET = 'SIZE'
+PINCH_MIN_RATIO = 0.15  # Pinch distance / hand size mapped to the minimum
+PINCH_MAX_RATIO = 1.2  # Pinch distance / hand size mapped to the maximum
+PINCH_RATIO_SMOOTHING = 0.4  # EMA weight of the newest ratio sample
+PINCH_HYSTERESIS = 0.35  # Extra steps needed before the value changes
+
+# Opacity Settings
+DEFAULT_OPACITY = 1.0
+MIN_OPACITY = 0.1
+MAX_OPACITY = 1.0
+OPACITY_STEP = 0.05
+
 # FPS Display
 SHOW_FPS = True
 FPS_POSITION = (10, 30)
 FPS_COLOR = (0, 255, 0)
 
+# Adaptive Quality (degrade/restore quality knobs to hold TARGET_FPS)
+ADAPTIVE_QUALITY = True
+TARGET_FPS = 30
+QUALITY_DEGRADE_MARGIN = 1.10  # Degrade when frame time > target * margin
+QUALITY_RESTORE_MARGIN = 0.75  # Restore when frame time < target * margin
+QUALITY_DEGRADE_FRAMES = 15  # Consecutive slow frames before degrading
+QUALITY_RESTORE_FRAMES = 90  # Consecutive fast frames before restoring
+QUALITY_FRAME_SMOOTHING = 0.1  # EMA weight of the newest frame time
+
 # Landmark indices (MediaPipe hand landmarks)
 THUMB_TIP = 4
 INDEX_TIP = 8
@@ -71,4 +182,17 @@ MIDDLE_PIP = 10
 RING_PIP = 14
 PINKY_PIP = 18
 
+MIDDLE_MCP = 9
+
 WRIST = 0
+
+# Machine Profile
+# Written by `python calibrate.py`; overrides the camera, inference and
+# frame rate settings above with values measured on this machine.
+# Delete the file to go back to the defaults.
+MACHINE_PROFILE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'machine_profile.json')
+
+from config.machine_profile import apply_machine_profile  # noqa: E402
+apply_machine_profile(globals(), MACHINE_PROFILE_PATH)
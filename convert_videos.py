@@ -0,0 +1,269 @@
+"""
+Offline Video Conversion
+Runs recorded gesture videos through hand detection, gesture recognition
+and the canvas as fast as the CPU allows, and writes the finished drawing,
+its strokes and a session log for each one
+
+Usage:
+    python convert_videos.py sessions/ [more.mp4 ...] [--output converted] [--workers 4]
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sys
+import time
+from collections import defaultdict
+
+import cv2
+
+from config.settings import MIRROR_MODE
+from main import GestureDrawingApp
+from gestures.events import BEGIN, MOVE, END, ACTION
+from utils.hand_detector import HandDetector
+from utils.strokes import StrokeSimplifier, stroke_tolerance, save_strokes
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi', '.mov', '.mkv', '.webm')
+
+# Used when a container does not report its frame rate
+FALLBACK_FPS = 30.0
+
+
+class VideoSession(GestureDrawingApp):
+    """
+    The app's gesture handling driven by a video file
+
+    Only the parts of the app that turn landmarks into ink are set up: no
+    camera, window, waitKey pacing, compositing or UI drawing. MediaPipe
+    runs on every frame, and hover activation uses the video clock so
+    buttons fire on the same frames they did live.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.sources = []
+        self.sync = None
+        self.hand_detector = HandDetector()
+        self._init_core()
+
+        # Video clock
+        self.frame_index = 0
+        self.video_time = 0.0
+        self.ui_manager.clock = lambda: self.video_time
+
+        # The session log comes after the app's handlers (it sees their results)
+        self.events.clock = lambda: self.video_time
+        self.events.subscribe(self._log_gesture, kinds=(BEGIN,))
+        self.events.subscribe(self._log_action, kinds=(ACTION,))
+        self.events.subscribe(self._log_stroke, names=('DRAW',), kinds=(MOVE, END))
+
+        # Stroke log (simplified as the points arrive)
+        self.strokes = []
+        self.log = []
+        self.stroke = None
+        self.simplifier = None
+
+    def run(self):
+        """
+        Process the whole video
+
+        Returns:
+            Dictionary with the frame count, frame rate and frame size
+        """
+        cap = cv2.VideoCapture(self.path)
+        if not cap.isOpened():
+            raise RuntimeError(f"cannot open {self.path}")
+        fps = cap.get(cv2.CAP_PROP_FPS) or FALLBACK_FPS
+
+        frame = None
+        try:
+            while True:
+                success, frame = cap.read(frame)
+                if not success:
+                    break
+                self.video_time = self.frame_index / fps
+                self._process_frame(frame)
+                self.frame_index += 1
+        finally:
+            cap.release()
+            self.hand_detector.close()
+        self._end_stroke()
+
+        frame_size = [frame.shape[1], frame.shape[0]] if frame is not None else None
+        return {'frames': self.frame_index, 'fps': fps, 'frame_size': frame_size}
+
+    def _process_frame(self, frame):
+        """Detect, recognize and draw for one frame"""
+        if MIRROR_MODE == 'pixels':
+            frame = self.compositor.mirror(frame)
+
+        landmarks_list = self._detect_landmarks(frame)
+        self.canvas.set_display_size(frame.shape[1], frame.shape[0])
+        self._process_landmarks(landmarks_list)
+
+    def _run_detection(self, frame):
+        """Run MediaPipe on the frame (no tracker, no drawing)"""
+        frame, results = self.hand_detector.find_hands(frame, draw=False)
+        return self.hand_detector.get_landmarks(results, frame.shape)
+
+    def _log_stroke(self, event):
+        """Extend, start or end the logged stroke on a DRAW event"""
+        if event.kind == END or self.canvas.previous_point is None:
+            self._end_stroke()
+            return
+
+        if self.stroke is None:
+            _, thickness, _ = self.canvas._stroke_style()
+            self.simplifier = StrokeSimplifier(stroke_tolerance(thickness))
+            self.stroke = {
+                'color': self.canvas.current_color,
+                'brush_size': self.canvas.brush_size,
+                'opacity': self.canvas.opacity,
+                'eraser': self.canvas.eraser_mode,
+                'points': [],
+            }
+        self.stroke['points'].extend(
+            self.simplifier.add(self.canvas.previous_point, self.video_time))
+
+    def _end_stroke(self):
+        """Move the stroke in progress to the log"""
+        if self.stroke is not None:
+            self.stroke['points'].extend(self.simplifier.finish())
+            self.strokes.append(self.stroke)
+            self.stroke = None
+
+    def _log_event(self, kind, value):
+        """Record something that happened on the current frame"""
+        self.log.append({'frame': self.frame_index, 'type': kind,
+                         'value': value})
+
+    def _log_gesture(self, event):
+        """Log a gesture change (opening the palm also logs the clear)"""
+        self._log_event('gesture', event.name)
+        if event.name == 'CLEAR':
+            self._log_event('action', 'clear')
+
+    def _log_action(self, event):
+        """Log a hovered button"""
+        self._log_event(event.name, event.value)
+
+    def _save_drawing(self):
+        """SAVE is logged only; the drawing is written at the end anyway"""
+
+
+def convert_video(job):
+    """
+    Convert one video (runs in a pool worker)
+
+    Args:
+        job: Tuple (video path, output directory)
+
+    Returns:
+        Result dictionary; 'error' is set if the video could not be processed
+    """
+    path, output_dir = job
+    name = os.path.splitext(os.path.basename(path))[0]
+    result = {'video': path, 'worker': os.getpid(), 'frames': 0, 'seconds': 0.0}
+
+    try:
+        session = VideoSession(path)
+        start = time.perf_counter()
+        info = session.run()
+        result['seconds'] = time.perf_counter() - start
+        result['frames'] = info['frames']
+
+        result['drawing'] = session.canvas.save_canvas(
+            os.path.join(output_dir, f"{name}.png"))
+        save_strokes(os.path.join(output_dir, f"{name}.strokes"), session.strokes)
+        result['log'] = os.path.join(output_dir, f"{name}.session.json")
+        with open(result['log'], 'w') as f:
+            json.dump({
+                'video': path,
+                'frames': info['frames'],
+                'fps': info['fps'],
+                'frame_size': info['frame_size'],
+                'mirror_mode': MIRROR_MODE,
+                'strokes': len(session.strokes),
+                'events': session.log,
+            }, f)
+        result['strokes'] = len(session.strokes)
+    except Exception as error:  # noqa: BLE001 - one bad file must not stop the batch
+        result['error'] = f"{type(error).__name__}: {error}"
+    return result
+
+
+def _quiet_worker():
+    """Pool initializer: keep the app's progress messages out of the report"""
+    sys.stdout = open(os.devnull, 'w')
+
+
+def find_videos(paths):
+    """Expand directories into the video files they contain"""
+    videos = []
+    for path in paths:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                videos.extend(os.path.join(root, name) for name in sorted(files)
+                              if name.lower().endswith(VIDEO_EXTENSIONS))
+        else:
+            videos.append(path)
+    return videos
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert gesture videos to drawings")
+    parser.add_argument('paths', nargs='+', help="Video files or directories")
+    parser.add_argument('--output', default='converted',
+                        help="Directory for drawings, stroke files and session logs")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help="Videos processed in parallel")
+    args = parser.parse_args()
+
+    videos = find_videos(args.paths)
+    if not videos:
+        print("❌ No videos found")
+        sys.exit(1)
+    os.makedirs(args.output, exist_ok=True)
+
+    workers = max(1, min(args.workers, len(videos)))
+    print(f"🎞️  Converting {len(videos)} videos with {workers} workers...")
+
+    per_worker = defaultdict(lambda: {'videos': 0, 'frames': 0, 'seconds': 0.0})
+    failed = 0
+    start = time.perf_counter()
+    # MediaPipe graphs are not fork-safe: start clean interpreters
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(workers, initializer=_quiet_worker) as pool:
+        jobs = [(video, args.output) for video in videos]
+        for result in pool.imap_unordered(convert_video, jobs):
+            if 'error' in result:
+                failed += 1
+                print(f"❌ {result['video']}: {result['error']}")
+                continue
+            stats = per_worker[result['worker']]
+            stats['videos'] += 1
+            stats['frames'] += result['frames']
+            stats['seconds'] += result['seconds']
+            fps = result['frames'] / result['seconds'] if result['seconds'] else 0
+            print(f"✅ {result['video']}: {result['frames']} frames, "
+                  f"{result['strokes']} strokes, {fps:.0f} fps -> {result['drawing']}")
+    elapsed = time.perf_counter() - start
+
+    print("\n" + "=" * 60)
+    print(f"{'WORKER':>8} {'VIDEOS':>7} {'FRAMES':>8} {'FPS':>8}")
+    for worker, stats in sorted(per_worker.items()):
+        fps = stats['frames'] / stats['seconds'] if stats['seconds'] else 0
+        print(f"{worker:>8} {stats['videos']:>7} {stats['frames']:>8} {fps:>8.1f}")
+    total_frames = sum(stats['frames'] for stats in per_worker.values())
+    print(f"{'total':>8} {len(videos) - failed:>7} {total_frames:>8} "
+          f"{total_frames / elapsed:>8.1f}  ({elapsed:.1f}s wall)")
+    print("=" * 60)
+
+    if failed:
+        print(f"⚠️  {failed} of {len(videos)} videos failed")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
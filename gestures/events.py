@@ -0,0 +1,176 @@
+"""
+Gesture Events Module
+Turns per-frame gesture recognition into begin / move / end events and
+delivers them, with button actions, to subscribed handlers
+
+Events are queued by publish() and delivered in order by dispatch().
+A subscriber that only needs the newest position (hover, pinch, pan)
+can ask for its move events to be coalesced: when several moves of the
+same gesture are waiting for it, only the newest one is delivered. Begin,
+end and action events are never dropped.
+"""
+
+import time
+from collections import deque
+
+# Event kinds
+BEGIN = 'begin'    # A gesture started (first frame it is held)
+MOVE = 'move'      # A frame on which the gesture is held, including the first
+END = 'end'        # The gesture was let go (sent before the next one begins)
+ACTION = 'action'  # A UI button fired
+
+
+class InputEvent:
+    """One gesture or button event"""
+
+    def __init__(self, kind, name, landmarks=None, value=None, source=0,
+                 timestamp=None):
+        """
+        Args:
+            kind: BEGIN, MOVE, END or ACTION
+            name: Gesture name ('DRAW', 'SELECT', ...), or the button
+                action type ('color', 'tool', ...) for ACTION events
+            landmarks: Hand landmarks dictionary of the frame (gesture
+                events; None when the hand was lost)
+            value: Button action value (ACTION events)
+            source: Camera or video the event came from
+            timestamp: Seconds on the bus clock
+        """
+        self.kind = kind
+        self.name = name
+        self.landmarks = landmarks
+        self.value = value
+        self.source = source
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"InputEvent({self.kind}, {self.name}, source={self.source})"
+
+
+class EventBus:
+    """Ordered delivery of input events to subscribers"""
+
+    def __init__(self):
+        self.subscriptions = []
+
+        # [subscription, event] entries in publish order; a coalesced
+        # entry has its event set to None
+        self.pending = deque()
+
+        # Gesture held by each source ('NONE' when nothing is held)
+        self.gestures = {}
+
+        # Time source for event timestamps (replaced for offline playback)
+        self.clock = time.time
+
+        # Move events dropped because a newer one replaced them
+        self.coalesced = 0
+
+    def subscribe(self, handler, names=None, kinds=None, coalesce=False):
+        """
+        Register a handler for matching events
+
+        Handlers run in subscription order for each event.
+
+        Args:
+            handler: Callable taking an InputEvent
+            names: Gesture names or action types to receive (None = all)
+            kinds: Event kinds to receive (None = all)
+            coalesce: Deliver only the newest of several waiting move
+                events of a gesture
+
+        Returns:
+            Subscription, for unsubscribe()
+        """
+        subscription = {
+            'handler': handler,
+            'names': set(names) if names is not None else None,
+            'kinds': set(kinds) if kinds is not None else None,
+            'coalesce': coalesce,
+            'active': True,
+            # Newest pending entry per source (for coalescing)
+            'tail': {},
+        }
+        self.subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Stop delivering events to a subscription (pending ones too)"""
+        subscription['active'] = False
+        if subscription in self.subscriptions:
+            self.subscriptions.remove(subscription)
+
+    def publish(self, event):
+        """
+        Queue an event for every matching subscriber
+
+        Args:
+            event: InputEvent (timestamped now if it has no timestamp)
+        """
+        if event.timestamp is None:
+            event.timestamp = self.clock()
+
+        for subscription in self.subscriptions:
+            if subscription['kinds'] is not None and event.kind not in subscription['kinds']:
+                continue
+            if subscription['names'] is not None and event.name not in subscription['names']:
+                continue
+
+            tail = subscription['tail'].get(event.source)
+            if subscription['coalesce'] and event.kind == MOVE and tail is not None:
+                waiting = tail[1]
+                if waiting is not None and waiting.kind == MOVE and waiting.name == event.name:
+                    tail[1] = None
+                    self.coalesced += 1
+
+            entry = [subscription, event]
+            self.pending.append(entry)
+            subscription['tail'][event.source] = entry
+
+    def update_gesture(self, gesture, landmarks, source=0):
+        """
+        Publish the events for one frame's recognized gesture
+
+        A change of gesture ends the held one and begins the new one;
+        every frame then moves the gesture being held. 'NONE' is handled
+        like any other gesture, so its begin marks a hand going idle or
+        out of view.
+
+        Args:
+            gesture: Recognized gesture name ('NONE' when there is no hand)
+            landmarks: Hand landmarks dictionary, or None
+            source: Camera or video the frame came from
+        """
+        timestamp = self.clock()
+        held = self.gestures.get(source, 'NONE')
+        if gesture != held:
+            self.publish(InputEvent(END, held, landmarks, source=source,
+                                    timestamp=timestamp))
+            self.publish(InputEvent(BEGIN, gesture, landmarks, source=source,
+                                    timestamp=timestamp))
+            self.gestures[source] = gesture
+        self.publish(InputEvent(MOVE, gesture, landmarks, source=source,
+                                timestamp=timestamp))
+
+    def dispatch(self):
+        """
+        Deliver all queued events in publish order
+
+        Events published by handlers are delivered in the same call.
+
+        Returns:
+            Number of events delivered
+        """
+        delivered = 0
+        while self.pending:
+            entry = self.pending.popleft()
+            subscription, event = entry
+            if event is None:
+                continue
+            if subscription['tail'].get(event.source) is entry:
+                del subscription['tail'][event.source]
+            if not subscription['active']:
+                continue
+            subscription['handler'](event)
+            delivered += 1
+        return delivered
@@ -0,0 +1,109 @@
+"""
+Parameter Control Module
+Maps the thumb-index pinch distance to a continuous drawing parameter
+"""
+
+from config.settings import (
+    PINCH_TARGETS, DEFAULT_PINCH_TARGET, PINCH_MIN_RATIO, PINCH_MAX_RATIO,
+    PINCH_RATIO_SMOOTHING, PINCH_HYSTERESIS,
+    MIN_BRUSH_SIZE, MAX_BRUSH_SIZE, BRUSH_SIZE_STEP,
+    MIN_OPACITY, MAX_OPACITY, OPACITY_STEP, ZOOM_LEVELS
+)
+
+
+# Output range and step for each controllable parameter
+PARAMETER_RANGES = {
+    'SIZE': (MIN_BRUSH_SIZE, MAX_BRUSH_SIZE, BRUSH_SIZE_STEP),
+    'OPACITY': (MIN_OPACITY, MAX_OPACITY, OPACITY_STEP),
+    'ZOOM': (0, len(ZOOM_LEVELS) - 1, 1),  # Index into ZOOM_LEVELS
+}
+
+
+class PinchController:
+    """Turns a normalized pinch ratio into brush size or opacity values"""
+
+    def __init__(self, target=DEFAULT_PINCH_TARGET, targets=PINCH_TARGETS):
+        self.targets = list(targets)
+        self.target = target
+        self.smoothed_ratio = None
+        self.committed_value = None
+
+    def set_target(self, target):
+        """
+        Select which parameter the pinch drives
+
+        Args:
+            target: One of the controller's targets ('SIZE', 'OPACITY', 'ZOOM')
+        """
+        if target in self.targets and target != self.target:
+            self.target = target
+            self.release()
+
+    def cycle_target(self):
+        """Switch to the next parameter in the target list"""
+        idx = self.targets.index(self.target)
+        self.set_target(self.targets[(idx + 1) % len(self.targets)])
+        return self.target
+
+    def engage(self, current_value):
+        """
+        Start a control session from the parameter's current value
+
+        Args:
+            current_value: Value of the target parameter right now
+        """
+        self.committed_value = current_value
+
+    def release(self):
+        """End the control session (call when the ADJUST gesture ends)"""
+        self.smoothed_ratio = None
+        self.committed_value = None
+
+    def update(self, ratio, current_value):
+        """
+        Feed a new pinch ratio sample
+
+        Args:
+            ratio: Pinch distance divided by hand size
+            current_value: Value of the target parameter right now
+
+        Returns:
+            New parameter value if it should change, else None
+        """
+        if ratio is None:
+            return None
+
+        if self.committed_value is None:
+            self.engage(current_value)
+
+        # Exponential smoothing removes landmark jitter
+        if self.smoothed_ratio is None:
+            self.smoothed_ratio = ratio
+        else:
+            self.smoothed_ratio += PINCH_RATIO_SMOOTHING * \
+                (ratio - self.smoothed_ratio)
+
+        low, high, step = PARAMETER_RANGES[self.target]
+        t = (self.smoothed_ratio - PINCH_MIN_RATIO) / \
+            (PINCH_MAX_RATIO - PINCH_MIN_RATIO)
+        t = max(0.0, min(1.0, t))
+        raw_value = low + t * (high - low)
+
+        # Hysteresis: only move once the raw value is clearly past the
+        # next step, so holding the fingers still never flickers
+        if abs(raw_value - self.committed_value) < step * (0.5 + PINCH_HYSTERESIS):
+            return None
+
+        steps = round((raw_value - low) / step)
+        new_value = low + steps * step
+        if isinstance(low, int) and isinstance(step, int):
+            new_value = int(new_value)
+        else:
+            new_value = round(new_value, 2)
+        new_value = max(low, min(high, new_value))
+
+        if new_value == self.committed_value:
+            return None
+
+        self.committed_value = new_value
+        return new_value
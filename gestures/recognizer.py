@@ -7,15 +7,17 @@ import math
 from config.settings import (
     INDEX_TIP, MIDDLE_TIP, RING_TIP, PINKY_TIP, THUMB_TIP,
     INDEX_PIP, MIDDLE_PIP, RING_PIP, PINKY_PIP, THUMB_IP,
-    PINCH_THRESHOLD
+    WRIST, MIDDLE_MCP, PINCH_THRESHOLD
 )
 
 
 class GestureRecognizer:
     """Recognizes hand gestures from landmarks"""
 
-    def __init__(self):
+    def __init__(self, mirrored=True):
         self.previous_gesture = None
+        # Thumb direction flips when the view is not mirrored
+        self.mirrored = mirrored
 
     def recognize(self, landmarks):
         """
@@ -29,6 +31,8 @@ class GestureRecognizer:
             - 'DRAW': One finger up (index)
             - 'SELECT': Two fingers up (index + middle)
             - 'CLEAR': Open palm (all fingers up)
+            - 'ADJUST': Thumb and index up (pinch parameter control)
+            - 'PAN': Index, middle and ring up (drag the canvas view)
             - 'NONE': No recognized gesture
         """
         if not landmarks:
@@ -46,6 +50,12 @@ class GestureRecognizer:
         elif fingers_up == [1, 1, 1, 1, 1]:  # All fingers up (open palm)
             return 'CLEAR'
 
+        elif fingers_up == [1, 1, 0, 0, 0]:  # Thumb and index up (pinch)
+            return 'ADJUST'
+
+        elif fingers_up == [0, 1, 1, 1, 0]:  # Three fingers up
+            return 'PAN'
+
         return 'NONE'
 
     def _count_fingers_up(self, landmarks):
@@ -59,7 +69,10 @@ class GestureRecognizer:
         fingers = []
 
         # Thumb (special case - check horizontal distance)
-        if landmarks[THUMB_TIP]['x'] < landmarks[THUMB_IP]['x']:
+        thumb_out = landmarks[THUMB_TIP]['x'] < landmarks[THUMB_IP]['x']
+        if not self.mirrored:
+            thumb_out = not thumb_out
+        if thumb_out:
             fingers.append(1)
         else:
             fingers.append(0)
@@ -147,3 +160,41 @@ class GestureRecognizer:
             )
             return distance
         return None
+
+    def get_hand_size(self, landmarks):
+        """
+        Get a scale reference for the hand (wrist to middle finger base)
+
+        Args:
+            landmarks: Dictionary of landmark positions
+
+        Returns:
+            Float distance value in pixels
+        """
+        if landmarks and WRIST in landmarks and MIDDLE_MCP in landmarks:
+            wrist = landmarks[WRIST]
+            middle_mcp = landmarks[MIDDLE_MCP]
+
+            return math.sqrt(
+                (wrist['x'] - middle_mcp['x']) ** 2 +
+                (wrist['y'] - middle_mcp['y']) ** 2
+            )
+        return None
+
+    def get_normalized_pinch(self, landmarks):
+        """
+        Get the pinch distance relative to hand size, so the same finger
+        spread gives the same value near or far from the camera
+
+        Args:
+            landmarks: Dictionary of landmark positions
+
+        Returns:
+            Float ratio (roughly 0.0 closed to 1.5 wide open), or None
+        """
+        distance = self.get_pinch_distance(landmarks)
+        hand_size = self.get_hand_size(landmarks)
+
+        if distance is None or not hand_size:
+            return None
+        return distance / hand_size
@@ -3,15 +3,33 @@ Main Application File
 Gesture-Based Drawing Application
 """
 
+# Imported first so its clock starts as close to process start as possible
+from utils.startup_profile import StartupProfiler
 from ui.manager import UIManager
 from gestures.recognizer import GestureRecognizer
+from gestures.parameter_control import PinchController
+from gestures.events import EventBus, InputEvent, BEGIN, MOVE, END, ACTION
 from utils.canvas import Canvas
+from utils.tiled_canvas import TiledCanvas
+from utils.canvas_sync import SyncedCanvas
 from utils.hand_detector import HandDetector
+from utils.quality import QualityController, QUALITY_LEVELS
+from utils.landmark_tracker import LandmarkTracker
+from utils.inference_worker import InferenceWorker
+from utils.compositor import Compositor
+from utils.skeleton import SkeletonRenderer
+from utils.timelapse import TimelapseRecorder
+from utils.idle_gate import IdleGate
 from config.settings import (
     CAMERA_WIDTH, CAMERA_HEIGHT, CAMERA_INDEX,
     SHOW_FPS, FPS_POSITION, FPS_COLOR,
-    CANVAS_WIDTH, CANVAS_HEIGHT
+    PINCH_CONTROL_ENABLED, ADAPTIVE_QUALITY,
+    INFERENCE_MODE, INFERENCE_INTERVAL, MULTI_SOURCES, MULTI_SOURCE_LAYOUT,
+    MIRROR_MODE, TILED_CANVAS, PINCH_TARGETS, ZOOM_LEVELS, SYNC_PORT,
+    SKELETON_ON_OUTPUT, TIMELAPSE_ENABLED, SHAPE_SNAP_ENABLED, IDLE_GATING_ENABLED
 )
+import argparse
+import threading
 import cv2
 import time
 import sys
@@ -24,32 +42,67 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 class GestureDrawingApp:
     """Main application class"""
 
-    def __init__(self):
+    def __init__(self, sources=None, profiler=None, sync=None,
+                 timelapse=TIMELAPSE_ENABLED, idle=IDLE_GATING_ENABLED):
         print("🚀 Initializing Gesture Drawing Application...")
+        self.profiler = profiler or StartupProfiler(enabled=False)
+        self.profiler.mark('imports_done')
 
-        # Initialize components
-        self.hand_detector = HandDetector()
-        self.canvas = Canvas()
-        self.gesture_recognizer = GestureRecognizer()
-        self.ui_manager = UIManager()
+        # Multi-source mode runs one detector process per source instead
+        # of the in-process detector and camera
+        self.sources = list(sources) if sources else []
 
-        # Camera setup
-        self.cap = cv2.VideoCapture(CAMERA_INDEX)
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        # Canvas sync: None, ('host', port) or ('join', host, port)
+        self.sync = sync
 
-        # Application state
-        self.running = True
-        self.current_mode = 'NONE'
-        self.current_gesture = 'NONE'
-        self.previous_gesture = 'NONE'
+        # Open the camera in the background while the model loads
+        self.cap = None
+        camera_thread = None
+        if not self.sources:
+            camera_thread = threading.Thread(target=self._open_camera)
+            camera_thread.start()
 
-        # FPS calculation
-        self.prev_time = 0
+        # Initialize components
+        self.hand_detector = None
+        if not self.sources:
+            self.hand_detector = self._create_detector()
+            self.profiler.mark('model_loaded')
+            self.hand_detector.warm_up((CAMERA_HEIGHT, CAMERA_WIDTH, 3))
+            self.profiler.mark('model_warmed_up')
+        self._init_core()
+
+        # Live-only parts (offline sessions keep the defaults of _init_core)
+        self.quality_controller = QualityController() if ADAPTIVE_QUALITY else None
+        self.inference_worker = InferenceWorker(
+            self.hand_detector) if INFERENCE_MODE == 'async' and not self.sources else None
+
+        # Detection pauses while the scene is static (multi-source workers
+        # gate their own detectors)
+        self.idle_gate = IdleGate() if idle and not self.sources else None
+
+        # Session recording for timelapse export (encoded in a background process)
+        self.timelapse = TimelapseRecorder() if timelapse else None
 
-        # Debouncing for button clicks
-        self.last_click_time = 0
-        self.click_cooldown = 0.5  # seconds
+        # Camera setup
+        self.multi_detector = None
+        self.source_states = []
+        if self.sources:
+            # Only needed (and only imported) in multi-source mode
+            from utils.multi_source import MultiSourceDetector
+
+            self.multi_detector = MultiSourceDetector(self.sources, idle=idle)
+            shared_canvas = self.canvas
+            for _ in self.sources:
+                self.source_states.append({
+                    'canvas': shared_canvas if MULTI_SOURCE_LAYOUT == 'shared' else self._create_canvas(),
+                    'previous_point': None,
+                    'current_mode': 'NONE',
+                    'current_gesture': 'NONE',
+                })
+            print(f"🎥 Multi-source mode: {len(self.sources)} sources, "
+                  f"{MULTI_SOURCE_LAYOUT} canvas")
+        else:
+            camera_thread.join()
 
         print("✅ Application initialized successfully!")
         print("\n" + "="*60)
@@ -59,169 +112,595 @@ class GestureDrawingApp:
         print("✌️  TWO FINGERS (Index+Middle) → SELECT MODE")
         print("   - Hover over colors to change color")
         print("   - Hover over ERASER to toggle eraser")
+        print("   - Hover over FILL, then point inside a shape to fill it")
         print("   - Hover over BRUSH+/- to adjust size")
+        print("   - Hover over PINCH to switch SIZE/OPACITY control")
+        print("🤏 THUMB + INDEX (Pinch)   → ADJUST SIZE/OPACITY")
         print("🖐️  OPEN PALM (All fingers)    → CLEAR CANVAS")
         print("="*60)
         print("Press 'q' to quit | Press 's' to save | Press 'c' to clear\n")
 
+    def _init_core(self):
+        """
+        Set up the parts of the app that turn landmarks into ink
+
+        Needs no camera, window or worker thread, so offline sessions
+        (convert_videos.py) use it too. Expects sources, sync and
+        hand_detector to be set; the live-only parts start switched off.
+        """
+        self.canvas = self._create_canvas(synced=bool(self.sync))
+        self.gesture_recognizer = GestureRecognizer(
+            mirrored=MIRROR_MODE != 'none' or bool(self.sources))
+        self.ui_manager = UIManager()
+        self.pinch_controller = PinchController(targets=[
+            target for target in PINCH_TARGETS
+            if target != 'ZOOM' or TILED_CANVAS])
+        self.quality_controller = None
+        self.quality = QUALITY_LEVELS[0]
+
+        # Per-frame image buffers are reused instead of reallocated
+        self.compositor = Compositor()
+        self.capture_buffer = None
+        self.skeleton = SkeletonRenderer()
+
+        # Inference scheduling (frames without a detection use the tracker)
+        self.landmark_tracker = LandmarkTracker()
+        self.inference_worker = None
+        self.frame_index = 0
+        self.idle_gate = None
+        self.timelapse = None
+
+        # Last PAN gesture point (screen pixels)
+        self.pan_point = None
+
+        # Gesture and button events, delivered to the handlers below
+        self.events = EventBus()
+        self._subscribe_handlers()
+
+        # Application state
+        self.running = True
+        self.current_mode = 'NONE'
+        self.current_gesture = 'NONE'
+
+        # FPS calculation
+        self.prev_time = 0
+
+    def _create_canvas(self, synced=False):
+        """Build the canvas type selected in settings"""
+        if SHAPE_SNAP_ENABLED and (synced or TILED_CANVAS):
+            print("⚠️  Shape snapping needs the plain canvas; strokes stay freehand")
+        if synced:
+            if TILED_CANVAS:
+                print("⚠️  Canvas sync uses a dense canvas; TILED_CANVAS ignored")
+            if self.sync[0] == 'host':
+                print(f"🌐 Hosting shared canvas on port {self.sync[1]}")
+                return SyncedCanvas(port=self.sync[1])
+            print(f"🌐 Joining shared canvas at {self.sync[1]}:{self.sync[2]}")
+            return SyncedCanvas(host=self.sync[1], port=self.sync[2])
+        return TiledCanvas() if TILED_CANVAS else Canvas()
+
+    def _create_detector(self):
+        """Build the in-process hand detector"""
+        return HandDetector()
+
+    def _open_camera(self):
+        """Open and configure the camera (runs in a background thread)"""
+        self.cap = cv2.VideoCapture(CAMERA_INDEX)
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, CAMERA_WIDTH)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, CAMERA_HEIGHT)
+        self.profiler.mark('camera_opened')
+
+    def _update_startup_profile(self, landmarks_detected):
+        """
+        Record first-frame and first-detection milestones
+
+        Args:
+            landmarks_detected: Whether this frame had a hand
+        """
+        if self.profiler.reported or not self.profiler.enabled:
+            return
+        self.profiler.mark('first_frame_rendered')
+        if landmarks_detected:
+            self.profiler.mark('first_detection')
+        if self.profiler.is_complete():
+            self.profiler.report()
+
     def run(self):
         """Main application loop"""
+        if self.multi_detector:
+            self.run_multi()
+            return
 
         while self.running:
             # Read frame
-            success, frame = self.cap.read()
+            success, frame = self.cap.read(self.capture_buffer)
             if not success:
                 print("❌ Failed to read frame from camera")
                 break
+            self.capture_buffer = frame
+
+            # Quality adapts to the time spent on the frame, not to time
+            # blocked on the camera or the display (a 30 fps camera would
+            # otherwise hold every loop at 33 ms and quality never returns)
+            frame_start = time.time()
 
             # Flip for mirror effect
-            frame = cv2.flip(frame, 1)
+            if MIRROR_MODE == 'pixels':
+                frame = self.compositor.mirror(frame)
 
-            # Detect hands
-            frame, results = self.hand_detector.find_hands(frame, draw=True)
+            # Detect hands and get landmarks
+            landmarks_list = self._detect_landmarks(frame)
 
-            # Get landmarks
-            landmarks_list = self.hand_detector.get_landmarks(
-                results, frame.shape)
+            # Process gestures if hand detected (landmarks are in frame
+            # pixels; the canvas maps them to its own resolution)
+            self.canvas.set_display_size(frame.shape[1], frame.shape[0])
+            if self.sync:
+                self.canvas.poll()
+            self._process_landmarks(landmarks_list)
 
-            # Process gestures if hand detected
-            if landmarks_list:
-                landmarks = landmarks_list[0]  # Use first hand
+            # Combine canvas with frame and draw UI
+            frame_with_canvas = self._render_frame(frame, landmarks_list)
 
-                # Recognize gesture
-                self.current_gesture = self.gesture_recognizer.recognize(
-                    landmarks)
+            if self.timelapse:
+                self.timelapse.capture(self.canvas, frame)
+            work_time = time.time() - frame_start
+
+            # Show frame and handle keyboard input
+            key = self._show_frame(frame_with_canvas)
+            self._update_startup_profile(bool(landmarks_list))
+            self._handle_key(key)
+
+            # Trade quality for frame rate if the loop is running slow
+            if self.quality_controller:
+                new_quality = self.quality_controller.update(work_time)
+                if new_quality:
+                    self._apply_quality(new_quality)
+
+        # Cleanup
+        self.cleanup()
 
-                # Handle gesture
-                self._handle_gesture(landmarks)
+    def run_multi(self):
+        """Application loop for multi-source mode"""
+
+        while self.running and not self.multi_detector.all_finished():
+            updated = self.multi_detector.poll()
+            if self.sync:
+                self.canvas.poll()
+            if not updated:
+                self._handle_key(cv2.waitKey(1) & 0xFF)
+                continue
+
+            # Only the work on new results counts toward quality (see run)
+            frame_start = time.time()
+
+            # Apply every source's gestures with that source's stroke state.
+            # Results that arrived since the last poll are all recognized, so
+            # no gesture is missed; their hover, pinch and pan moves coalesce.
+            for source_id in updated:
+                self._enter_source(source_id)
+                for landmarks_list in self.multi_detector.get_backlog(source_id):
+                    self._publish_landmarks(landmarks_list, source_id)
+                self.events.dispatch()
+                self._leave_source(source_id)
+
+            # Render
+            if MULTI_SOURCE_LAYOUT == 'shared':
+                frame = self.multi_detector.get_frame(updated[0])
+                self._enter_source(updated[0])
+                cv2.imshow("Gesture Drawing Application", self._render_frame(
+                    frame, self.multi_detector.get_landmarks(updated[0])))
+                self._leave_source(updated[0])
             else:
-                self.current_gesture = 'NONE'
-                self.current_mode = 'NONE'
-                self.canvas.reset_previous_point()
+                for source_id in updated:
+                    frame = self.multi_detector.get_frame(source_id)
+                    self._enter_source(source_id)
+                    cv2.imshow(f"Gesture Drawing Application [{source_id}]",
+                               self._render_frame(
+                                   frame, self.multi_detector.get_landmarks(source_id)))
+                    self._leave_source(source_id)
+
+            # Only the shared canvas is recorded
+            if self.timelapse and MULTI_SOURCE_LAYOUT == 'shared':
+                self.timelapse.capture(self.canvas, frame)
+
+            work_time = time.time() - frame_start
+
+            self._update_startup_profile(any(
+                self.multi_detector.get_landmarks(source_id)
+                for source_id in updated))
+            self._handle_key(cv2.waitKey(1) & 0xFF)
+
+            if self.quality_controller:
+                new_quality = self.quality_controller.update(work_time)
+                if new_quality:
+                    self._apply_quality(new_quality)
 
-            # Combine canvas with frame
-            canvas_view = self.canvas.get_canvas()
+        self.cleanup()
+
+    def _enter_source(self, source_id):
+        """Load one source's gesture and stroke state into the app"""
+        state = self.source_states[source_id]
+        self.canvas = state['canvas']
+        self.canvas.previous_point = state['previous_point']
+        self.current_mode = state['current_mode']
+        self.current_gesture = state['current_gesture']
+
+    def _leave_source(self, source_id):
+        """Store the app's gesture and stroke state back for one source"""
+        state = self.source_states[source_id]
+        state['previous_point'] = self.canvas.previous_point
+        state['current_mode'] = self.current_mode
+        state['current_gesture'] = self.current_gesture
+
+    def _process_landmarks(self, landmarks_list, source=0):
+        """
+        Recognize and handle the gesture of the first detected hand
+
+        Args:
+            landmarks_list: List of landmark dictionaries
+            source: Camera or video the landmarks came from
+        """
+        self._publish_landmarks(landmarks_list, source)
+        self.events.dispatch()
 
-            # Blend canvas with frame (make frame semi-transparent)
-            frame_with_canvas = cv2.addWeighted(
-                frame, 0.5, canvas_view, 0.8, 0)
+    def _publish_landmarks(self, landmarks_list, source=0):
+        """
+        Recognize the first hand's gesture and queue its events
+
+        Args:
+            landmarks_list: List of landmark dictionaries
+            source: Camera or video the landmarks came from
+        """
+        landmarks = None
+        self.current_gesture = 'NONE'
+        if landmarks_list:
+            landmarks = landmarks_list[0]  # Use first hand
+            self.current_gesture = self.gesture_recognizer.recognize(
+                landmarks)
+        self.events.update_gesture(self.current_gesture, landmarks, source)
 
-            # Draw UI
-            frame_with_canvas = self.ui_manager.draw_ui(
+    def _render_frame(self, frame, landmarks_list=None):
+        """
+        Blend the canvas over the frame and draw the UI and FPS
+
+        Args:
+            frame: Mirrored BGR camera frame
+            landmarks_list: Hands to overlay when SKELETON_ON_OUTPUT is set
+
+        Returns:
+            Frame ready for display
+        """
+        # Keep the fill regions caught up with new strokes, so a fill only
+        # has its own region to paint
+        if self.canvas.fill_mode:
+            self.canvas.update_regions()
+
+        # Combine canvas with frame (display-resolution preview of the canvas)
+        canvas_view = self.canvas.get_preview()
+
+        # Blend canvas with frame
+        # ('landmarks' mirror mode flips the pixels here, while blending)
+        frame_with_canvas = self.compositor.compose(
+            frame, canvas_view, self.quality['blend_mode'],
+            flip=MIRROR_MODE == 'landmarks' and not self.sources)
+
+        # Skeleton over the blended output: not dimmed by the canvas and
+        # also shown on frames whose landmarks were predicted
+        if SKELETON_ON_OUTPUT and self.quality['draw_landmarks']:
+            self.skeleton.draw_landmarks(frame_with_canvas, landmarks_list)
+
+        # Draw UI
+        frame_with_canvas = self.ui_manager.draw_ui(
+            frame_with_canvas,
+            self.canvas.current_color,
+            self.canvas.brush_size,
+            self.current_mode,
+            self.current_gesture,
+            self.canvas.eraser_mode,
+            self.canvas.opacity,
+            self.pinch_controller.target,
+            self.quality['ui_detail'],
+            self.canvas.fill_mode
+        )
+
+        # Calculate and display FPS
+        if SHOW_FPS:
+            current_time = time.time()
+            fps = 1 / (current_time -
+                       self.prev_time) if self.prev_time else 0
+            self.prev_time = current_time
+
+            cv2.putText(
                 frame_with_canvas,
-                self.canvas.current_color,
-                self.canvas.brush_size,
-                self.current_mode,
-                self.current_gesture,
-                self.canvas.eraser_mode
+                f'FPS: {int(fps)}',
+                FPS_POSITION,
+                cv2.FONT_HERSHEY_SIMPLEX,
+                1,
+                FPS_COLOR,
+                2
             )
 
-            # Calculate and display FPS
-            if SHOW_FPS:
-                current_time = time.time()
-                fps = 1 / (current_time -
-                           self.prev_time) if self.prev_time else 0
-                self.prev_time = current_time
-
-                cv2.putText(
-                    frame_with_canvas,
-                    f'FPS: {int(fps)}',
-                    FPS_POSITION,
-                    cv2.FONT_HERSHEY_SIMPLEX,
-                    1,
-                    FPS_COLOR,
-                    2
-                )
-
-            # Show frame
-            cv2.imshow("Gesture Drawing Application", frame_with_canvas)
-
-            # Handle keyboard input
-            key = cv2.waitKey(1) & 0xFF
-            if key == ord('q'):
-                self.running = False
-            elif key == ord('s'):
-                self._save_drawing()
-            elif key == ord('c'):
-                self.canvas.clear()
-                print("🗑️  Canvas cleared")
-
-            self.previous_gesture = self.current_gesture
+        return frame_with_canvas
 
-        # Cleanup
-        self.cleanup()
-
-    def _handle_gesture(self, landmarks):
+    def _show_frame(self, frame):
         """
-        Handle the recognized gesture
-        
+        Display a finished frame
+
         Args:
-            landmarks: Hand landmarks dictionary
+            frame: Composited frame with UI
+
+        Returns:
+            Key code pressed while the frame was shown
         """
-        current_time = time.time()
+        cv2.imshow("Gesture Drawing Application", frame)
+        return cv2.waitKey(1) & 0xFF
 
-        if self.current_gesture == 'DRAW':
-            self.current_mode = 'DRAWING'
-            point = self.gesture_recognizer.get_drawing_point(landmarks)
-            self.canvas.draw(point)
+    def _handle_key(self, key):
+        """
+        Handle keyboard input
 
-        elif self.current_gesture == 'SELECT':
-            self.current_mode = 'SELECTION'
-            self.canvas.reset_previous_point()
+        Args:
+            key: Key code from cv2.waitKey
+        """
+        if key == ord('q'):
+            self.running = False
+        elif key == ord('s'):
+            self._save_drawing()
+        elif key == ord('c'):
+            self.canvas.clear()
+            print("🗑️  Canvas cleared")
+        elif key == ord('t') and self.timelapse:
+            self.timelapse.export()
+
+    def _detect_landmarks(self, frame):
+        """
+        Get hand landmarks for this frame in display coordinates
 
-            # Check if hovering over a UI button
-            point = self.gesture_recognizer.get_selection_point(landmarks)
+        Args:
+            frame: Current BGR frame (landmarks may be drawn on it)
 
-            # Use hover activation (no cooldown needed, it's built into UI manager)
-            button_action = self.ui_manager.check_hover_activation(point)
+        Returns:
+            List of landmark dictionaries
+        """
+        if self.idle_gate:
+            was_idle = self.idle_gate.idle
+            if not self.idle_gate.update(frame):
+                # Predictions and detections from before the pause would
+                # be stale on wake-up
+                if not was_idle:
+                    self.landmark_tracker.reset()
+                if self.inference_worker:
+                    self.inference_worker.poll()
+                return []
+
+        landmarks_list = self._run_detection(frame)
+        if self.idle_gate:
+            self.idle_gate.report_hands(bool(landmarks_list))
+
+        # Frame was not flipped, so mirror the (few) coordinates instead
+        if MIRROR_MODE == 'landmarks':
+            max_x = frame.shape[1] - 1
+            for landmarks in landmarks_list:
+                for point in landmarks.values():
+                    point['x'] = max_x - point['x']
+
+        return landmarks_list
+
+    def _run_detection(self, frame):
+        """
+        Get hand landmarks for this frame according to INFERENCE_MODE
 
-            if button_action:
-                self._handle_button_action(button_action)
+        Args:
+            frame: Current BGR frame (landmarks may be drawn on it)
 
-        elif self.current_gesture == 'CLEAR':
-            # Only clear once per gesture (not continuously)
-            if self.previous_gesture != 'CLEAR':
-                self.canvas.clear()
-                self.current_mode = 'CLEAR'
-                print("🗑️  Canvas cleared by gesture!")
+        Returns:
+            List of landmark dictionaries
+        """
+        self.frame_index += 1
+
+        if INFERENCE_MODE == 'async':
+            result = self.inference_worker.poll()
+            if result is not None:
+                detected, detected_frame = result
+                self.landmark_tracker.correct(detected, detected_frame)
+            error = self.inference_worker.take_error()
+            if error is not None:
+                print(f"⚠️  Hand detection failed "
+                      f"({self.inference_worker.failures} frames so far): {error}")
+            if not self.inference_worker.is_busy():
+                self.inference_worker.submit(frame.copy())
+            return self.landmark_tracker.predict(frame)
+
+        if INFERENCE_MODE == 'interval' and \
+                self.frame_index % INFERENCE_INTERVAL != 0:
+            return self.landmark_tracker.predict(frame)
+
+        frame, results = self.hand_detector.find_hands(frame, draw=False)
+        landmarks_list = self.hand_detector.get_landmarks(
+            results, frame.shape)
+
+        # Seed the tracker before landmarks are drawn over the pixels
+        if INFERENCE_MODE == 'interval':
+            self.landmark_tracker.correct(landmarks_list, frame)
+
+        if self.quality['draw_landmarks'] and not SKELETON_ON_OUTPUT:
+            self.hand_detector.draw_hands(frame, results)
+
+        return landmarks_list
+
+    def _apply_quality(self, quality):
+        """
+        Push quality level settings to the components that use them
 
+        Args:
+            quality: Settings dictionary from QualityController
+        """
+        self.quality = quality
+        if not self.hand_detector:
+            # Multi-source workers run their own detectors in other
+            # processes; only the rendering settings apply here
+            return
+        self.hand_detector.set_inference_scale(quality['inference_scale'])
+        if self.inference_worker:
+            # The worker thread may be inside the model right now
+            self.inference_worker.set_model_complexity(quality['model_complexity'])
         else:
-            self.current_mode = 'NONE'
+            self.hand_detector.set_model_complexity(quality['model_complexity'])
+
+    def _subscribe_handlers(self):
+        """Connect the gesture and button handlers to the event bus"""
+        # Mode shown while each gesture is held (anything else is 'NONE')
+        self.gesture_modes = {'DRAW': 'DRAWING', 'SELECT': 'SELECTION',
+                              'CLEAR': 'CLEAR'}
+        if PINCH_CONTROL_ENABLED:
+            self.gesture_modes['ADJUST'] = 'ADJUSTING'
+        if TILED_CANVAS:
+            self.gesture_modes['PAN'] = 'PANNING'
+
+        self.events.subscribe(self._on_gesture_begin, kinds=(BEGIN,))
+        # Every fingertip position is drawn; the other gestures only need
+        # the newest one
+        self.events.subscribe(self._on_draw, names=('DRAW',), kinds=(MOVE, END))
+        self.events.subscribe(self._on_fill, names=('DRAW',), kinds=(BEGIN,))
+        self.events.subscribe(self._on_select, names=('SELECT',), kinds=(MOVE,),
+                              coalesce=True)
+        self.events.subscribe(self._on_clear, names=('CLEAR',), kinds=(BEGIN,))
+        if PINCH_CONTROL_ENABLED:
+            self.events.subscribe(self._on_adjust, names=('ADJUST',),
+                                  kinds=(MOVE, END), coalesce=True)
+        if TILED_CANVAS:
+            self.events.subscribe(self._on_pan, names=('PAN',),
+                                  kinds=(MOVE, END), coalesce=True)
+
+        # UI buttons, by action type
+        buttons = {
+            'color': self._on_color_button,
+            'tool': self._on_tool_button,
+            'action': self._on_action_button,
+            'brush': self._on_brush_button,
+            'pinch': self._on_pinch_button,
+        }
+        for action_type, handler in buttons.items():
+            self.events.subscribe(handler, names=(action_type,), kinds=(ACTION,))
+
+    def _on_gesture_begin(self, event):
+        """Show the mode of the gesture that was just made"""
+        self.current_mode = self.gesture_modes.get(event.name, 'NONE')
+
+    def _on_draw(self, event):
+        """DRAW: ink along the fingertip; letting go ends the stroke"""
+        if event.kind == END:
             self.canvas.reset_previous_point()
-
-    def _handle_button_action(self, action):
+            return
+        if self.canvas.fill_mode:
+            return
+        self.canvas.draw(self.gesture_recognizer.get_drawing_point(event.landmarks))
+
+    def _on_fill(self, event):
+        """DRAW with the fill tool: fill once where the finger starts pointing"""
+        if not self.canvas.fill_mode:
+            return
+        filled = self.canvas.fill(self.gesture_recognizer.get_drawing_point(event.landmarks))
+        if filled is None:
+            print("🪣 Point at an empty area to fill it")
+        else:
+            print(f"🪣 Filled {filled} pixels")
+
+    def _on_select(self, event):
+        """SELECT: hover the UI buttons (hover time is built into the UI manager)"""
+        point = self.gesture_recognizer.get_selection_point(event.landmarks)
+        action = self.ui_manager.check_hover_activation(point)
+        if action:
+            self.events.publish(InputEvent(ACTION, action['type'], value=action['value'],
+                                           source=event.source))
+
+    def _on_clear(self, event):
+        """CLEAR: clear once when the palm opens (not continuously)"""
+        self.canvas.clear()
+        print("🗑️  Canvas cleared by gesture!")
+
+    def _on_adjust(self, event):
+        """ADJUST: pinch control; letting go ends the control session"""
+        if event.kind == END:
+            self.pinch_controller.release()
+            return
+        self._handle_pinch_control(event.landmarks)
+
+    def _on_pan(self, event):
+        """PAN: drag the view with the fingertip"""
+        if event.kind == END:
+            self.pan_point = None
+            return
+        point = self.gesture_recognizer.get_drawing_point(event.landmarks)
+        if self.pan_point is not None:
+            self.canvas.pan(point[0] - self.pan_point[0],
+                            point[1] - self.pan_point[1])
+        self.pan_point = point
+
+    def _handle_pinch_control(self, landmarks):
         """
-        Handle button clicks from UI
-        
+        Map the pinch distance onto the selected brush parameter
+
         Args:
-            action: Dictionary with 'type' and 'value'
+            landmarks: Hand landmarks dictionary
         """
-        if action['type'] == 'color':
-            self.canvas.set_color(action['value'])
-            # Turn off eraser when selecting color
-            self.canvas.set_eraser_mode(False)
-            print(f"🎨 Color changed to: {action['value']}")
-
-        elif action['type'] == 'tool':
-            if action['value'] == 'eraser':
-                self.canvas.toggle_eraser()
-                status = "ON" if self.canvas.eraser_mode else "OFF"
-                print(f"🧹 Eraser: {status}")
-
-        elif action['type'] == 'action':
-            if action['value'] == 'clear':
-                self.canvas.clear()
-                print("🗑️  Canvas cleared")
-            elif action['value'] == 'save':
-                self._save_drawing()
-
-        elif action['type'] == 'brush':
-            if action['value'] == 'increase':
-                self.canvas.increase_brush_size()
-                print(f"🖌️  Brush size: {self.canvas.brush_size}")
-            elif action['value'] == 'decrease':
-                self.canvas.decrease_brush_size()
-                print(f"🖌️  Brush size: {self.canvas.brush_size}")
+        ratio = self.gesture_recognizer.get_normalized_pinch(landmarks)
+
+        if self.pinch_controller.target == 'SIZE':
+            value = self.pinch_controller.update(
+                ratio, self.canvas.brush_size)
+            if value is not None:
+                self.canvas.set_brush_size(value)
+        elif self.pinch_controller.target == 'ZOOM':
+            value = self.pinch_controller.update(ratio, self.canvas.zoom_index)
+            if value is not None:
+                self.canvas.set_zoom(
+                    value, self.gesture_recognizer.get_drawing_point(landmarks))
+                print(f"🔍 Zoom: {ZOOM_LEVELS[value]}x")
+        else:
+            value = self.pinch_controller.update(ratio, self.canvas.opacity)
+            if value is not None:
+                self.canvas.set_opacity(value)
+
+    def _on_color_button(self, event):
+        """Color button: select the color (and turn the eraser off)"""
+        self.canvas.set_color(event.value)
+        self.canvas.set_eraser_mode(False)
+        print(f"🎨 Color changed to: {event.value}")
+
+    def _on_tool_button(self, event):
+        """Tool buttons: toggle the eraser or the fill tool"""
+        if event.value == 'eraser':
+            self.canvas.toggle_eraser()
+            status = "ON" if self.canvas.eraser_mode else "OFF"
+            print(f"🧹 Eraser: {status}")
+        elif event.value == 'fill':
+            if not self.canvas.supports_fill:
+                print("⚠️  Bucket fill needs the plain canvas")
+                return
+            status = "ON" if self.canvas.toggle_fill() else "OFF"
+            print(f"🪣 Fill: {status}")
+
+    def _on_action_button(self, event):
+        """CLEAR and SAVE buttons"""
+        if event.value == 'clear':
+            self.canvas.clear()
+            print("🗑️  Canvas cleared")
+        elif event.value == 'save':
+            self._save_drawing()
+
+    def _on_brush_button(self, event):
+        """BRUSH+ and BRUSH- buttons"""
+        if event.value == 'increase':
+            self.canvas.increase_brush_size()
+        elif event.value == 'decrease':
+            self.canvas.decrease_brush_size()
+        print(f"🖌️  Brush size: {self.canvas.brush_size}")
+
+    def _on_pinch_button(self, event):
+        """PINCH button: switch the parameter the pinch controls"""
+        target = self.pinch_controller.cycle_target()
+        print(f"🤏 Pinch now controls: {target}")
 
     def _save_drawing(self):
         """Save the current drawing"""
@@ -232,17 +711,70 @@ class GestureDrawingApp:
 
     def cleanup(self):
         """Clean up resources"""
+        self.profiler.report()
+        if self.idle_gate:
+            self.idle_gate.report()
         print("\n🛑 Shutting down application...")
-        self.cap.release()
+        if self.inference_worker:
+            self.inference_worker.stop()
+        if self.multi_detector:
+            self.multi_detector.close()
+        if self.sync:
+            self.canvas.close()
+        if self.timelapse:
+            self.timelapse.close()
+        if self.cap:
+            self.cap.release()
         cv2.destroyAllWindows()
-        self.hand_detector.close()
+        if self.hand_detector:
+            self.hand_detector.close()
         print("✅ Application closed successfully!")
 
 
+def parse_args():
+    """Parse command line options"""
+    parser = argparse.ArgumentParser(description="Gesture Drawing Application")
+    parser.add_argument(
+        '--sources', nargs='+', default=MULTI_SOURCES,
+        help="Camera indices or video files, one detector process each")
+    parser.add_argument(
+        '--sync-host', action='store_true',
+        help="Host a shared canvas that other stations can join")
+    parser.add_argument(
+        '--sync-join', metavar='HOST[:PORT]',
+        help="Join the shared canvas hosted at HOST")
+    parser.add_argument(
+        '--timelapse', action='store_true', default=TIMELAPSE_ENABLED,
+        help="Record the session and save a timelapse video on exit ('t' saves one now)")
+    parser.add_argument(
+        '--idle', action='store_true', default=IDLE_GATING_ENABLED,
+        help="Pause hand detection while nothing moves in front of the camera")
+    parser.add_argument(
+        '--startup-profile', action='store_true',
+        help="Report time to first rendered frame and first detection")
+    args = parser.parse_args()
+
+    # Camera indices arrive as strings
+    args.sources = [int(src) if str(src).isdigit() else src
+                    for src in args.sources]
+
+    args.sync = None
+    if args.sync_host:
+        args.sync = ('host', SYNC_PORT)
+    elif args.sync_join:
+        host, _, port = args.sync_join.partition(':')
+        args.sync = ('join', host, int(port) if port else SYNC_PORT)
+    return args
+
+
 def main():
     """Entry point"""
+    args = parse_args()
+    profiler = StartupProfiler(enabled=args.startup_profile)
     try:
-        app = GestureDrawingApp()
+        app = GestureDrawingApp(sources=args.sources, profiler=profiler,
+                                sync=args.sync, timelapse=args.timelapse,
+                                idle=args.idle)
         app.run()
     except KeyboardInterrupt:
         print("\n⚠️  Application interrupted by user")
@@ -8,15 +8,21 @@ import numpy as np
 import time
 from config.settings import (
     COLORS, UI_HEIGHT, UI_BACKGROUND_COLOR, UI_TEXT_COLOR,
-    UI_BUTTON_SIZE, UI_BUTTON_MARGIN, CANVAS_WIDTH, CANVAS_HEIGHT,
+    UI_BUTTON_SIZE, UI_BUTTON_MARGIN, CAMERA_WIDTH, CAMERA_HEIGHT,
     HOVER_TIME
 )
 
+# Frame width the toolbar layout is designed for (narrower frames scale it)
+TOOLBAR_WIDTH = 1280
+
 
 class UIManager:
     """Manages the user interface"""
 
-    def __init__(self):
+    def __init__(self, width=CAMERA_WIDTH, height=CAMERA_HEIGHT):
+        # The UI is drawn on display frames, whatever the canvas resolution
+        self.width = width
+        self.height = height
         self.ui_height = UI_HEIGHT
         self.button_size = UI_BUTTON_SIZE
         self.button_margin = UI_BUTTON_MARGIN
@@ -24,66 +30,135 @@ class UIManager:
         # UI at the top
         self.ui_y_start = 10
 
-        # Create color buttons (top row)
+        # Toolbar buttons, laid out for the frame width
+        self._layout()
+
+        # Hover tracking (clock is swapped for the video clock when
+        # recordings are processed offline)
+        self.clock = time.time
+        self.hover_start_time = None
+        self.current_hover_button = None
+        self.last_activated_button = None
+        self.activation_cooldown = 0.3  # Prevent rapid activation
+        self.last_activation_time = 0
+
+        self.selected_color = None
+
+        # Solid panel blended into the top strip (built once, not per frame)
+        self.panel_fill = np.full(
+            (UI_HEIGHT + 1, self.width + 1, 3), UI_BACKGROUND_COLOR, dtype=np.uint8)
+
+    def set_frame_size(self, width, height):
+        """
+        Lay the toolbar out again for a new frame size
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+        """
+        if (width, height) == (self.width, self.height):
+            return
+        self.width = width
+        self.height = height
+        self._layout()
+        self.panel_fill = np.full(
+            (UI_HEIGHT + 1, self.width + 1, 3), UI_BACKGROUND_COLOR, dtype=np.uint8)
+
+    def _layout(self):
+        """
+        Place every toolbar element for the current frame width
+
+        The layout is designed for TOOLBAR_WIDTH pixels. Narrower frames
+        scale it down horizontally (so buttons neither overlap nor leave
+        the frame); wider frames keep it and anchor CLEAR and SAVE right.
+        """
+        self.scale = min(1.0, self.width / TOOLBAR_WIDTH)
+        x = self._x
+
+        # Color buttons (top row)
         self.color_buttons = self._create_color_buttons()
 
         # Eraser button (right after colors)
         num_colors = len(COLORS)
         self.eraser_button = {
             'name': 'ERASER',
-            'x': 20 + num_colors * (self.button_size + self.button_margin),
+            'x': x(20 + num_colors * (self.button_size + self.button_margin)),
             'y': self.ui_y_start,
-            'width': self.button_size + 20,
+            'width': x(self.button_size + 20),
             'height': self.button_size,
             'color': (60, 60, 60)
         }
 
+        # Fill button (right after the eraser)
+        self.fill_button = {
+            'name': 'FILL',
+            'x': x(20 + num_colors * (self.button_size + self.button_margin) +
+                   self.button_size + 20 + self.button_margin),
+            'y': self.ui_y_start,
+            'width': x(self.button_size + 20),
+            'height': self.button_size,
+            'color': (90, 60, 30)
+        }
+
         # Brush size buttons (below colors)
         self.brush_up_button = {
             'name': 'BRUSH+',
-            'x': 20,
+            'x': x(20),
             'y': self.ui_y_start + self.button_size + 10,
-            'width': 100,
+            'width': x(100),
             'height': 35,
             'color': (50, 200, 50)
         }
 
         self.brush_down_button = {
             'name': 'BRUSH-',
-            'x': 130,
+            'x': x(130),
             'y': self.ui_y_start + self.button_size + 10,
-            'width': 100,
+            'width': x(100),
             'height': 35,
             'color': (200, 50, 50)
         }
 
-        # Action buttons
+        # Brush size readout and preview (between the brush and pinch buttons)
+        self.size_text_x = x(250)
+        self.preview_x = x(370)
+
+        # Pinch target toggle (what the ADJUST gesture controls)
+        self.pinch_button = {
+            'name': 'PINCH',
+            'x': x(500),
+            'y': self.ui_y_start + self.button_size + 10,
+            'width': x(150),
+            'height': 35,
+            'color': (150, 100, 50)
+        }
+
+        # Action buttons (anchored to the right edge)
         self.clear_button = {
             'name': 'CLEAR',
-            'x': CANVAS_WIDTH - 280,
+            'x': self.width - x(280),
             'y': self.ui_y_start + self.button_size + 10,
-            'width': 120,
+            'width': x(120),
             'height': 35,
             'color': (100, 100, 100)
         }
 
         self.save_button = {
             'name': 'SAVE',
-            'x': CANVAS_WIDTH - 150,
+            'x': self.width - x(150),
             'y': self.ui_y_start + self.button_size + 10,
-            'width': 120,
+            'width': x(120),
             'height': 35,
             'color': (50, 150, 50)
         }
 
-        # Hover tracking
-        self.hover_start_time = None
-        self.current_hover_button = None
-        self.last_activated_button = None
-        self.activation_cooldown = 0.3  # Prevent rapid activation
-        self.last_activation_time = 0
+    def _x(self, value):
+        """Scale a horizontal toolbar distance to the frame width"""
+        return int(round(value * self.scale))
 
-        self.selected_color = None
+    def _font(self, size):
+        """Scale a toolbar font size to the frame width"""
+        return size * self.scale
 
     def _create_color_buttons(self):
         """Create color palette buttons"""
@@ -94,9 +169,9 @@ class UIManager:
         for idx, (color_name, color_bgr) in enumerate(COLORS.items()):
             button = {
                 'name': color_name,
-                'x': x_start + idx * (self.button_size + self.button_margin),
+                'x': self._x(x_start + idx * (self.button_size + self.button_margin)),
                 'y': y_start,
-                'width': self.button_size,
+                'width': self._x(self.button_size),
                 'height': self.button_size,
                 'color': color_bgr
             }
@@ -104,7 +179,8 @@ class UIManager:
 
         return buttons
 
-    def draw_ui(self, frame, current_color, brush_size, current_mode, gesture, eraser_mode=False):
+    def draw_ui(self, frame, current_color, brush_size, current_mode, gesture, eraser_mode=False,
+                opacity=1.0, pinch_target='SIZE', detail='full', fill_mode=False):
         """
         Draw the UI on the frame
         
@@ -115,17 +191,27 @@ class UIManager:
             current_mode: Current mode string ('DRAW', 'SELECT', etc.)
             gesture: Current gesture being performed
             eraser_mode: Whether eraser is active
+            opacity: Current ink opacity (0.0 - 1.0)
+            pinch_target: Parameter driven by the pinch gesture
+            detail: 'full' or 'low' (solid panel, no instructions line)
+            fill_mode: Whether the fill tool is active
         """
-        # Create semi-transparent UI panel at top
-        overlay = frame.copy()
-        cv2.rectangle(
-            overlay,
-            (0, 0),
-            (CANVAS_WIDTH, UI_HEIGHT),
-            UI_BACKGROUND_COLOR,
-            -1
-        )
-        cv2.addWeighted(overlay, 0.7, frame, 0.3, 0, frame)
+        self.set_frame_size(frame.shape[1], frame.shape[0])
+
+        if detail == 'full':
+            # Create semi-transparent UI panel at top (blend in place, only
+            # the panel area)
+            panel = frame[0:UI_HEIGHT + 1, 0:self.width + 1]
+            fill = self.panel_fill[0:panel.shape[0], 0:panel.shape[1]]
+            cv2.addWeighted(fill, 0.7, panel, 0.3, 0, dst=panel)
+        else:
+            cv2.rectangle(
+                frame,
+                (0, 0),
+                (self.width, UI_HEIGHT),
+                UI_BACKGROUND_COLOR,
+                -1
+            )
 
         # Draw color buttons
         for button in self.color_buttons:
@@ -177,7 +263,7 @@ class UIManager:
         # Eraser icon (simple crossed lines)
         icon_x = self.eraser_button['x'] + self.eraser_button['width'] // 2
         icon_y = self.eraser_button['y'] + self.eraser_button['height'] // 2
-        icon_size = 15
+        icon_size = self._x(15)
         cv2.line(frame,
                  (icon_x - icon_size, icon_y - icon_size),
                  (icon_x + icon_size, icon_y + icon_size),
@@ -207,14 +293,35 @@ class UIManager:
                 2
             )
 
+        # Draw fill button
+        self._draw_button_with_hover(frame, self.fill_button)
+        cv2.putText(
+            frame,
+            'FILL',
+            (self.fill_button['x'] + self._x(17), self.fill_button['y'] + 38),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            self._font(0.7),
+            UI_TEXT_COLOR,
+            2
+        )
+        if fill_mode:
+            cv2.rectangle(
+                frame,
+                (self.fill_button['x'] - 4, self.fill_button['y'] - 4),
+                (self.fill_button['x'] + self.fill_button['width'] + 4,
+                 self.fill_button['y'] + self.fill_button['height'] + 4),
+                (0, 255, 255),
+                4
+            )
+
         # Draw brush size buttons with hover effect
         self._draw_button_with_hover(frame, self.brush_up_button)
         cv2.putText(
             frame,
             'BRUSH +',
-            (self.brush_up_button['x'] + 10, self.brush_up_button['y'] + 24),
+            (self.brush_up_button['x'] + self._x(10), self.brush_up_button['y'] + 24),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
+            self._font(0.6),
             UI_TEXT_COLOR,
             2
         )
@@ -223,10 +330,10 @@ class UIManager:
         cv2.putText(
             frame,
             'BRUSH -',
-            (self.brush_down_button['x'] + 10,
+            (self.brush_down_button['x'] + self._x(10),
              self.brush_down_button['y'] + 24),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
+            self._font(0.6),
             UI_TEXT_COLOR,
             2
         )
@@ -235,18 +342,18 @@ class UIManager:
         cv2.putText(
             frame,
             f'Size: {brush_size}',
-            (250, self.ui_y_start + self.button_size + 32),
+            (self.size_text_x, self.ui_y_start + self.button_size + 32),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
+            self._font(0.7),
             UI_TEXT_COLOR,
             2
         )
 
         # Draw brush size preview circle
-        preview_x = 370
+        preview_x = self.preview_x
         preview_y = self.ui_y_start + self.button_size + 27
         preview_color = (255, 255, 255) if eraser_mode else current_color
-        preview_size = brush_size * 2 if eraser_mode else brush_size
+        preview_size = max(1, self._x(brush_size * 2 if eraser_mode else brush_size))
 
         cv2.circle(frame, (preview_x, preview_y),
                    preview_size, preview_color, -1)
@@ -258,21 +365,55 @@ class UIManager:
             cv2.putText(
                 frame,
                 'ERASER',
-                (preview_x + 30, preview_y + 5),
+                (preview_x + self._x(30), preview_y + 5),
                 cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
+                self._font(0.6),
                 (0, 255, 255),
                 2
             )
 
+        elif fill_mode:
+            cv2.putText(
+                frame,
+                'FILL',
+                (preview_x + self._x(30), preview_y + 5),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                self._font(0.6),
+                (0, 255, 255),
+                2
+            )
+
+        # Draw pinch target toggle and current opacity
+        self._draw_button_with_hover(frame, self.pinch_button)
+        cv2.putText(
+            frame,
+            f'PINCH: {pinch_target}',
+            (self.pinch_button['x'] + self._x(8), self.pinch_button['y'] + 24),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            self._font(0.5),
+            UI_TEXT_COLOR,
+            2
+        )
+
+        cv2.putText(
+            frame,
+            f'Opacity: {int(round(opacity * 100))}%',
+            (self.pinch_button['x'] + self.pinch_button['width'] + self._x(15),
+             self.ui_y_start + self.button_size + 32),
+            cv2.FONT_HERSHEY_SIMPLEX,
+            self._font(0.7),
+            UI_TEXT_COLOR,
+            2
+        )
+
         # Draw action buttons
         self._draw_button_with_hover(frame, self.clear_button)
         cv2.putText(
             frame,
             'CLEAR',
-            (self.clear_button['x'] + 25, self.clear_button['y'] + 24),
+            (self.clear_button['x'] + self._x(25), self.clear_button['y'] + 24),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
+            self._font(0.7),
             UI_TEXT_COLOR,
             2
         )
@@ -281,15 +422,15 @@ class UIManager:
         cv2.putText(
             frame,
             'SAVE',
-            (self.save_button['x'] + 30, self.save_button['y'] + 24),
+            (self.save_button['x'] + self._x(30), self.save_button['y'] + 24),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.7,
+            self._font(0.7),
             UI_TEXT_COLOR,
             2
         )
 
         # Display current mode and gesture at bottom
-        mode_y = CANVAS_HEIGHT - 60
+        mode_y = self.height - 60
         cv2.putText(
             frame,
             f'Mode: {current_mode}',
@@ -310,14 +451,17 @@ class UIManager:
             2
         )
 
+        if detail != 'full':
+            return frame
+
         # Instructions at bottom
-        instructions = "1 finger = DRAW/ERASE | 2 fingers = SELECT (hover: colors, eraser, +/-) | Open palm = CLEAR"
+        instructions = "1 finger = DRAW/ERASE/FILL | 2 fingers = SELECT | Thumb+index = PINCH ADJUST | Open palm = CLEAR"
         cv2.putText(
             frame,
             instructions,
-            (CANVAS_WIDTH // 2 - 400, CANVAS_HEIGHT - 15),
+            (self.width // 2 - self._x(400), self.height - 15),
             cv2.FONT_HERSHEY_SIMPLEX,
-            0.5,
+            self._font(0.5),
             (200, 200, 200),
             1
         )
@@ -346,7 +490,7 @@ class UIManager:
 
         # Draw hover progress bar if this button is being hovered
         if self.current_hover_button == button['name'] and self.hover_start_time:
-            hover_duration = time.time() - self.hover_start_time
+            hover_duration = self.clock() - self.hover_start_time
             progress = min(hover_duration / HOVER_TIME, 1.0)
 
             # Progress bar at bottom of button
@@ -375,7 +519,7 @@ class UIManager:
             return None
 
         x, y = point
-        current_time = time.time()
+        current_time = self.clock()
 
         # Check if enough time has passed since last activation
         if current_time - self.last_activation_time < self.activation_cooldown:
@@ -397,6 +541,9 @@ class UIManager:
             if self._is_point_in_button(point, self.eraser_button):
                 hovered_button = 'ERASER'
                 hovered_action = {'type': 'tool', 'value': 'eraser'}
+            elif self._is_point_in_button(point, self.fill_button):
+                hovered_button = 'FILL'
+                hovered_action = {'type': 'tool', 'value': 'fill'}
 
         # Check brush size buttons
         if not hovered_button:
@@ -406,6 +553,9 @@ class UIManager:
             elif self._is_point_in_button(point, self.brush_down_button):
                 hovered_button = 'BRUSH-'
                 hovered_action = {'type': 'brush', 'value': 'decrease'}
+            elif self._is_point_in_button(point, self.pinch_button):
+                hovered_button = 'PINCH'
+                hovered_action = {'type': 'pinch', 'value': 'cycle'}
             elif self._is_point_in_button(point, self.clear_button):
                 hovered_button = 'CLEAR'
                 hovered_action = {'type': 'action', 'value': 'clear'}
@@ -5,27 +5,58 @@ Manages the drawing canvas and drawing operations
 
 import cv2
 import numpy as np
+from utils.preview import PreviewPyramid
+from utils.regions import RegionMap
+from utils.shapes import ShapeFitter, RasterBackup, draw_shape, shape_bounds
+from utils.strokes import stroke_tolerance
 from config.settings import (
-    CANVAS_WIDTH, CANVAS_HEIGHT, COLORS, DEFAULT_COLOR,
+    CANVAS_WIDTH, CANVAS_HEIGHT, CAMERA_WIDTH, CAMERA_HEIGHT, COLORS, DEFAULT_COLOR,
     DEFAULT_BRUSH_SIZE, MIN_BRUSH_SIZE, MAX_BRUSH_SIZE,
-    SMOOTHING_FACTOR
+    SMOOTHING_FACTOR, DEFAULT_OPACITY, MIN_OPACITY, MAX_OPACITY,
+    SHAPE_SNAP_ENABLED, FILL_TILES_PER_FRAME
 )
 
 
 class Canvas:
     """Manages the drawing canvas"""
 
-    def __init__(self):
+    # Whether fill() works on this canvas type
+    supports_fill = True
+
+    def __init__(self, width=CANVAS_WIDTH, height=CANVAS_HEIGHT):
         # Create blank canvas
+        self.width = width
+        self.height = height
         self.canvas = np.zeros(
-            (CANVAS_HEIGHT, CANVAS_WIDTH, 3), dtype=np.uint8)
+            (self.height, self.width, 3), dtype=np.uint8)
+
+        # Drawing points arrive in display (camera frame) pixels and are
+        # scaled into canvas pixels
+        self.display_size = None
+        self.scale_x = 1.0
+        self.scale_y = 1.0
+        self.preview = None
+        self.set_display_size(CAMERA_WIDTH, CAMERA_HEIGHT)
+
+        # Area changed since the last pop_changes() (timelapse recording)
+        self.changed = None
+
+        # Empty regions for the bucket fill, relabeled where ink changes
+        self.regions = RegionMap((self.width, self.height))
 
         # Drawing state
         self.current_color = COLORS[DEFAULT_COLOR]
         self.brush_size = DEFAULT_BRUSH_SIZE
+        self.opacity = DEFAULT_OPACITY
         self.is_drawing = False
         self.previous_point = None
         self.eraser_mode = False  # Track if eraser is active
+        self.fill_mode = False  # Pointing fills the region instead of drawing
+
+        # Shape snapping: fit of the stroke being drawn, the pixels it drew
+        # over, its ink and its last point (None when not recording)
+        self.snap_shapes = SHAPE_SNAP_ENABLED
+        self.shape_stroke = None
 
         # History for undo functionality (optional)
         self.canvas_history = []
@@ -33,56 +64,305 @@ class Canvas:
     def clear(self):
         """Clear the canvas"""
         self.canvas = np.zeros(
-            (CANVAS_HEIGHT, CANVAS_WIDTH, 3), dtype=np.uint8)
+            (self.height, self.width, 3), dtype=np.uint8)
         self.previous_point = None
+        self.shape_stroke = None
         self.canvas_history.append(self.canvas.copy())
+        self._mark_all_dirty()
+        self.regions.reset()
+
+    def set_display_size(self, width, height):
+        """
+        Set the size of the frames the canvas is shown on
+
+        Args:
+            width: Display (camera frame) width in pixels
+            height: Display (camera frame) height in pixels
+        """
+        if self.display_size == (width, height):
+            return
+        self.display_size = (width, height)
+        self.scale_x = self.width / width
+        self.scale_y = self.height / height
+        self.preview = PreviewPyramid((self.width, self.height), self.display_size)
+        self.previous_point = None
 
     def draw(self, point):
         """
         Draw on the canvas (or erase if in eraser mode)
         
         Args:
-            point: Tuple (x, y) of the drawing point
+            point: Tuple (x, y) of the drawing point in display pixels
         """
         if point is None:
-            self.previous_point = None
+            self.reset_previous_point()
+            return
+
+        # Map into canvas space (previous_point is kept in canvas space)
+        x = int(round(point[0] * self.scale_x))
+        y = int(round(point[1] * self.scale_y))
+
+        draw_color, thickness, opacity = self._stroke_style()
+        if self.snap_shapes:
+            self._record_shape_point((x, y), (draw_color, thickness, opacity))
+        self._stroke(self.previous_point, (x, y), draw_color, thickness, opacity)
+        self.previous_point = (x, y)
+
+    def _record_shape_point(self, point, style):
+        """
+        Feed a stroke point to the shape fit, saving the pixels it covers
+
+        Args:
+            point: Tuple (x, y) in canvas pixels, about to be drawn
+            style: Tuple (color, thickness, opacity) of the ink
+        """
+        stroke = self.shape_stroke
+        if self.previous_point is None:
+            # A new stroke (eraser strokes are never snapped)
+            stroke = None
+            if not self.eraser_mode:
+                stroke = {'fitter': ShapeFitter(stroke_tolerance(style[1])),
+                          'backup': RasterBackup(self.canvas),
+                          'style': style, 'last': None}
+            self.shape_stroke = stroke
+        elif stroke is None or stroke['last'] != self.previous_point:
+            # Continuing a stroke that is not being recorded (another
+            # pen's, in multi-source mode): it may cover the recorded one
+            self.shape_stroke = None
             return
+        if stroke is None:
+            return
+
+        start = self.previous_point if self.previous_point is not None else point
+        pad = style[1] + 1
+        stroke['backup'].save(min(start[0], point[0]) - pad, min(start[1], point[1]) - pad,
+                              max(start[0], point[0]) + pad + 1,
+                              max(start[1], point[1]) + pad + 1)
+        stroke['fitter'].add(point)
+        stroke['last'] = point
+
+    def _snap_shape(self):
+        """
+        Replace the finished stroke with the shape it approximates
+
+        Returns:
+            The shape dictionary, or None if the stroke stays freehand
+        """
+        stroke = self.shape_stroke
+        self.shape_stroke = None
+        shape = stroke['fitter'].fit()
+        if shape is None:
+            return None
 
-        x, y = point
+        # Undo the freehand ink, then draw the clean shape
+        restored = stroke['backup'].restore()
+        self._mark_dirty(restored[:2], restored[2:], 0)
+        color, thickness, opacity = stroke['style']
+        x0, y0, x1, y1 = shape_bounds(shape)
+        pad = thickness + 1
+        x0 = max(0, int(np.floor(x0)) - pad)
+        y0 = max(0, int(np.floor(y0)) - pad)
+        x1 = min(self.width, int(np.ceil(x1)) + pad + 1)
+        y1 = min(self.height, int(np.ceil(y1)) + pad + 1)
+        if x0 < x1 and y0 < y1:
+            self._mark_dirty((x0, y0), (x1, y1), 0)
+            if opacity >= 1.0:
+                draw_shape(self.canvas, shape, color, thickness)
+            else:
+                mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+                draw_shape(mask, shape, 255, thickness, offset=(x0, y0))
+                self._blend_mask(mask, x0, y0, color, opacity)
+        return shape
+
+    def fill(self, point):
+        """
+        Flood the empty region under a point with the current ink
+
+        Args:
+            point: Tuple (x, y) in display pixels
+
+        Returns:
+            Number of pixels filled, or None if the point is on ink or off
+            the canvas
+        """
+        x = int(round(point[0] * self.scale_x))
+        y = int(round(point[1] * self.scale_y))
+        # Translucent ink over the empty (black) canvas
+        color = tuple(int(round(channel * self.opacity)) for channel in self.current_color)
+        result = self.regions.fill(self.canvas, (x, y), color)
+        if result is None:
+            return None
+        painted, rect = result
+        self._mark_changed(rect)
+        return painted
+
+    def update_regions(self):
+        """Relabel a few of the fill regions changed by strokes (call once per frame)"""
+        self.regions.refresh(self.canvas, FILL_TILES_PER_FRAME)
+
+    def _stroke_style(self):
+        """
+        Get the ink for the current tool
 
+        Returns:
+            Tuple (BGR color, thickness in canvas pixels, opacity)
+        """
         # Choose color based on mode
         draw_color = (0, 0, 0) if self.eraser_mode else self.current_color
+        thickness = self.brush_size if not self.eraser_mode else self.brush_size * 2
+        # Brush size is in display pixels so strokes look the same on screen
+        thickness = max(1, int(round(thickness * (self.scale_x + self.scale_y) / 2)))
+        opacity = 1.0 if self.eraser_mode else self.opacity
+        return draw_color, thickness, opacity
+
+    def _stroke(self, start, end, draw_color, thickness, opacity):
+        """
+        Draw one stroke segment in canvas coordinates
+
+        Args:
+            start: Tuple (x, y) segment start, or None for a single dot
+            end: Tuple (x, y) segment end
+            draw_color: BGR color of the ink
+            thickness: Line thickness in canvas pixels
+            opacity: Ink opacity (1.0 = opaque)
+        """
+        self._mark_dirty(start, end, thickness)
+
+        # Translucent ink is stamped on a mask and blended in its ROI only
+        if opacity < 1.0:
+            self._draw_translucent(start, end, draw_color, thickness, opacity)
+            return
 
         # Draw line from previous point to current point for smooth lines
-        if self.previous_point is not None:
+        if start is not None:
             cv2.line(
                 self.canvas,
-                self.previous_point,
-                (x, y),
+                start,
+                end,
                 draw_color,
-                self.brush_size if not self.eraser_mode else self.brush_size * 2
+                thickness
             )
         else:
-            # Draw circle if no previous point
-            cv2.circle(
+            # Draw a dot if no previous point: the line's round cap, so the
+            # stroke starts as wide as it continues
+            cv2.line(
                 self.canvas,
-                (x, y),
-                self.brush_size if not self.eraser_mode else self.brush_size * 2,
+                end,
+                end,
                 draw_color,
-                -1
+                thickness
             )
 
-        self.previous_point = (x, y)
+    def _draw_translucent(self, start, end, draw_color, thickness, opacity,
+                          image=None):
+        """
+        Blend a stroke segment into the canvas at the given opacity
+
+        Args:
+            start: Tuple (x, y) segment start (the end of the stroke's
+                previous segment), or None for a single dot
+            end: Tuple (x, y) end point of the segment
+            draw_color: BGR color of the ink
+            thickness: Line thickness in pixels
+            opacity: Ink opacity (0.0 - 1.0)
+            image: Image to blend into, in the same coordinates (default:
+                the canvas)
+        """
+        if image is None:
+            image = self.canvas
+        height, width = image.shape[:2]
+        first = start if start is not None else end
+        pad = thickness + 1
+        x0 = max(0, min(first[0], end[0]) - pad)
+        y0 = max(0, min(first[1], end[1]) - pad)
+        x1 = min(width, max(first[0], end[0]) + pad + 1)
+        y1 = min(height, max(first[1], end[1]) + pad + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        mask = np.zeros((y1 - y0, x1 - x0), dtype=np.uint8)
+        local_start = (first[0] - x0, first[1] - y0)
+        local_end = (end[0] - x0, end[1] - y0)
+        if start is not None:
+            cv2.line(mask, local_start, local_end, 255, thickness)
+            # The round cap at the start was blended with the previous
+            # segment of the stroke; blending it again leaves a dark bead
+            cv2.line(mask, local_start, local_start, 0, thickness)
+        else:
+            # The same cap as a segment end, so the next segment clears
+            # all of it
+            cv2.line(mask, local_end, local_end, 255, thickness)
+
+        self._blend_mask(mask, x0, y0, draw_color, opacity, image)
+
+    def _blend_mask(self, mask, x0, y0, draw_color, opacity, image=None):
+        """Blend ink into the canvas (or another image) where a local mask is set"""
+        if image is None:
+            image = self.canvas
+        roi = image[y0:y0 + mask.shape[0], x0:x0 + mask.shape[1]]
+        inked = mask > 0
+        blended = roi[inked] * (1.0 - opacity) + \
+            np.array(draw_color, dtype=np.float32) * opacity
+        roi[inked] = blended.astype(np.uint8)
+
+    def _mark_dirty(self, start, end, thickness):
+        """Queue the area of a segment for preview resampling and relabeling"""
+        first = start if start is not None else end
+        pad = thickness + 1
+        rect = (min(first[0], end[0]) - pad, min(first[1], end[1]) - pad,
+                max(first[0], end[0]) + pad + 1, max(first[1], end[1]) + pad + 1)
+        self.regions.mark_dirty(*rect)
+        self._mark_changed(rect)
+
+    def _mark_changed(self, rect):
+        """Queue a rectangle for preview resampling and timelapse capture"""
+        self.preview.mark_dirty(*rect)
+
+        if self.changed is None:
+            self.changed = rect
+        else:
+            x0, y0, x1, y1 = self.changed
+            self.changed = (min(x0, rect[0]), min(y0, rect[1]),
+                            max(x1, rect[2]), max(y1, rect[3]))
+
+    def _mark_all_dirty(self):
+        """Queue the whole canvas for preview resampling and relabeling"""
+        self.preview.mark_all_dirty()
+        self.regions.mark_all_dirty()
+        self.changed = (0, 0, self.width, self.height)
+
+    def pop_changes(self):
+        """
+        Take the area changed since the previous call
+
+        Returns:
+            Rectangle (x0, y0, x1, y1) in canvas pixels (half-open), or
+            None if nothing changed
+        """
+        rect = self.changed
+        self.changed = None
+        if rect is None:
+            return None
+        return PreviewPyramid._clip(rect, (self.width, self.height))
 
     def toggle_eraser(self):
-        """Toggle eraser mode on/off"""
+        """Toggle eraser mode on/off (turning it on puts the fill tool away)"""
         self.eraser_mode = not self.eraser_mode
+        if self.eraser_mode:
+            self.fill_mode = False
         return self.eraser_mode
 
     def set_eraser_mode(self, enabled):
         """Set eraser mode explicitly"""
         self.eraser_mode = enabled
 
+    def toggle_fill(self):
+        """Toggle the fill tool on/off (turning it on puts the eraser away)"""
+        self.fill_mode = not self.fill_mode
+        if self.fill_mode:
+            self.eraser_mode = False
+        return self.fill_mode
+
     def set_color(self, color_name):
         """
         Set the drawing color
@@ -102,6 +382,15 @@ class Canvas:
         """
         self.brush_size = max(MIN_BRUSH_SIZE, min(MAX_BRUSH_SIZE, size))
 
+    def set_opacity(self, opacity):
+        """
+        Set the ink opacity
+
+        Args:
+            opacity: Float between MIN_OPACITY and MAX_OPACITY
+        """
+        self.opacity = max(MIN_OPACITY, min(MAX_OPACITY, opacity))
+
     def increase_brush_size(self):
         """Increase brush size by 1"""
         self.brush_size = min(MAX_BRUSH_SIZE, self.brush_size + 1)
@@ -111,11 +400,20 @@ class Canvas:
         self.brush_size = max(MIN_BRUSH_SIZE, self.brush_size - 1)
 
     def get_canvas(self):
-        """Get the current canvas"""
+        """Get the current canvas (full canvas resolution)"""
         return self.canvas
 
+    def get_preview(self):
+        """Get the canvas at display resolution, updated incrementally"""
+        return self.preview.update(self.canvas)
+
     def reset_previous_point(self):
         """Reset the previous point (call when switching modes)"""
+        # This ends the stroke: snap it if it was recorded from start to end
+        stroke = self.shape_stroke
+        if stroke is not None and self.previous_point is not None and \
+                stroke['last'] == self.previous_point:
+            self._snap_shape()
         self.previous_point = None
 
     def save_canvas(self, filename='drawing.png'):
@@ -0,0 +1,498 @@
+"""
+Canvas Sync Module
+Shares one canvas between several stations over the LAN
+
+Stations exchange small binary operations instead of images:
+
+    SEGMENT  stroke segment in canvas pixels             15 bytes
+    STATE    a station's ink (color, size, eraser, alpha) 14 bytes
+    CLEAR    clear the canvas                             7 bytes
+
+Every operation carries a Lamport timestamp and the sending station's
+id, which gives all stations the same total order. An operation that
+arrives out of order rolls the canvas back to a checkpoint and replays
+the log, so every station converges to the same pixels.
+
+One station hosts (relays operations and serves late joiners a
+checkpoint snapshot plus the operations after it); the others join it.
+"""
+
+import bisect
+import queue
+import socket
+import struct
+import threading
+import time
+from collections import deque
+
+import cv2
+import numpy as np
+from config.settings import (
+    SYNC_PORT, SYNC_CHECKPOINT_INTERVAL, SYNC_MAX_CHECKPOINTS
+)
+from utils.canvas import Canvas
+
+
+OP_SEGMENT = 1
+OP_STATE = 2
+OP_CLEAR = 3
+OP_WELCOME = 10
+OP_SNAPSHOT = 11
+
+# type, site, lamport
+HEADER = struct.Struct('<BHI')
+SEGMENT = struct.Struct('<BHIhhhh')  # + x0, y0, x1, y1 (x0 = NO_START: dot)
+STATE = struct.Struct('<BHIBBBHBB')  # + b, g, r, thickness, eraser, opacity
+WELCOME = struct.Struct('<BHIHH')  # site = assigned id, + canvas w, h
+SNAPSHOT = struct.Struct('<BHIII')  # + png length, state count
+SITE_STATE = struct.Struct('<HBBBHBB')
+
+MESSAGE_SIZES = {
+    OP_SEGMENT: SEGMENT.size,
+    OP_STATE: STATE.size,
+    OP_CLEAR: HEADER.size,
+    OP_WELCOME: WELCOME.size,
+    OP_SNAPSHOT: SNAPSHOT.size,
+}
+
+HOST_SITE = 0
+NO_START = -32768  # Segment start marker for a single dot
+
+
+def encode_op(op):
+    """
+    Pack an operation tuple into bytes
+
+    Args:
+        op: Tuple (type, site, lamport, payload)
+
+    Returns:
+        Bytes message
+    """
+    op_type, site, lamport, payload = op
+    if op_type == OP_SEGMENT:
+        return SEGMENT.pack(op_type, site, lamport, *payload)
+    if op_type == OP_STATE:
+        (b, g, r), thickness, eraser, opacity = payload
+        return STATE.pack(op_type, site, lamport, b, g, r, thickness,
+                          int(eraser), int(round(opacity * 255)))
+    return HEADER.pack(op_type, site, lamport)
+
+
+def decode_op(data):
+    """
+    Unpack an operation message
+
+    Args:
+        data: Bytes of exactly one SEGMENT, STATE or CLEAR message
+
+    Returns:
+        Tuple (type, site, lamport, payload)
+    """
+    op_type = data[0]
+    if op_type == OP_SEGMENT:
+        _, site, lamport, *coords = SEGMENT.unpack(data)
+        return (op_type, site, lamport, tuple(coords))
+    if op_type == OP_STATE:
+        _, site, lamport, b, g, r, thickness, eraser, opacity = STATE.unpack(data)
+        return (op_type, site, lamport,
+                ((b, g, r), thickness, bool(eraser), opacity / 255))
+    _, site, lamport = HEADER.unpack(data)
+    return (op_type, site, lamport, None)
+
+
+def read_message(stream):
+    """
+    Read one message from a socket file
+
+    Returns:
+        Tuple (type, fixed-size bytes, extra bytes) or None on disconnect
+    """
+    first = stream.read(1)
+    if not first:
+        return None
+    size = MESSAGE_SIZES.get(first[0])
+    if size is None:
+        raise ValueError(f"Unknown sync message type {first[0]}")
+    data = first + stream.read(size - 1)
+    if len(data) < size:
+        return None
+
+    extra = b''
+    if first[0] == OP_SNAPSHOT:
+        _, _, _, png_length, state_count = SNAPSHOT.unpack(data)
+        extra = stream.read(png_length + state_count * SITE_STATE.size)
+    return first[0], data, extra
+
+
+class SyncTransport:
+    """TCP links to the other stations (host relays, joiners connect)"""
+
+    def __init__(self, host=None, port=SYNC_PORT):
+        """
+        Args:
+            host: Address of the hosting station, or None to host
+            port: TCP port of the host
+        """
+        self.is_host = host is None
+        self.incoming = queue.Queue()
+        self.pending_joins = queue.Queue()
+        self.lock = threading.Lock()
+        self.peers = []  # Sockets receiving relayed operations
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.running = True
+
+        if self.is_host:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind(('', port))
+            self.server.listen()
+            self.port = self.server.getsockname()[1]
+            threading.Thread(target=self._accept_loop, daemon=True).start()
+        else:
+            self.server = None
+            self.port = port
+            sock = socket.create_connection((host, port))
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.peers.append(sock)
+            threading.Thread(target=self._read_loop, args=(sock,),
+                             daemon=True).start()
+
+    def _accept_loop(self):
+        """Host: queue new stations; the canvas owner sends their snapshot"""
+        while self.running:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                break
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self.pending_joins.put(sock)
+
+    def _read_loop(self, sock):
+        """Receive messages from one peer"""
+        stream = sock.makefile('rb')
+        try:
+            while self.running:
+                message = read_message(stream)
+                if message is None:
+                    break
+                op_type, data, extra = message
+
+                # Relay and enqueue under the lock so a snapshot taken under
+                # the same lock can never miss an operation
+                with self.lock:
+                    self.bytes_received += len(data) + len(extra)
+                    if self.is_host and op_type in (OP_SEGMENT, OP_STATE, OP_CLEAR):
+                        self._send_locked(data, exclude=sock)
+                    self.incoming.put((op_type, data, extra))
+        except (OSError, ValueError):
+            pass
+        finally:
+            with self.lock:
+                if sock in self.peers:
+                    self.peers.remove(sock)
+            sock.close()
+
+    def _send_locked(self, data, exclude=None):
+        """Send to every peer (caller holds the lock)"""
+        for sock in list(self.peers):
+            if sock is exclude:
+                continue
+            try:
+                sock.sendall(data)
+                self.bytes_sent += len(data)
+            except OSError:
+                self.peers.remove(sock)
+
+    def send(self, data):
+        """Send a local operation to the other stations"""
+        with self.lock:
+            self._send_locked(data)
+
+    def admit(self, sock, messages):
+        """
+        Host: send a new station its catch-up messages and start relaying
+
+        Args:
+            sock: The new station's socket
+            messages: Bytes to send first (welcome, snapshot, log)
+        """
+        # Caller holds the lock so no operation slips between the
+        # snapshot and relaying
+        sock.sendall(messages)
+        self.bytes_sent += len(messages)
+        self.peers.append(sock)
+        threading.Thread(target=self._read_loop, args=(sock,), daemon=True).start()
+
+    def close(self):
+        """Close all connections"""
+        self.running = False
+        if self.server:
+            self.server.close()
+        with self.lock:
+            for sock in self.peers:
+                try:
+                    sock.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+                sock.close()
+            self.peers = []
+
+
+class SyncedCanvas(Canvas):
+    """Canvas whose operations are replicated to other stations"""
+
+    # Fills are not part of the protocol, so stations would diverge
+    supports_fill = False
+
+    def __init__(self, host=None, port=SYNC_PORT, **kwargs):
+        """
+        Args:
+            host: Address of the hosting station, or None to host
+            port: TCP port of the host
+        """
+        super().__init__(**kwargs)
+
+        self.site = HOST_SITE
+        self.lamport = 0
+        self.next_site = HOST_SITE + 1
+
+        # Ink per station, as set by its latest STATE operation
+        self.site_states = {}
+        self.sent_state = None
+
+        # Ordered log since the oldest checkpoint, and its sort keys
+        self.log = []
+        self.log_keys = []
+        # (log index, canvas copy, site_states copy)
+        self.checkpoints = deque()
+        self._add_checkpoint()
+
+        self.transport = SyncTransport(host, port)
+        if not self.transport.is_host:
+            self._wait_for_welcome()
+
+    # Local operations ------------------------------------------------------
+
+    def draw(self, point):
+        """
+        Draw locally and replicate the segment
+
+        Args:
+            point: Tuple (x, y) of the drawing point in display pixels
+        """
+        if point is None:
+            self.previous_point = None
+            return
+
+        x = int(round(point[0] * self.scale_x))
+        y = int(round(point[1] * self.scale_y))
+
+        draw_color, thickness, opacity = self._stroke_style()
+        state = (tuple(draw_color), thickness, self.eraser_mode, opacity)
+        if state != self.sent_state:
+            self._local_op(OP_STATE, state)
+            self.sent_state = state
+
+        start = self.previous_point if self.previous_point is not None \
+            else (NO_START, NO_START)
+        self._local_op(OP_SEGMENT, (start[0], start[1], x, y))
+        self.previous_point = (x, y)
+
+    def clear(self):
+        """Clear the canvas on every station"""
+        self._local_op(OP_CLEAR, None)
+        self.previous_point = None
+
+    def _local_op(self, op_type, payload):
+        """Timestamp, apply and send an operation made at this station"""
+        self.lamport += 1
+        data = encode_op((op_type, self.site, self.lamport, payload))
+        # Apply the operation as the other stations decode it (opacity
+        # travels in 1/255 steps), or translucent ink would differ
+        self._apply(decode_op(data))
+        self.transport.send(data)
+
+    # Remote operations -----------------------------------------------------
+
+    def poll(self):
+        """
+        Apply operations received from other stations (call every frame)
+
+        Returns:
+            List of operations applied
+        """
+        applied = []
+        while True:
+            try:
+                op_type, data, extra = self.transport.incoming.get_nowait()
+            except queue.Empty:
+                break
+            if op_type in (OP_SEGMENT, OP_STATE, OP_CLEAR):
+                op = decode_op(data)
+                self.lamport = max(self.lamport, op[2])
+                self._apply(op)
+                applied.append(op)
+
+        if self.transport.is_host:
+            self._admit_joiners()
+        return applied
+
+    def _admit_joiners(self):
+        """Host: send new stations a snapshot plus the log after it"""
+        while True:
+            try:
+                sock = self.transport.pending_joins.get_nowait()
+            except queue.Empty:
+                return
+
+            with self.transport.lock:
+                # Apply anything already received so the catch-up is complete
+                while True:
+                    try:
+                        op_type, data, _ = self.transport.incoming.get_nowait()
+                    except queue.Empty:
+                        break
+                    op = decode_op(data)
+                    self.lamport = max(self.lamport, op[2])
+                    self._apply(op)
+
+                site = self.next_site
+                self.next_site += 1
+                messages = WELCOME.pack(OP_WELCOME, site, self.lamport,
+                                        self.width, self.height)
+                messages += self._encode_snapshot()
+                messages += b''.join(encode_op(op) for op in self.log[self.checkpoints[0][0]:])
+                try:
+                    self.transport.admit(sock, messages)
+                    print(f"🤝 Station {site} joined the shared canvas")
+                except OSError:
+                    sock.close()
+
+    def _wait_for_welcome(self, timeout=10.0):
+        """Joiner: take the site id, snapshot and log from the host"""
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                op_type, data, extra = self.transport.incoming.get(timeout=0.1)
+            except queue.Empty:
+                continue
+
+            if op_type == OP_WELCOME:
+                _, self.site, self.lamport, width, height = WELCOME.unpack(data)
+                if (width, height) != (self.width, self.height):
+                    raise ValueError(
+                        f"Host canvas is {width}x{height}, "
+                        f"this station's is {self.width}x{self.height}")
+            elif op_type == OP_SNAPSHOT:
+                self._load_snapshot(data, extra)
+                return
+        raise TimeoutError("No snapshot received from the sync host")
+
+    def _encode_snapshot(self):
+        """Oldest checkpoint as a SNAPSHOT message"""
+        _, canvas, site_states = self.checkpoints[0]
+        _, png = cv2.imencode('.png', canvas)
+        png = png.tobytes()
+        states = b''.join(
+            SITE_STATE.pack(site, *color, thickness, int(eraser),
+                            int(round(opacity * 255)))
+            for site, (color, thickness, eraser, opacity) in site_states.items()
+        )
+        return SNAPSHOT.pack(OP_SNAPSHOT, 0, 0, len(png), len(site_states)) + png + states
+
+    def _load_snapshot(self, data, extra):
+        """Replace local state with a host snapshot"""
+        _, _, _, png_length, state_count = SNAPSHOT.unpack(data)
+        image = cv2.imdecode(np.frombuffer(extra[:png_length], np.uint8),
+                             cv2.IMREAD_COLOR)
+        self.canvas[:] = image
+
+        self.site_states = {}
+        offset = png_length
+        for _ in range(state_count):
+            site, b, g, r, thickness, eraser, opacity = SITE_STATE.unpack_from(
+                extra, offset)
+            self.site_states[site] = ((b, g, r), thickness, bool(eraser), opacity / 255)
+            offset += SITE_STATE.size
+
+        self.log = []
+        self.log_keys = []
+        self.checkpoints.clear()
+        self._add_checkpoint()
+        self._mark_all_dirty()
+
+    # Ordering and replay ---------------------------------------------------
+
+    def _apply(self, op):
+        """Insert an operation in total order and render it"""
+        key = (op[2], op[1])
+
+        if not self.log_keys or key > self.log_keys[-1]:
+            self.log.append(op)
+            self.log_keys.append(key)
+            self._render(op)
+        else:
+            index = bisect.bisect(self.log_keys, key)
+            self.log.insert(index, op)
+            self.log_keys.insert(index, key)
+            self._replay_from(index)
+
+        if len(self.log) - self.checkpoints[-1][0] >= SYNC_CHECKPOINT_INTERVAL:
+            self._add_checkpoint()
+
+    def _replay_from(self, index):
+        """Roll back to the last checkpoint before index and replay"""
+        # Checkpoints taken after the insertion point lack the inserted
+        # operation, and their log indices are off by one
+        while self.checkpoints and self.checkpoints[-1][0] > index:
+            self.checkpoints.pop()
+
+        if not self.checkpoints:
+            # Older than anything retained: best effort, draw it now and
+            # checkpoint the result
+            self._render(self.log[index])
+            self._add_checkpoint()
+            return
+
+        start, canvas, site_states = self.checkpoints[-1]
+        np.copyto(self.canvas, canvas)
+        self.site_states = dict(site_states)
+        for op in self.log[start:]:
+            self._render(op)
+        self._mark_all_dirty()
+
+    def _add_checkpoint(self):
+        """Snapshot the canvas so out-of-order operations replay quickly"""
+        self.checkpoints.append(
+            (len(self.log), self.canvas.copy(), dict(self.site_states)))
+
+        if len(self.checkpoints) > SYNC_MAX_CHECKPOINTS:
+            self.checkpoints.popleft()
+            # Drop log entries older than the oldest checkpoint
+            trim = self.checkpoints[0][0]
+            del self.log[:trim]
+            del self.log_keys[:trim]
+            self.checkpoints = deque(
+                (index - trim, canvas, states)
+                for index, canvas, states in self.checkpoints)
+
+    def _render(self, op):
+        """Draw one operation onto the canvas"""
+        op_type, site, _, payload = op
+        if op_type == OP_STATE:
+            self.site_states[site] = payload
+        elif op_type == OP_CLEAR:
+            self.canvas[:] = 0
+            self._mark_all_dirty()
+        elif op_type == OP_SEGMENT:
+            color, thickness, _, opacity = self.site_states.get(
+                site, ((255, 255, 255), 1, False, 1.0))
+            x0, y0, x1, y1 = payload
+            start = None if x0 == NO_START else (x0, y0)
+            self._stroke(start, (x1, y1), color, thickness, opacity)
+
+    def close(self):
+        """Disconnect from the other stations"""
+        self.transport.close()
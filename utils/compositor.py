@@ -0,0 +1,61 @@
+"""
+Compositor Module
+Mirrors camera frames and blends the canvas over them into pooled buffers
+"""
+
+import cv2
+from utils.frame_pool import FrameBufferPool
+
+
+class Compositor:
+    """Per-frame image stages that write into reused buffers"""
+
+    def __init__(self, pool=None):
+        self.pool = pool or FrameBufferPool()
+
+    def mirror(self, frame):
+        """
+        Flip a frame horizontally into the 'mirror' buffer
+
+        Args:
+            frame: BGR camera frame
+
+        Returns:
+            Mirrored frame (a pooled buffer, overwritten next frame)
+        """
+        mirrored = self.pool.get('mirror', frame.shape)
+        cv2.flip(frame, 1, dst=mirrored)
+        return mirrored
+
+    def compose(self, frame, canvas_view, blend_mode, flip=False):
+        """
+        Combine the camera frame with the canvas
+
+        Args:
+            frame: Camera frame (BGR)
+            canvas_view: Canvas image of the same shape
+            blend_mode: 'weighted' (semi-transparent frame) or 'overlay'
+                (ink copied over the frame, no float blending)
+            flip: Mirror the frame while writing it to the output, for
+                frames that were not mirrored on capture
+
+        Returns:
+            Composited frame (a pooled buffer, overwritten next frame)
+        """
+        output = self.pool.get('composite', frame.shape)
+        source = frame
+        if flip:
+            cv2.flip(frame, 1, dst=output)
+            source = output
+
+        if blend_mode == 'overlay':
+            if source is not output:
+                output[:] = source
+            ink_mask = self.pool.get('ink_mask', canvas_view.shape[:2])
+            cv2.cvtColor(canvas_view, cv2.COLOR_BGR2GRAY, dst=ink_mask)
+            cv2.copyTo(canvas_view, ink_mask, output)
+            return output
+
+        # Make frame semi-transparent
+        cv2.addWeighted(source, 0.5, canvas_view, 0.8, 0, dst=output)
+        return output
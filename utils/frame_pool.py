@@ -0,0 +1,37 @@
+"""
+Frame Pool Module
+Named, reusable image buffers so the per-frame path does not allocate
+"""
+
+import numpy as np
+
+
+class FrameBufferPool:
+    """Hands out preallocated buffers by name, reallocating only on resize"""
+
+    def __init__(self):
+        self.buffers = {}
+        self.allocations = 0  # Number of times a buffer had to be created
+
+    def get(self, name, shape, dtype=np.uint8):
+        """
+        Get the buffer registered under a name
+
+        Args:
+            name: Stage name (e.g. 'mirror', 'composite')
+            shape: Required array shape
+            dtype: Required dtype
+
+        Returns:
+            Numpy array with the requested shape (contents are stale)
+        """
+        buffer = self.buffers.get(name)
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = np.empty(shape, dtype=dtype)
+            self.buffers[name] = buffer
+            self.allocations += 1
+        return buffer
+
+    def nbytes(self):
+        """Total bytes held by the pool"""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
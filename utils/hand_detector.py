@@ -4,24 +4,84 @@ Handles hand tracking using MediaPipe
 """
 
 import cv2
-import mediapipe as mp
-from config.settings import DETECTION_CONFIDENCE, TRACKING_CONFIDENCE, MAX_HANDS
+import numpy as np
+from utils.frame_pool import FrameBufferPool
+from utils.skeleton import SkeletonRenderer
+from config.settings import (
+    DETECTION_CONFIDENCE, TRACKING_CONFIDENCE, MAX_HANDS, MODEL_COMPLEXITY,
+    INFERENCE_SCALE
+)
 
 
 class HandDetector:
     """Detects and tracks hands using MediaPipe"""
     
-    def __init__(self):
+    def __init__(self, model_complexity=MODEL_COMPLEXITY):
+        # MediaPipe is imported here rather than at module level because it
+        # is by far the slowest import of the app
+        import mediapipe as mp
+
         self.mp_hands = mp.solutions.hands
-        self.mp_drawing = mp.solutions.drawing_utils
-        
-        self.hands = self.mp_hands.Hands(
+        self.skeleton = SkeletonRenderer()
+
+        # Reused resize/RGB buffers for inference input
+        self.pool = FrameBufferPool()
+
+        # Fraction of the frame size used for inference (1.0 = full size)
+        self.inference_scale = INFERENCE_SCALE
+        self.model_complexity = model_complexity
+        self.hands = self._create_hands()
+
+    def _create_hands(self):
+        """Build the MediaPipe Hands graph with the current settings"""
+        return self.mp_hands.Hands(
             static_image_mode=False,
             max_num_hands=MAX_HANDS,
+            model_complexity=self.model_complexity,
             min_detection_confidence=DETECTION_CONFIDENCE,
             min_tracking_confidence=TRACKING_CONFIDENCE
         )
-        
+
+    def set_model_complexity(self, model_complexity):
+        """
+        Switch between the lite (0) and full (1) hand model
+
+        Args:
+            model_complexity: MediaPipe model complexity
+        """
+        if model_complexity == self.model_complexity:
+            return
+        # Build the new graph first, so a failure keeps the old one working
+        previous = self.model_complexity
+        self.model_complexity = model_complexity
+        try:
+            hands = self._create_hands()
+        except Exception:
+            self.model_complexity = previous
+            raise
+        self.hands.close()
+        self.hands = hands
+
+    def set_inference_scale(self, scale):
+        """
+        Run inference on a downscaled copy of the frame
+
+        Args:
+            scale: Fraction of the frame size (landmarks stay in full-frame
+                coordinates because MediaPipe returns normalized values)
+        """
+        self.inference_scale = max(0.1, min(1.0, scale))
+
+    def warm_up(self, frame_shape):
+        """
+        Run one inference on a blank frame so the first real detection
+        does not pay for graph initialization
+
+        Args:
+            frame_shape: Shape of the frames that will be processed
+        """
+        self.find_hands(np.zeros(frame_shape, dtype=np.uint8), draw=False)
+
     def find_hands(self, frame, draw=True):
         """
         Detect hands in the frame
@@ -34,23 +94,46 @@ class HandDetector:
             frame: Frame with landmarks drawn (if draw=True)
             results: MediaPipe results object
         """
-        # Convert BGR to RGB
-        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Downscale for inference if requested
+        small = frame
+        if self.inference_scale < 1.0:
+            h, w = frame.shape[:2]
+            size = (max(1, int(w * self.inference_scale)),
+                    max(1, int(h * self.inference_scale)))
+            small = self.pool.get('inference_small', (size[1], size[0], 3))
+            cv2.resize(frame, size, dst=small, interpolation=cv2.INTER_AREA)
+
+        # Convert BGR to RGB (into a reused buffer)
+        rgb = self.pool.get('inference_rgb', small.shape)
+        cv2.cvtColor(small, cv2.COLOR_BGR2RGB, dst=rgb)
         
         # Process the frame
         results = self.hands.process(rgb)
         
         # Draw landmarks if hands detected
-        if results.multi_hand_landmarks and draw:
-            for hand_landmarks in results.multi_hand_landmarks:
-                self.mp_drawing.draw_landmarks(
-                    frame,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS
-                )
+        if draw:
+            self.draw_hands(frame, results)
         
         return frame, results
     
+    def draw_hands(self, frame, results):
+        """
+        Draw detected hand landmarks onto the frame
+
+        Args:
+            frame: BGR image to draw on
+            results: MediaPipe results object
+        """
+        if results.multi_hand_landmarks:
+            h, w = frame.shape[:2]
+            points = np.array(
+                [[(lm.x, lm.y) for lm in hand_landmarks.landmark]
+                 for hand_landmarks in results.multi_hand_landmarks],
+                dtype=np.float32
+            ) * (w, h)
+            self.skeleton.draw(frame, points)
+        return frame
+
     def get_landmarks(self, results, frame_shape):
         """
         Extract landmark positions from results
@@ -0,0 +1,198 @@
+"""
+Idle Gate Module
+Skips hand detection while the scene is static and no hand has been seen
+for a while, and wakes up on the first frame that shows motion
+
+Motion is checked on a tiny grayscale copy of the frame against a slowly
+updated background, so camera noise is averaged away, lighting drift is
+absorbed, and a hand that creeps in slowly still stands out. The copy is
+made from a sparse sample of the frame (every few pixels) so the check
+costs tens of microseconds instead of a full pass over the frame.
+"""
+
+import time
+
+import cv2
+import numpy as np
+from config.settings import (
+    IDLE_TIMEOUT, IDLE_MOTION_SIZE, IDLE_MOTION_THRESHOLD, IDLE_MOTION_AREA,
+    IDLE_BACKGROUND_RATE
+)
+
+
+# Sampled pixels averaged into each pixel of the motion image (per axis)
+SAMPLES_PER_PIXEL = 2
+
+
+class MotionDetector:
+    """Downsampled frame difference against a running background"""
+
+    def __init__(self, size=IDLE_MOTION_SIZE, threshold=IDLE_MOTION_THRESHOLD,
+                 area=IDLE_MOTION_AREA, rate=IDLE_BACKGROUND_RATE):
+        """
+        Args:
+            size: Tuple (width, height) frames are shrunk to
+            threshold: Gray level difference that counts as a changed pixel
+            area: Fraction of changed pixels that counts as motion
+            rate: Weight of each new frame in the background (0.0 - 1.0)
+        """
+        self.size = tuple(size)
+        self.threshold = threshold
+        self.min_pixels = max(1, int(area * self.size[0] * self.size[1]))
+        self.rate = rate
+
+        self.sampled = np.empty((self.size[1] * SAMPLES_PER_PIXEL,
+                                 self.size[0] * SAMPLES_PER_PIXEL, 3), dtype=np.uint8)
+        self.small = np.empty((self.size[1], self.size[0], 3), dtype=np.uint8)
+        self.gray = np.empty((self.size[1], self.size[0]), dtype=np.uint8)
+        self.diff = np.empty_like(self.gray)
+        self.background = None
+
+    def update(self, frame):
+        """
+        Compare a frame with the background, then blend it in
+
+        Args:
+            frame: BGR frame (any size)
+
+        Returns:
+            True if enough of the frame changed
+        """
+        # Sample a grid of pixels, then average blocks of it (shrinking
+        # first also keeps the color conversion tiny)
+        cv2.resize(frame, self.sampled.shape[1::-1], dst=self.sampled,
+                   interpolation=cv2.INTER_NEAREST)
+        cv2.resize(self.sampled, self.size, dst=self.small, interpolation=cv2.INTER_AREA)
+        cv2.cvtColor(self.small, cv2.COLOR_BGR2GRAY, dst=self.gray)
+
+        if self.background is None:
+            self.background = self.gray.astype(np.float32)
+            return False
+
+        cv2.absdiff(self.gray, self.background.astype(np.uint8), dst=self.diff)
+        changed = cv2.countNonZero(cv2.threshold(
+            self.diff, self.threshold, 255, cv2.THRESH_BINARY)[1])
+        cv2.accumulateWeighted(self.gray, self.background, self.rate)
+        return changed >= self.min_pixels
+
+
+class IdleGate:
+    """Decides per frame whether hand detection needs to run"""
+
+    def __init__(self, timeout=IDLE_TIMEOUT, motion=None, clock=time.perf_counter):
+        """
+        Args:
+            timeout: Seconds without motion or hands before going idle
+            motion: MotionDetector to use (a default one if None)
+            clock: Time source in seconds
+        """
+        self.timeout = timeout
+        self.motion = motion or MotionDetector()
+        self.clock = clock
+
+        self.idle = False
+        self.last_activity = None
+
+        # Metrics: wall and CPU seconds spent awake and idle, frames not
+        # sent to detection, and the time from the waking frame's arrival
+        # to its detection result
+        self.seconds = {'awake': 0.0, 'idle': 0.0}
+        self.cpu_seconds = {'awake': 0.0, 'idle': 0.0}
+        self.skipped_frames = 0
+        self.wake_latencies = []
+        self.waking_since = None
+        self.last_sample = None
+
+    def update(self, frame):
+        """
+        Check a frame for motion
+
+        Args:
+            frame: BGR camera frame
+
+        Returns:
+            True if detection should run on this frame
+        """
+        now = self.clock()
+        self._account(now)
+        if self.last_activity is None:
+            self.last_activity = now
+
+        if self.motion.update(frame):
+            self.last_activity = now
+            if self.idle:
+                self.idle = False
+                self.waking_since = now
+                print("👋 Motion: hand detection resumed")
+        elif not self.idle and now - self.last_activity > self.timeout:
+            self.idle = True
+            print("💤 Scene static: hand detection paused")
+
+        if self.idle:
+            self.skipped_frames += 1
+        return not self.idle
+
+    def report_hands(self, found):
+        """
+        Tell the gate the result of detection on the frame it let through
+
+        Args:
+            found: Whether any hand was detected
+        """
+        now = self.clock()
+        if found:
+            self.last_activity = now
+        if self.waking_since is not None:
+            self.wake_latencies.append(now - self.waking_since)
+            self.waking_since = None
+
+    def _account(self, now):
+        """Add the time since the previous frame to the current state"""
+        cpu = time.process_time()
+        if self.last_sample is not None:
+            state = 'idle' if self.idle else 'awake'
+            self.seconds[state] += now - self.last_sample[0]
+            self.cpu_seconds[state] += cpu - self.last_sample[1]
+        self.last_sample = (now, cpu)
+
+    def cpu_usage(self, state):
+        """
+        Process CPU time per second of wall time in a state
+
+        Args:
+            state: 'awake' or 'idle'
+
+        Returns:
+            Fraction of one core (can exceed 1.0 with several threads), or
+            None if no time was spent in the state
+        """
+        if self.seconds[state] <= 0:
+            return None
+        return self.cpu_seconds[state] / self.seconds[state]
+
+    def report(self, title="IDLE GATING"):
+        """
+        Print idle time, CPU use per state and wake-up latency
+
+        Args:
+            title: Heading of the report
+        """
+        total = self.seconds['awake'] + self.seconds['idle']
+        if total <= 0:
+            return
+
+        print("\n" + "="*60)
+        print(f"{title}:")
+        print("="*60)
+        print(f"  idle {self.seconds['idle']:.1f}s of {total:.1f}s "
+              f"({100 * self.seconds['idle'] / total:.0f}%), "
+              f"{self.skipped_frames} frames not sent to detection")
+        for state in ('awake', 'idle'):
+            usage = self.cpu_usage(state)
+            if usage is not None:
+                print(f"  CPU while {state:<5} {100 * usage:>6.1f}% of a core")
+        if self.wake_latencies:
+            latencies = np.array(self.wake_latencies) * 1000
+            print(f"  wake-ups {len(latencies)}: latency mean {latencies.mean():.1f} ms, "
+                  f"max {latencies.max():.1f} ms (motion frame to landmarks)")
+        print("="*60 + "\n")
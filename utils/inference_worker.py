@@ -0,0 +1,125 @@
+"""
+Inference Worker Module
+Runs hand detection in a background thread so rendering never waits on it
+"""
+
+import threading
+
+
+class InferenceWorker:
+    """Single-slot background hand detector"""
+
+    def __init__(self, hand_detector):
+        self.hand_detector = hand_detector
+
+        self._lock = threading.Lock()
+        self._has_work = threading.Event()
+        self._pending_frame = None
+        self._result = None
+        self._busy = False
+        # Model switch waiting for the worker thread (the detector's graph
+        # must not be closed while it is processing a frame)
+        self._pending_complexity = None
+        # Exception of the last failed detection, until the app takes it
+        self._error = None
+        self.failures = 0
+        self._running = True
+
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def is_busy(self):
+        """Whether a frame is currently being processed"""
+        with self._lock:
+            return self._busy
+
+    def submit(self, frame):
+        """
+        Hand a frame to the worker if it is free
+
+        Args:
+            frame: BGR frame (the worker keeps it, so pass a copy)
+
+        Returns:
+            True if the frame was accepted, False if the worker is busy
+        """
+        with self._lock:
+            if self._busy:
+                return False
+            self._busy = True
+            self._pending_frame = frame
+        self._has_work.set()
+        return True
+
+    def poll(self):
+        """
+        Take the latest finished detection
+
+        Returns:
+            Tuple (landmarks_list, frame) or None if nothing new
+        """
+        with self._lock:
+            result = self._result
+            self._result = None
+        return result
+
+    def take_error(self):
+        """
+        Take the exception of the last failed detection
+
+        Returns:
+            The exception, or None if none failed since the last call
+        """
+        with self._lock:
+            error = self._error
+            self._error = None
+        return error
+
+    def set_model_complexity(self, model_complexity):
+        """
+        Switch the detector's model before the next frame it processes
+
+        Args:
+            model_complexity: MediaPipe model complexity
+        """
+        with self._lock:
+            self._pending_complexity = model_complexity
+
+    def _run(self):
+        """Worker loop"""
+        while True:
+            self._has_work.wait()
+            self._has_work.clear()
+            if not self._running:
+                break
+
+            with self._lock:
+                frame = self._pending_frame
+                self._pending_frame = None
+                complexity = self._pending_complexity
+                self._pending_complexity = None
+
+            landmarks_list = None
+            try:
+                if complexity is not None:
+                    self.hand_detector.set_model_complexity(complexity)
+                _, results = self.hand_detector.find_hands(frame, draw=False)
+                landmarks_list = self.hand_detector.get_landmarks(
+                    results, frame.shape)
+            except Exception as error:  # noqa: BLE001 - reported to the app
+                with self._lock:
+                    self._error = error
+                    self.failures += 1
+            finally:
+                # Free for the next frame even if this one failed, or
+                # detection would stop for the rest of the session
+                with self._lock:
+                    if landmarks_list is not None:
+                        self._result = (landmarks_list, frame)
+                    self._busy = False
+
+    def stop(self):
+        """Stop the worker thread"""
+        self._running = False
+        self._has_work.set()
+        self._thread.join(timeout=1.0)
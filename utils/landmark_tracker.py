@@ -0,0 +1,151 @@
+"""
+Landmark Tracker Module
+Fills in hand landmarks on frames where MediaPipe did not run
+"""
+
+import cv2
+import numpy as np
+from utils.frame_pool import FrameBufferPool
+from config.settings import (
+    LANDMARK_OPTICAL_FLOW, MAX_PREDICTED_FRAMES, VELOCITY_DAMPING,
+    FLOW_WINDOW_SIZE, FLOW_PYRAMID_LEVELS
+)
+
+
+class LandmarkTracker:
+    """
+    Predicts landmarks between detections
+
+    Positions are extrapolated from the velocity seen between the last two
+    detections and, when enabled, refined with pyramidal Lucas-Kanade
+    optical flow seeded from the last known landmark positions.
+    """
+
+    def __init__(self, use_optical_flow=LANDMARK_OPTICAL_FLOW,
+                 max_predicted_frames=MAX_PREDICTED_FRAMES):
+        self.use_optical_flow = use_optical_flow
+        self.max_predicted_frames = max_predicted_frames
+
+        # (hands, 21, 2) float arrays in pixel coordinates
+        self.positions = None
+        self.velocities = None
+        self.depths = None
+        # Positions of the last detection (positions holds predictions too)
+        self.detected = None
+
+        self.prev_gray = None
+        self.frames_since_detection = 0
+
+        # Two gray buffers, swapped so prev_gray stays valid
+        self.pool = FrameBufferPool()
+        self.gray_index = 0
+
+        self.lk_params = dict(
+            winSize=(FLOW_WINDOW_SIZE, FLOW_WINDOW_SIZE),
+            maxLevel=FLOW_PYRAMID_LEVELS,
+            criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 10, 0.03)
+        )
+
+    def correct(self, landmarks_list, frame):
+        """
+        Feed a fresh MediaPipe detection
+
+        Args:
+            landmarks_list: List of landmark dictionaries from get_landmarks
+            frame: The BGR frame the detection was made on
+        """
+        if not landmarks_list:
+            self.reset()
+            return
+
+        positions = np.array(
+            [[(lm[idx]['x'], lm[idx]['y']) for idx in sorted(lm)]
+             for lm in landmarks_list],
+            dtype=np.float32
+        )
+        self.depths = [[lm[idx]['z'] for idx in sorted(lm)]
+                       for lm in landmarks_list]
+
+        # Velocity per frame between the last two detections
+        if self.detected is not None and self.detected.shape == positions.shape:
+            frames = max(1, self.frames_since_detection)
+            self.velocities = (positions - self.detected) / frames
+        else:
+            self.velocities = np.zeros_like(positions)
+
+        self.detected = positions
+        self.positions = positions.copy()
+        self.frames_since_detection = 0
+
+        if self.use_optical_flow:
+            self.prev_gray = self._to_gray(frame)
+
+    def predict(self, frame):
+        """
+        Estimate landmarks for a frame without a detection
+
+        Args:
+            frame: Current BGR frame
+
+        Returns:
+            List of landmark dictionaries (empty once the track is too old)
+        """
+        if self.positions is None:
+            return []
+
+        self.frames_since_detection += 1
+        if self.frames_since_detection > self.max_predicted_frames:
+            self.reset()
+            return []
+
+        h, w = frame.shape[:2]
+        predicted = self.positions + self.velocities
+
+        if self.use_optical_flow and self.prev_gray is not None:
+            gray = self._to_gray(frame)
+            points = self.positions.reshape(-1, 1, 2)
+            flowed, status, _ = cv2.calcOpticalFlowPyrLK(
+                self.prev_gray, gray, points, None, **self.lk_params)
+
+            tracked = status.reshape(-1).astype(bool)
+            flat = predicted.reshape(-1, 2)
+            flat[tracked] = flowed.reshape(-1, 2)[tracked]
+            predicted = flat.reshape(self.positions.shape)
+            self.prev_gray = gray
+
+        predicted[..., 0] = np.clip(predicted[..., 0], 0, w - 1)
+        predicted[..., 1] = np.clip(predicted[..., 1], 0, h - 1)
+
+        self.velocities = (predicted - self.positions) * VELOCITY_DAMPING
+        self.positions = predicted
+
+        return self._to_landmarks()
+
+    def _to_gray(self, frame):
+        """Convert to grayscale into the buffer prev_gray is not using"""
+        self.gray_index ^= 1
+        gray = self.pool.get(f'gray_{self.gray_index}', frame.shape[:2])
+        cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY, dst=gray)
+        return gray
+
+    def reset(self):
+        """Forget the current track"""
+        self.positions = None
+        self.velocities = None
+        self.depths = None
+        self.detected = None
+        self.prev_gray = None
+        self.frames_since_detection = 0
+
+    def _to_landmarks(self):
+        """Convert tracked positions back to landmark dictionaries"""
+        landmarks_list = []
+        rounded = np.rint(self.positions).astype(int)
+
+        for hand_points, hand_depths in zip(rounded, self.depths):
+            landmarks = {}
+            for idx, ((x, y), z) in enumerate(zip(hand_points, hand_depths)):
+                landmarks[idx] = {'x': int(x), 'y': int(y), 'z': z}
+            landmarks_list.append(landmarks)
+
+        return landmarks_list
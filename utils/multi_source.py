@@ -0,0 +1,225 @@
+"""
+Multi-Source Module
+Runs one hand detector per camera/video source in worker processes
+"""
+
+import multiprocessing
+import queue
+import time
+from multiprocessing import shared_memory
+
+import cv2
+import numpy as np
+from utils.idle_gate import IdleGate
+from config.settings import CAMERA_WIDTH, CAMERA_HEIGHT, FRAME_RING_SLOTS
+
+
+def _source_worker(source_id, source, shm_name, frame_shape, free_slots,
+                   results, stop_event, idle):
+    """
+    Worker process: capture, mirror and detect for one source
+
+    Frames are written straight into a slot of the shared-memory ring and
+    only the slot index and landmarks go back through the results queue.
+    With idle gating, frames of a static scene skip detection and report
+    no hands.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    ring = np.ndarray((FRAME_RING_SLOTS,) + frame_shape,
+                      dtype=np.uint8, buffer=shm.buf)
+    height, width = frame_shape[:2]
+
+    cap = None
+    detector = None
+    gate = None
+    frame_id = 0
+    try:
+        # Imported here so each worker builds its own MediaPipe graph
+        from utils.hand_detector import HandDetector
+
+        cap = cv2.VideoCapture(source)
+        cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+        detector = HandDetector()
+        detector.warm_up(frame_shape)
+        if idle:
+            gate = IdleGate()
+
+        while not stop_event.is_set():
+            success, frame = cap.read()
+            if not success:
+                break
+
+            # Wait for the main process to hand a slot back
+            try:
+                slot = free_slots.get(timeout=0.5)
+            except queue.Empty:
+                continue
+
+            if frame.shape != frame_shape:
+                frame = cv2.resize(frame, (width, height))
+            cv2.flip(frame, 1, dst=ring[slot])
+
+            landmarks_list = []
+            if gate is None or gate.update(ring[slot]):
+                _, detection = detector.find_hands(ring[slot], draw=False)
+                landmarks_list = detector.get_landmarks(detection, frame_shape)
+                if gate is not None:
+                    gate.report_hands(bool(landmarks_list))
+
+            results.put((source_id, slot, frame_id, landmarks_list, time.time()))
+            frame_id += 1
+    finally:
+        # None slot marks the end of the source
+        results.put((source_id, None, frame_id, None, time.time()))
+        if cap is not None:
+            cap.release()
+        if detector is not None:
+            detector.close()
+        if gate is not None:
+            gate.report(f"IDLE GATING (source {source_id})")
+        del ring
+        shm.close()
+
+
+class MultiSourceDetector:
+    """Process pool with one hand detector per source"""
+
+    def __init__(self, sources, frame_shape=(CAMERA_HEIGHT, CAMERA_WIDTH, 3),
+                 idle=False):
+        self.sources = list(sources)
+        self.frame_shape = tuple(frame_shape)
+
+        ctx = multiprocessing.get_context('spawn')
+        self.stop_event = ctx.Event()
+        self.results = ctx.Queue()
+
+        self.shared_blocks = []
+        self.rings = []
+        self.free_slots = []
+        self.processes = []
+
+        # Latest (slot, frame_id, landmarks_list, timestamp) per source
+        self.latest = [None] * len(self.sources)
+        # Landmarks of every result collected by the last poll, oldest
+        # first (the frames of all but the newest are not kept)
+        self.backlog = [[] for _ in self.sources]
+        self.finished = [False] * len(self.sources)
+        self.frame_counts = [0] * len(self.sources)
+
+        slot_bytes = int(np.prod(self.frame_shape))
+        for source_id, source in enumerate(self.sources):
+            shm = shared_memory.SharedMemory(
+                create=True, size=slot_bytes * FRAME_RING_SLOTS)
+            ring = np.ndarray((FRAME_RING_SLOTS,) + self.frame_shape,
+                              dtype=np.uint8, buffer=shm.buf)
+
+            free_slots = ctx.Queue()
+            for slot in range(FRAME_RING_SLOTS):
+                free_slots.put(slot)
+
+            process = ctx.Process(
+                target=_source_worker,
+                args=(source_id, source, shm.name, self.frame_shape,
+                      free_slots, self.results, self.stop_event, idle),
+                daemon=True
+            )
+            process.start()
+
+            self.shared_blocks.append(shm)
+            self.rings.append(ring)
+            self.free_slots.append(free_slots)
+            self.processes.append(process)
+
+    def poll(self, timeout=0.1):
+        """
+        Collect finished detections from the workers
+
+        Only the newest frame per source is kept; the slots of older
+        results are handed straight back to their worker. Their landmarks
+        stay available from get_backlog().
+
+        Args:
+            timeout: Seconds to wait for the first result
+
+        Returns:
+            List of source ids that have a new frame
+        """
+        updated = set()
+        block = True
+        for backlog in self.backlog:
+            backlog.clear()
+
+        while True:
+            try:
+                item = self.results.get(block=block, timeout=timeout)
+            except queue.Empty:
+                break
+            block = False
+
+            source_id, slot, frame_id, landmarks_list, timestamp = item
+            if slot is None:
+                self.finished[source_id] = True
+                continue
+
+            self._release(source_id)
+            self.latest[source_id] = (slot, frame_id, landmarks_list, timestamp)
+            self.backlog[source_id].append(landmarks_list)
+            self.frame_counts[source_id] += 1
+            updated.add(source_id)
+
+        return sorted(updated)
+
+    def _release(self, source_id):
+        """Return the slot of the current result to its worker"""
+        if self.latest[source_id] is not None:
+            self.free_slots[source_id].put(self.latest[source_id][0])
+            self.latest[source_id] = None
+
+    def get_frame(self, source_id):
+        """
+        Latest frame of a source (a view into shared memory, valid until
+        the next poll)
+        """
+        if self.latest[source_id] is None:
+            return None
+        return self.rings[source_id][self.latest[source_id][0]]
+
+    def get_landmarks(self, source_id):
+        """Latest landmarks list of a source"""
+        if self.latest[source_id] is None:
+            return []
+        return self.latest[source_id][2]
+
+    def get_backlog(self, source_id):
+        """Landmarks lists of every result of a source from the last poll, oldest first"""
+        return self.backlog[source_id]
+
+    def all_finished(self):
+        """Whether every source has ended (video files ran out)"""
+        return all(self.finished)
+
+    def close(self):
+        """Stop workers and free shared memory"""
+        self.stop_event.set()
+        for source_id in range(len(self.sources)):
+            self._release(source_id)
+
+        # Drain so workers blocked on put() can exit
+        deadline = time.time() + 2.0
+        while any(p.is_alive() for p in self.processes) and time.time() < deadline:
+            try:
+                self.results.get(timeout=0.05)
+            except queue.Empty:
+                pass
+
+        for process in self.processes:
+            process.join(timeout=0.5)
+            if process.is_alive():
+                process.terminate()
+
+        self.rings = []
+        for shm in self.shared_blocks:
+            shm.close()
+            shm.unlink()
+        self.shared_blocks = []
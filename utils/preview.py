@@ -0,0 +1,117 @@
+"""
+Preview Module
+Keeps a display-resolution copy of a larger canvas up to date incrementally
+"""
+
+import math
+from fractions import Fraction
+
+import cv2
+import numpy as np
+
+
+class PreviewPyramid:
+    """
+    Chain of downsampled copies of a source image
+
+    Levels halve the source size until the next halving would drop below
+    the display size, and the last level is exactly the display size.
+    Only the dirty rectangle is resampled through each level, so a stroke
+    costs a few small resizes instead of a full-canvas resize per frame.
+    """
+
+    def __init__(self, source_size, display_size):
+        """
+        Args:
+            source_size: Tuple (width, height) of the canvas
+            display_size: Tuple (width, height) of the preview
+        """
+        self.source_size = tuple(source_size)
+        self.display_size = tuple(display_size)
+
+        sizes = []
+        width, height = self.source_size
+        while width // 2 >= self.display_size[0] and height // 2 >= self.display_size[1]:
+            width, height = width // 2, height // 2
+            sizes.append((width, height))
+        if not sizes or sizes[-1] != self.display_size:
+            if self.display_size != self.source_size:
+                sizes.append(self.display_size)
+
+        self.levels = [np.zeros((h, w, 3), dtype=np.uint8) for w, h in sizes]
+        self.dirty = None
+        self.mark_all_dirty()
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """
+        Add a changed source rectangle (half-open, source pixels)
+        """
+        if self.dirty is None:
+            self.dirty = (x0, y0, x1, y1)
+        else:
+            dx0, dy0, dx1, dy1 = self.dirty
+            self.dirty = (min(dx0, x0), min(dy0, y0), max(dx1, x1), max(dy1, y1))
+
+    def mark_all_dirty(self):
+        """Resample everything on the next update"""
+        self.dirty = (0, 0) + self.source_size
+
+    def update(self, source):
+        """
+        Bring the preview up to date with the source
+
+        Args:
+            source: Source image (canvas)
+
+        Returns:
+            Display-resolution image
+        """
+        if not self.levels:
+            return source
+
+        if self.dirty is not None:
+            rect = self._clip(self.dirty, self.source_size)
+            previous = source
+            for level in self.levels:
+                if rect is None:
+                    break
+                rect = self._resample(previous, level, rect)
+                previous = level
+            self.dirty = None
+
+        return self.levels[-1]
+
+    def _resample(self, src, dst, rect):
+        """Resize the part of src covered by rect into dst; return dst rect"""
+        src_h, src_w = src.shape[:2]
+        dst_h, dst_w = dst.shape[:2]
+        ratio_x = Fraction(src_w, dst_w)
+        ratio_y = Fraction(src_h, dst_h)
+
+        # Align to the ratio's denominator so the ROI is resized with exactly
+        # the same ratio as the whole image (same pixels as a full resize)
+        x0, y0, x1, y1 = rect
+        step_x, step_y = ratio_x.denominator, ratio_y.denominator
+        dx0 = int(math.floor(x0 / ratio_x)) // step_x * step_x
+        dy0 = int(math.floor(y0 / ratio_y)) // step_y * step_y
+        dx1 = min(dst_w, -(-int(math.ceil(x1 / ratio_x)) // step_x) * step_x)
+        dy1 = min(dst_h, -(-int(math.ceil(y1 / ratio_y)) // step_y) * step_y)
+        if dx0 >= dx1 or dy0 >= dy1:
+            return None
+
+        sx0, sx1 = int(dx0 * ratio_x), int(dx1 * ratio_x)
+        sy0, sy1 = int(dy0 * ratio_y), int(dy1 * ratio_y)
+
+        cv2.resize(src[sy0:sy1, sx0:sx1], (dx1 - dx0, dy1 - dy0),
+                   dst=dst[dy0:dy1, dx0:dx1], interpolation=cv2.INTER_AREA)
+        return (dx0, dy0, dx1, dy1)
+
+    @staticmethod
+    def _clip(rect, size):
+        """Clip a rectangle to (0, 0, width, height); None if empty"""
+        x0, y0, x1, y1 = rect
+        x0, y0 = max(0, int(x0)), max(0, int(y0))
+        x1, y1 = min(size[0], int(x1)), min(size[1], int(y1))
+        if x0 >= x1 or y0 >= y1:
+            return None
+        return (x0, y0, x1, y1)
@@ -0,0 +1,118 @@
+"""
+Adaptive Quality Module
+Watches frame time and trades visual quality for frame rate when needed
+"""
+
+import time
+from config.settings import (
+    TARGET_FPS, QUALITY_DEGRADE_MARGIN, QUALITY_RESTORE_MARGIN,
+    QUALITY_DEGRADE_FRAMES, QUALITY_RESTORE_FRAMES, QUALITY_FRAME_SMOOTHING,
+    MODEL_COMPLEXITY, INFERENCE_SCALE
+)
+
+
+# Quality levels from best to cheapest. Each level changes one knob so
+# every decision is easy to read in the log. Inference scales are relative
+# to the machine's INFERENCE_SCALE.
+QUALITY_LEVELS = [
+    {'inference_scale': INFERENCE_SCALE, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': True, 'ui_detail': 'full', 'blend_mode': 'weighted'},
+    {'inference_scale': INFERENCE_SCALE, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': False, 'ui_detail': 'full', 'blend_mode': 'weighted'},
+    {'inference_scale': INFERENCE_SCALE, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': False, 'ui_detail': 'low', 'blend_mode': 'weighted'},
+    {'inference_scale': INFERENCE_SCALE, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': False, 'ui_detail': 'low', 'blend_mode': 'overlay'},
+    {'inference_scale': INFERENCE_SCALE * 0.75, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': False, 'ui_detail': 'low', 'blend_mode': 'overlay'},
+    {'inference_scale': INFERENCE_SCALE * 0.5, 'model_complexity': MODEL_COMPLEXITY,
+     'draw_landmarks': False, 'ui_detail': 'low', 'blend_mode': 'overlay'},
+    {'inference_scale': INFERENCE_SCALE * 0.5, 'model_complexity': 0,
+     'draw_landmarks': False, 'ui_detail': 'low', 'blend_mode': 'overlay'},
+]
+
+
+class QualityController:
+    """Degrades and restores quality knobs to hold a target frame rate"""
+
+    def __init__(self, target_fps=TARGET_FPS, levels=QUALITY_LEVELS):
+        self.target_frame_time = 1.0 / target_fps
+        self.levels = levels
+        self.level = 0
+
+        self.avg_frame_time = None
+        self.slow_frames = 0
+        self.fast_frames = 0
+
+        # Every change is kept here as well as printed
+        self.decisions = []
+
+    @property
+    def settings(self):
+        """Knob values for the current quality level"""
+        return self.levels[self.level]
+
+    def update(self, frame_time):
+        """
+        Feed the duration of the last frame
+
+        Args:
+            frame_time: Seconds spent processing the last frame (not
+                waiting for the camera or the display)
+
+        Returns:
+            Settings dictionary if the quality level changed, else None
+        """
+        if self.avg_frame_time is None:
+            self.avg_frame_time = frame_time
+        else:
+            self.avg_frame_time += QUALITY_FRAME_SMOOTHING * \
+                (frame_time - self.avg_frame_time)
+
+        if self.avg_frame_time > self.target_frame_time * QUALITY_DEGRADE_MARGIN:
+            self.slow_frames += 1
+            self.fast_frames = 0
+        elif self.avg_frame_time < self.target_frame_time * QUALITY_RESTORE_MARGIN:
+            self.fast_frames += 1
+            self.slow_frames = 0
+        else:
+            self.slow_frames = 0
+            self.fast_frames = 0
+
+        if self.slow_frames >= QUALITY_DEGRADE_FRAMES and \
+                self.level < len(self.levels) - 1:
+            return self._change_level(self.level + 1)
+
+        if self.fast_frames >= QUALITY_RESTORE_FRAMES and self.level > 0:
+            return self._change_level(self.level - 1)
+
+        return None
+
+    def _change_level(self, new_level):
+        """Switch quality level and log which knobs changed and why"""
+        old = self.levels[self.level]
+        new = self.levels[new_level]
+        changes = [
+            f"{knob} {old[knob]} → {new[knob]}"
+            for knob in new if old[knob] != new[knob]
+        ]
+
+        direction = "↓ degrade" if new_level > self.level else "↑ restore"
+        reason = (f"avg frame {self.avg_frame_time * 1000:.1f} ms, "
+                  f"target {self.target_frame_time * 1000:.1f} ms")
+        message = (f"⚙️  Quality {direction} to level {new_level}: "
+                   f"{', '.join(changes)} ({reason})")
+        print(message)
+
+        self.decisions.append({
+            'time': time.time(),
+            'from_level': self.level,
+            'to_level': new_level,
+            'changes': changes,
+            'avg_frame_time': self.avg_frame_time,
+        })
+
+        self.level = new_level
+        self.slow_frames = 0
+        self.fast_frames = 0
+        return new
@@ -0,0 +1,273 @@
+"""
+Region Map Module
+Connected regions of empty canvas, kept up to date for the bucket fill
+
+The canvas is split into square tiles. The empty (black) pixels of each
+tile are labeled on their own, 4-connected so that a one pixel diagonal
+line still closes a shape, and a graph links the labels of neighboring
+tiles that touch across the tile border. A fill walks that graph from the
+label under the seed to find the tiles its region covers, and flood fills
+only their bounds (cv2.floodFill on the whole canvas allocates a buffer
+the size of the canvas on every call).
+
+Drawing marks the tiles it touches stale. Stale tiles are relabeled a
+few at a time between frames, and any left over when a fill needs the
+map are relabeled then; only their own borders are linked again. A fill
+updates the map for the pixels it paints itself.
+"""
+
+from collections import deque
+
+import cv2
+import numpy as np
+from config.settings import FILL_TILE_SIZE
+
+
+class RegionMap:
+    """Per-tile labels of the empty canvas, linked across tile borders"""
+
+    def __init__(self, size, tile=FILL_TILE_SIZE):
+        """
+        Args:
+            size: Tuple (width, height) of the canvas
+            tile: Tile edge in canvas pixels (at most 256, labels are 16 bit)
+        """
+        self.width, self.height = size
+        self.tile = tile
+        self.rows = -(-self.height // tile)
+        self.cols = -(-self.width // tile)
+
+        # Label of each pixel within its tile (0 = ink). Written a tile at
+        # a time, and not at all for blank tiles
+        self.labels = np.zeros((self.height, self.width), dtype=np.uint16)
+
+        # A region is keyed by tile index * stride + label
+        self.stride = tile * tile
+
+        # Tiles that are entirely empty (one region, label 1 everywhere)
+        self.blank = np.ones((self.rows, self.cols), dtype=bool)
+        # Tiles changed since they were labeled
+        self.stale = np.zeros((self.rows, self.cols), dtype=bool)
+        # Highest label of each tile
+        self.counts = np.ones((self.rows, self.cols), dtype=np.int32)
+        # Region key -> keys of the regions it touches in neighboring tiles
+        self.neighbors = {}
+
+        # Tiles labeled so far (metrics)
+        self.relabeled_tiles = 0
+
+        self.reset()
+
+    def reset(self):
+        """Forget all ink: every tile is blank (call after clearing the canvas)"""
+        self.blank[:] = True
+        self.stale[:] = False
+        self.counts[:] = 1
+        self.neighbors = {}
+        for row in range(self.rows):
+            for col in range(self.cols):
+                key = self._key(row, col, 1)
+                if col > 0:
+                    self._link(self._key(row, col - 1, 1), key)
+                if row > 0:
+                    self._link(self._key(row - 1, col, 1), key)
+
+    def mark_dirty(self, x0, y0, x1, y1):
+        """
+        Mark the tiles under a changed rectangle for relabeling
+
+        Args:
+            x0, y0, x1, y1: Rectangle in canvas pixels (half-open, may
+                extend past the canvas)
+        """
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(self.width, x1), min(self.height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        self.stale[y0 // self.tile:(y1 - 1) // self.tile + 1,
+                   x0 // self.tile:(x1 - 1) // self.tile + 1] = True
+
+    def mark_all_dirty(self):
+        """Relabel every tile before the next fill"""
+        self.stale[:] = True
+
+    def refresh(self, canvas, limit=None):
+        """
+        Relabel stale tiles and link them to their neighbors again
+
+        Args:
+            canvas: BGR canvas the map describes
+            limit: Most tiles to relabel (None = all of them)
+
+        Returns:
+            Number of tiles relabeled
+        """
+        tiles = [tuple(tile) for tile in np.argwhere(self.stale)[:limit]]
+        if not tiles:
+            return 0
+
+        # Every tile is labeled before any border is linked, so both sides
+        # of a border are current. Borders with tiles that are still stale
+        # are linked when those are relabeled
+        for row, col in tiles:
+            self._unlink_tile(row, col)
+            self._label(canvas, row, col)
+            self.stale[row, col] = False
+
+        borders = set()
+        for row, col in tiles:
+            if col > 0 and not self.stale[row, col - 1]:
+                borders.add((row, col, 'v'))
+            if col + 1 < self.cols and not self.stale[row, col + 1]:
+                borders.add((row, col + 1, 'v'))
+            if row > 0 and not self.stale[row - 1, col]:
+                borders.add((row, col, 'h'))
+            if row + 1 < self.rows and not self.stale[row + 1, col]:
+                borders.add((row + 1, col, 'h'))
+        for row, col, kind in borders:
+            self._link_border(row, col, kind)
+
+        self.relabeled_tiles += len(tiles)
+        return len(tiles)
+
+    def fill(self, canvas, seed, color):
+        """
+        Paint the empty region that contains a point
+
+        Args:
+            canvas: BGR canvas to paint
+            seed: Tuple (x, y) in canvas pixels
+            color: BGR color of the fill
+
+        Returns:
+            Tuple (pixels painted, bounding rectangle (x0, y0, x1, y1)), or
+            None if the point is on ink or outside the canvas
+        """
+        x, y = seed
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        self.refresh(canvas)
+
+        row, col = y // self.tile, x // self.tile
+        label = 1 if self.blank[row, col] else int(self.labels[y, x])
+        if label == 0:
+            return None
+
+        # Regions reachable through the tile borders
+        start = self._key(row, col, label)
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            for other in self.neighbors.get(queue.popleft(), ()):
+                if other not in seen:
+                    seen.add(other)
+                    queue.append(other)
+        tiles = {key // self.stride for key in seen}
+        rows = [index // self.cols for index in tiles]
+        cols = [index % self.cols for index in tiles]
+        x0, y0, _, _ = self._tile_rect(min(rows), min(cols))
+        _, _, x1, y1 = self._tile_rect(max(rows), max(cols))
+
+        # The region lies within its tiles' bounds, so the flood fill only
+        # needs that part of the canvas (and a mask of its size)
+        mask = np.zeros((y1 - y0 + 2, x1 - x0 + 2), dtype=np.uint8)
+        # (4-connected, marking the mask with 1)
+        painted = cv2.floodFill(canvas[y0:y1, x0:x1], mask, (x - x0, y - y0), color,
+                                (0, 0, 0), (0, 0, 0), 4 | (1 << 8))[0]
+
+        # Painting black leaves the pixels empty, so the map stays valid
+        if any(color):
+            for key in seen:
+                self._unlink(key)
+            # A blank tile of the region is painted all over
+            for index in tiles:
+                row, col = divmod(index, self.cols)
+                if self.blank[row, col]:
+                    tx0, ty0, tx1, ty1 = self._tile_rect(row, col)
+                    self.labels[ty0:ty1, tx0:tx1] = 0
+                    self.blank[row, col] = False
+            labels = self.labels[y0:y1, x0:x1]
+            cv2.bitwise_and(labels, 0.0, dst=labels, mask=mask[1:-1, 1:-1])
+        return painted, (x0, y0, x1, y1)
+
+    def _key(self, row, col, label):
+        """Region key of a tile's label"""
+        return (row * self.cols + col) * self.stride + label
+
+    def _tile_rect(self, row, col):
+        """Tile bounds (x0, y0, x1, y1) in canvas pixels, half-open"""
+        x0, y0 = col * self.tile, row * self.tile
+        return x0, y0, min(self.width, x0 + self.tile), min(self.height, y0 + self.tile)
+
+    def _label(self, canvas, row, col):
+        """Label the empty pixels of one tile"""
+        x0, y0, x1, y1 = self._tile_rect(row, col)
+        empty = cv2.inRange(canvas[y0:y1, x0:x1], (0, 0, 0), (0, 0, 0))
+        if cv2.countNonZero(empty) == empty.size:
+            self.blank[row, col] = True
+            self.counts[row, col] = 1
+            return
+        count, labels = cv2.connectedComponents(empty, connectivity=4, ltype=cv2.CV_16U)
+        self.labels[y0:y1, x0:x1] = labels
+        self.blank[row, col] = False
+        self.counts[row, col] = count - 1
+
+    def _edge(self, row, col, side):
+        """Labels along one side of a (not blank) tile, as a list"""
+        x0, y0, x1, y1 = self._tile_rect(row, col)
+        if side == 'left':
+            return self.labels[y0:y1, x0].tolist()
+        if side == 'right':
+            return self.labels[y0:y1, x1 - 1].tolist()
+        if side == 'top':
+            return self.labels[y0, x0:x1].tolist()
+        return self.labels[y1 - 1, x0:x1].tolist()
+
+    def _link_border(self, row, col, kind):
+        """
+        Link the regions that touch across one tile border
+
+        Args:
+            row, col: Tile right of ('v') or below ('h') the border
+            kind: 'v' for a vertical border, 'h' for a horizontal one
+        """
+        if kind == 'v':
+            first, sides = (row, col - 1), ('right', 'left')
+        else:
+            first, sides = (row - 1, col), ('bottom', 'top')
+        first_key = self._key(*first, 0)
+        second_key = self._key(row, col, 0)
+        first_blank = self.blank[first]
+        second_blank = self.blank[row, col]
+
+        # Borders are short: plain Python beats array calls here
+        if first_blank and second_blank:
+            pairs = {(1, 1)}
+        elif first_blank:
+            pairs = {(1, label) for label in self._edge(row, col, sides[1]) if label}
+        elif second_blank:
+            pairs = {(label, 1) for label in self._edge(*first, sides[0]) if label}
+        else:
+            pairs = {(label, other) for label, other in zip(
+                self._edge(*first, sides[0]), self._edge(row, col, sides[1]))
+                if label and other}
+        for label, other in pairs:
+            self._link(first_key + label, second_key + other)
+
+    def _link(self, key, other):
+        """Record that two regions touch"""
+        self.neighbors.setdefault(key, set()).add(other)
+        self.neighbors.setdefault(other, set()).add(key)
+
+    def _unlink(self, key):
+        """Remove a region from the graph"""
+        for other in self.neighbors.pop(key, ()):
+            linked = self.neighbors.get(other)
+            if linked is not None:
+                linked.discard(key)
+
+    def _unlink_tile(self, row, col):
+        """Remove all of a tile's regions from the graph"""
+        base = self._key(row, col, 0)
+        for label in range(1, self.counts[row, col] + 1):
+            self._unlink(base + label)
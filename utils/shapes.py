@@ -0,0 +1,409 @@
+"""
+Shapes Module
+Recognizes lines, circles, ellipses, rectangles and polygons in strokes
+
+Fitting is incremental: every point is folded into a 6x6 matrix of conic
+moments (in chunks, with one matrix product each), so the line, circle
+and ellipse fits at the end of a stroke cost the same for ten points or
+ten thousand. A simplified copy of the stroke, also built as the points
+arrive, is used to measure how well each shape fits and to find polygon
+corners.
+"""
+
+import math
+
+import cv2
+import numpy as np
+from utils.strokes import StrokeSimplifier
+from config.settings import (
+    SHAPE_SNAP_TOLERANCE, SHAPE_MIN_SIZE, SHAPE_CLOSE_DISTANCE,
+    SHAPE_MAX_POLYGON_VERTICES, SHAPE_RIGHT_ANGLE_TOLERANCE, SHAPE_LINE_MAX_BOW
+)
+
+# Points buffered before they are folded into the moments
+CHUNK = 64
+
+# Coordinates are taken relative to the first point and divided by this,
+# so fourth-order moments stay well inside float64 precision
+SCALE = 256.0
+
+# A more complex shape must fit this much better to win over a simpler one
+COMPLEXITY = {'circle': 1.0, 'ellipse': 1.2, 'rectangle': 1.2, 'polygon': 1.5}
+
+# Fitting error is measured at these fractions of each simplified segment
+SAMPLES_PER_SEGMENT = np.linspace(0.0, 1.0, 4, endpoint=False)
+
+# At most this many of those samples are used, evenly spread, so the end
+# of a very long stroke does not stall the frame
+MAX_ERROR_SAMPLES = 1024
+
+# A line stroke's sideways bend is measured as the mean offset from the
+# line in this many stretches along it, so jitter averages out
+BOW_SECTIONS = 8
+
+# Stroke blocks copied before they are first drawn on (undo for snapping)
+BACKUP_BLOCK = 64
+
+
+class ShapeFitter:
+    """Incremental shape fit of one stroke"""
+
+    def __init__(self, tolerance):
+        """
+        Args:
+            tolerance: Simplification tolerance for the stroke outline
+                (canvas pixels; about the brush width)
+        """
+        # Sums of d d^T with d = (u^2, uv, v^2, u, v, 1)
+        self.moments = np.zeros((6, 6))
+        self.chunk = np.empty((CHUNK, 2))
+        self.pending = 0
+        self.origin = None
+
+        self.count = 0
+        self.first = None
+        self.last = None
+        self.low = [math.inf, math.inf]
+        self.high = [-math.inf, -math.inf]
+
+        self.tolerance = tolerance
+        self.simplifier = StrokeSimplifier(tolerance)
+        self.outline = []
+
+    def add(self, point):
+        """
+        Add the next stroke point
+
+        Args:
+            point: Tuple (x, y) in canvas pixels
+        """
+        x, y = point
+        if self.origin is None:
+            self.origin = np.array((x, y), dtype=np.float64)
+            self.first = (x, y)
+        self.chunk[self.pending] = (x, y)
+        self.pending += 1
+        if self.pending == CHUNK:
+            self._fold()
+
+        self.count += 1
+        self.last = (x, y)
+        self.low = [min(self.low[0], x), min(self.low[1], y)]
+        self.high = [max(self.high[0], x), max(self.high[1], y)]
+        self.outline += self.simplifier.add((x, y))
+
+    def _fold(self):
+        """Add the buffered points to the moments"""
+        if not self.pending:
+            return
+        u, v = ((self.chunk[:self.pending] - self.origin) / SCALE).T
+        design = np.stack([u * u, u * v, v * v, u, v, np.ones_like(u)], axis=1)
+        self.moments += design.T @ design
+        self.pending = 0
+
+    def fit(self):
+        """
+        Find the shape the stroke approximates (call once, at the end)
+
+        Returns:
+            Shape dictionary with 'kind' ('line', 'circle', 'ellipse',
+            'rectangle' or 'polygon') and its geometry in canvas pixels,
+            or None if no shape is within SHAPE_SNAP_TOLERANCE
+        """
+        self._fold()
+        self.outline += self.simplifier.finish()
+        size = math.hypot(self.high[0] - self.low[0], self.high[1] - self.low[1])
+        if self.count < 5 or size < SHAPE_MIN_SIZE:
+            return None
+
+        outline = np.array([p[:2] for p in self.outline], dtype=np.float64)
+        closed = math.dist(self.first, self.last) <= SHAPE_CLOSE_DISTANCE * size
+        samples = _densify(outline, closed)
+        tolerance = SHAPE_SNAP_TOLERANCE * size
+
+        if not closed:
+            line = self._fit_line()
+            if _rms(_polyline_distance(samples, line['points'], False)) > tolerance:
+                return None
+            # A gently curving stroke can stay within the RMS tolerance;
+            # a line may wobble by the outline's jitter but not bow
+            if _bow(samples, line['points']) > max(SHAPE_LINE_MAX_BOW * size, self.tolerance):
+                return None
+            return line
+
+        candidates = []
+        circle = self._fit_circle()
+        if circle is not None:
+            center, radius = np.array(circle['center']), circle['radius']
+            distance = np.abs(np.linalg.norm(samples - center, axis=1) - radius)
+            candidates.append((circle, _rms(distance)))
+
+        ellipse = self._fit_ellipse()
+        if ellipse is not None:
+            candidates.append((ellipse, _rms(_ellipse_distance(samples, ellipse))))
+
+        polygon = _fit_polygon(outline, size)
+        if polygon is not None:
+            candidates.append((polygon, _rms(
+                _polyline_distance(samples, polygon['points'], True))))
+
+        best = None
+        for shape, error in candidates:
+            if error > tolerance:
+                continue
+            score = error * COMPLEXITY[shape['kind']]
+            if best is None or score < best[1]:
+                best = (shape, score)
+        return best[0] if best else None
+
+    def _fit_line(self):
+        """Total least squares line through the stroke, cut at its ends"""
+        m = self.moments
+        n = m[5, 5]
+        mean = np.array([m[3, 5], m[4, 5]]) / n
+        covariance = np.array([[m[3, 3], m[3, 4]], [m[3, 4], m[4, 4]]]) / n - \
+            np.outer(mean, mean)
+        direction = np.linalg.eigh(covariance)[1][:, 1]
+
+        center = self.origin + mean * SCALE
+        ends = [center + direction * np.dot(np.subtract(p, center), direction)
+                for p in (self.first, self.last)]
+        return {'kind': 'line', 'points': np.array(ends)}
+
+    def _fit_circle(self):
+        """Algebraic (Kasa) circle fit from the moments"""
+        # Rows of w = (u^2 + v^2, u, v, 1) in terms of d
+        to_w = np.array([[1, 0, 1, 0, 0, 0], [0, 0, 0, 1, 0, 0],
+                         [0, 0, 0, 0, 1, 0], [0, 0, 0, 0, 0, 1]], dtype=np.float64)
+        w = to_w @ self.moments @ to_w.T
+        try:
+            d, e, f = np.linalg.solve(w[1:, 1:], -w[1:, 0])
+        except np.linalg.LinAlgError:
+            return None
+        radius_sq = (d * d + e * e) / 4 - f
+        if radius_sq <= 0:
+            return None
+        center = self.origin + np.array((-d / 2, -e / 2)) * SCALE
+        return {'kind': 'circle', 'center': center,
+                'radius': math.sqrt(radius_sq) * SCALE}
+
+    def _fit_ellipse(self):
+        """Direct least squares ellipse fit (Halir-Flusser) from the moments"""
+        s1 = self.moments[:3, :3]
+        s2 = self.moments[:3, 3:]
+        s3 = self.moments[3:, 3:]
+        try:
+            t = -np.linalg.solve(s3, s2.T)
+        except np.linalg.LinAlgError:
+            return None
+        m = s1 + s2 @ t
+        # Premultiply by the inverse of the ellipse constraint 4ac - b^2 = 1
+        m = np.array([m[2] / 2, -m[1], m[0] / 2])
+        _, vectors = np.linalg.eig(m)
+        vectors = np.real(vectors)
+        valid = 4 * vectors[0] * vectors[2] - vectors[1] ** 2 > 0
+        if not valid.any():
+            return None
+        a1 = vectors[:, np.argmax(valid)]
+        a, b, c = a1
+        d, e, f = t @ a1
+
+        # Conic coefficients to center, semi-axes and angle
+        den = b * b - 4 * a * c
+        if den >= 0:
+            return None
+        cx = (2 * c * d - b * e) / den
+        cy = (2 * a * e - b * d) / den
+        common = 2 * (a * e * e + c * d * d - b * d * e + den * f)
+        root = math.hypot(a - c, b)
+        major_sq = common * (a + c - root) / den ** 2
+        minor_sq = common * (a + c + root) / den ** 2
+        if major_sq <= 0 or minor_sq <= 0:
+            return None
+        # Direction of the major axis
+        angle = math.degrees(math.atan2(c - a - root, b)) + 90 if b != 0 else \
+            (0.0 if a < c else 90.0)
+
+        center = self.origin + np.array((cx, cy)) * SCALE
+        axes = (math.sqrt(major_sq) * SCALE, math.sqrt(minor_sq) * SCALE)
+        return {'kind': 'ellipse', 'center': center, 'axes': axes, 'angle': angle}
+
+
+def _fit_polygon(outline, size):
+    """
+    Corners of a closed outline, squared up if it is a rectangle
+
+    Returns:
+        Shape dictionary ('rectangle' or 'polygon') or None
+    """
+    epsilon = 2 * SHAPE_SNAP_TOLERANCE * size
+    corners = cv2.approxPolyDP(outline.astype(np.float32).reshape(-1, 1, 2),
+                               epsilon, True).reshape(-1, 2).astype(np.float64)
+    # The stroke's two ends meet near one corner; keep only one of them
+    if len(corners) > 1 and np.linalg.norm(corners[0] - corners[-1]) < epsilon:
+        corners = corners[:-1]
+    if not 3 <= len(corners) <= SHAPE_MAX_POLYGON_VERTICES:
+        return None
+
+    if len(corners) == 4:
+        edges = np.roll(corners, -1, axis=0) - corners
+        lengths = np.linalg.norm(edges, axis=1)
+        cosines = np.abs(np.sum(edges * np.roll(edges, -1, axis=0), axis=1)) / \
+            np.maximum(lengths * np.roll(lengths, -1), 1e-9)
+        if np.all(cosines <= math.sin(math.radians(SHAPE_RIGHT_ANGLE_TOLERANCE))):
+            box = cv2.boxPoints(cv2.minAreaRect(outline.astype(np.float32)))
+            return {'kind': 'rectangle', 'points': box.astype(np.float64)}
+    return {'kind': 'polygon', 'points': corners}
+
+
+def _densify(outline, closed):
+    """Points spread along the simplified outline for error measurement"""
+    if len(outline) < 2:
+        return outline
+    starts = outline if closed else outline[:-1]
+    ends = np.roll(outline, -1, axis=0) if closed else outline[1:]
+    step = max(1, -(-len(starts) * len(SAMPLES_PER_SEGMENT) // MAX_ERROR_SAMPLES))
+    if step > 1:
+        keep = np.arange(0, len(starts), step)
+        starts, ends = starts[keep], ends[keep]
+    samples = starts[:, None, :] + \
+        SAMPLES_PER_SEGMENT[None, :, None] * (ends - starts)[:, None, :]
+    return samples.reshape(-1, 2)
+
+
+def _polyline_distance(points, vertices, closed):
+    """Distance from each point to the nearest edge of a polyline"""
+    starts = vertices if closed else vertices[:-1]
+    ends = np.roll(vertices, -1, axis=0) if closed else vertices[1:]
+    direction = ends - starts
+    length_sq = np.maximum(np.sum(direction ** 2, axis=1), 1e-12)
+    offsets = points[:, None, :] - starts[None, :, :]
+    t = np.clip(np.sum(offsets * direction, axis=2) / length_sq, 0.0, 1.0)
+    distance = np.linalg.norm(offsets - t[..., None] * direction, axis=2)
+    return distance.min(axis=1)
+
+
+def _bow(points, segment):
+    """Largest mean sideways offset of the points in a stretch along a segment"""
+    start, end = segment
+    length = max(math.dist(start, end), 1e-9)
+    direction = (end - start) / length
+    offsets = points - start
+    along = offsets @ direction
+    across = offsets @ np.array([-direction[1], direction[0]])
+    section = np.clip((along / length * BOW_SECTIONS).astype(int), 0, BOW_SECTIONS - 1)
+    counts = np.bincount(section, minlength=BOW_SECTIONS)
+    sums = np.bincount(section, weights=across, minlength=BOW_SECTIONS)
+    filled = counts > 0
+    return float(np.abs(sums[filled] / counts[filled]).max())
+
+
+def _ellipse_distance(points, ellipse):
+    """Distance from each point to the ellipse, measured along its ray"""
+    angle = math.radians(ellipse['angle'])
+    cos, sin = math.cos(angle), math.sin(angle)
+    offsets = points - ellipse['center']
+    along = offsets[:, 0] * cos + offsets[:, 1] * sin
+    across = -offsets[:, 0] * sin + offsets[:, 1] * cos
+    major, minor = ellipse['axes']
+    rho = np.maximum(np.hypot(along / major, across / minor), 1e-9)
+    return np.hypot(along, across) * np.abs(1.0 - 1.0 / rho)
+
+
+def _rms(distance):
+    """Root mean square of distances"""
+    return float(np.sqrt(np.mean(distance ** 2)))
+
+
+def shape_bounds(shape):
+    """
+    Bounding box of a shape
+
+    Returns:
+        Tuple (x0, y0, x1, y1) of floats in canvas pixels
+    """
+    if shape['kind'] in ('circle', 'ellipse'):
+        reach = shape['radius'] if shape['kind'] == 'circle' else max(shape['axes'])
+        x, y = shape['center']
+        return x - reach, y - reach, x + reach, y + reach
+    points = shape['points']
+    return (points[:, 0].min(), points[:, 1].min(),
+            points[:, 0].max(), points[:, 1].max())
+
+
+def draw_shape(image, shape, color, thickness, offset=(0, 0)):
+    """
+    Draw a shape outline
+
+    Args:
+        image: Image to draw on (modified in place)
+        shape: Shape dictionary from ShapeFitter.fit
+        color: Ink color (BGR tuple, or a value for a mask)
+        thickness: Line thickness in pixels
+        offset: Canvas position of the image's top-left corner
+    """
+    ox, oy = offset
+    kind = shape['kind']
+    if kind == 'circle':
+        x, y = shape['center']
+        cv2.circle(image, (int(round(x - ox)), int(round(y - oy))),
+                   int(round(shape['radius'])), color, thickness)
+    elif kind == 'ellipse':
+        x, y = shape['center']
+        axes = tuple(int(round(axis)) for axis in shape['axes'])
+        cv2.ellipse(image, (int(round(x - ox)), int(round(y - oy))), axes,
+                    shape['angle'], 0, 360, color, thickness)
+    else:
+        points = np.rint(shape['points'] - (ox, oy)).astype(np.int32)
+        cv2.polylines(image, [points], kind != 'line', color, thickness)
+
+
+class RasterBackup:
+    """
+    Copies of the image blocks a stroke has drawn on
+
+    Blocks are copied the first time the stroke reaches them, so restoring
+    them undoes the stroke exactly, whatever was underneath.
+    """
+
+    def __init__(self, image, block=BACKUP_BLOCK):
+        self.image = image
+        self.block = block
+        self.blocks = {}
+
+    def save(self, x0, y0, x1, y1):
+        """
+        Keep the blocks under a rectangle that are not kept yet
+
+        Args:
+            x0, y0, x1, y1: Area about to be drawn on (canvas pixels)
+        """
+        height, width = self.image.shape[:2]
+        x0, y0 = max(0, x0), max(0, y0)
+        x1, y1 = min(width, x1), min(height, y1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        size = self.block
+        for by in range(y0 // size, (y1 - 1) // size + 1):
+            for bx in range(x0 // size, (x1 - 1) // size + 1):
+                if (bx, by) not in self.blocks:
+                    self.blocks[(bx, by)] = self.image[
+                        by * size:(by + 1) * size, bx * size:(bx + 1) * size].copy()
+
+    def restore(self):
+        """
+        Put every kept block back
+
+        Returns:
+            Rectangle (x0, y0, x1, y1) covering the restored blocks, or None
+        """
+        if not self.blocks:
+            return None
+        size = self.block
+        for (bx, by), pixels in self.blocks.items():
+            self.image[by * size:by * size + pixels.shape[0],
+                       bx * size:bx * size + pixels.shape[1]] = pixels
+        xs = [bx for bx, _ in self.blocks]
+        ys = [by for _, by in self.blocks]
+        return (min(xs) * size, min(ys) * size,
+                (max(xs) + 1) * size, (max(ys) + 1) * size)
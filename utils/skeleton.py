@@ -0,0 +1,96 @@
+"""
+Skeleton Module
+Draws hand landmarks and their connections with a few batched OpenCV calls
+"""
+
+import cv2
+import numpy as np
+from config.settings import (
+    SKELETON_LINE_COLOR, SKELETON_LINE_THICKNESS,
+    SKELETON_JOINT_COLOR, SKELETON_JOINT_RADIUS
+)
+
+# MediaPipe's hand connections as (start, end) landmark indices
+HAND_CONNECTIONS = np.array([
+    (0, 1), (1, 2), (2, 3), (3, 4),          # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),          # Index
+    (9, 10), (10, 11), (11, 12),             # Middle
+    (13, 14), (14, 15), (15, 16),            # Ring
+    (0, 17), (17, 18), (18, 19), (19, 20),   # Pinky
+    (5, 9), (9, 13), (13, 17),               # Palm
+], dtype=np.intp)
+
+# Joints are outlined with this color, like MediaPipe's default style
+JOINT_BORDER_COLOR = (224, 224, 224)
+
+
+class SkeletonRenderer:
+    """
+    Hand skeleton overlay
+
+    Every segment of every hand goes into one cv2.polylines call, and the
+    joints go into two more (border, then fill). A zero-length polyline
+    with thickness 2r rasterizes exactly like a filled circle of radius r,
+    so no per-point cv2.circle loop is needed.
+    """
+
+    def __init__(self, line_color=SKELETON_LINE_COLOR,
+                 line_thickness=SKELETON_LINE_THICKNESS,
+                 joint_color=SKELETON_JOINT_COLOR,
+                 joint_radius=SKELETON_JOINT_RADIUS):
+        # Styles are resolved once, not per hand or per landmark
+        self.line_color = tuple(int(c) for c in line_color)
+        self.line_thickness = int(line_thickness)
+        self.joint_color = tuple(int(c) for c in joint_color)
+        self.joint_thickness = 2 * int(joint_radius)
+        self.border_thickness = self.joint_thickness + 2
+
+    def draw(self, frame, points):
+        """
+        Draw one or more hands
+
+        Args:
+            frame: BGR image to draw on (modified in place)
+            points: (hands, 21, 2) array of pixel coordinates
+
+        Returns:
+            The frame
+        """
+        points = np.asarray(points)
+        if points.size == 0:
+            return frame
+        points = np.rint(points.reshape(-1, 21, 2)).astype(np.int32)
+
+        # (hands * connections, 2, 2): one two-point polyline per segment
+        segments = points[:, HAND_CONNECTIONS].reshape(-1, 2, 2)
+        cv2.polylines(frame, list(segments), False,
+                      self.line_color, self.line_thickness)
+
+        # (hands * 21, 2, 2): each joint as a zero-length segment
+        joints = np.repeat(points.reshape(-1, 1, 2), 2, axis=1)
+        joints = list(joints)
+        cv2.polylines(frame, joints, False, JOINT_BORDER_COLOR,
+                      self.border_thickness)
+        cv2.polylines(frame, joints, False, self.joint_color,
+                      self.joint_thickness)
+        return frame
+
+    def draw_landmarks(self, frame, landmarks_list):
+        """
+        Draw hands given as HandDetector.get_landmarks dictionaries
+
+        Args:
+            frame: BGR image to draw on (modified in place)
+            landmarks_list: List of landmark dictionaries
+
+        Returns:
+            The frame
+        """
+        if not landmarks_list:
+            return frame
+        points = np.array(
+            [[(lm[idx]['x'], lm[idx]['y']) for idx in range(21)]
+             for lm in landmarks_list],
+            dtype=np.float32
+        )
+        return self.draw(frame, points)
@@ -0,0 +1,55 @@
+"""
+Startup Profile Module
+Records how long each startup stage takes until the app is really usable
+"""
+
+import time
+
+# Taken when this module is first imported, which main.py does before any
+# heavy import, so it is a good stand-in for process start
+PROCESS_START = time.perf_counter()
+
+
+class StartupProfiler:
+    """Collects named startup milestones relative to process start"""
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.marks = []
+        self.reported = False
+
+    def mark(self, name):
+        """
+        Record a milestone the first time it is reached
+
+        Args:
+            name: Milestone name (e.g. 'first_frame_rendered')
+        """
+        if not self.enabled or self.has(name):
+            return
+        self.marks.append((name, time.perf_counter() - PROCESS_START))
+
+    def has(self, name):
+        """Whether a milestone was already recorded"""
+        return any(mark_name == name for mark_name, _ in self.marks)
+
+    def is_complete(self):
+        """Whether both user-visible milestones have been reached"""
+        return self.has('first_frame_rendered') and self.has('first_detection')
+
+    def report(self):
+        """Print the milestones once (no-op if profiling is disabled)"""
+        if not self.enabled or self.reported:
+            return
+        self.reported = True
+
+        print("\n" + "="*60)
+        print("STARTUP PROFILE (seconds since process start):")
+        print("="*60)
+        previous = 0.0
+        for name, elapsed in sorted(self.marks, key=lambda mark: mark[1]):
+            print(f"  {name:<28} {elapsed:>8.3f}  (+{elapsed - previous:.3f})")
+            previous = elapsed
+        if not self.has('first_detection'):
+            print("  first_detection              (no hand seen)")
+        print("="*60 + "\n")
@@ -0,0 +1,241 @@
+"""
+Stroke Storage Module
+Online stroke simplification and a compact binary stroke format
+
+Per-frame fingertip samples are mostly redundant: along a smooth stroke
+nearly every point lies on the line between its neighbours. The
+simplifier drops those as they arrive, and the codec stores what is left
+as small integer deltas.
+
+File layout (all integers are LEB128 varints, signed ones zigzag-encoded):
+
+    'GDS1', time quantum (microseconds), stroke count
+    per stroke:  flags (bit 0 = eraser), b, g, r, opacity (bytes),
+                 brush size, point count
+    per point:   dx, dy, dticks (signed, from the previous point of any
+                 stroke; timestamps are quantized before differencing so
+                 rounding errors do not accumulate)
+"""
+
+import numpy as np
+from config.settings import (
+    STROKE_SIMPLIFY_TOLERANCE, STROKE_SIMPLIFY_MIN_TOLERANCE,
+    STROKE_SIMPLIFY_WINDOW, STROKE_TIME_QUANTUM
+)
+
+MAGIC = b'GDS1'
+FLAG_ERASER = 1
+
+
+def stroke_tolerance(thickness):
+    """
+    Simplification tolerance for a brush
+
+    Args:
+        thickness: Line thickness in canvas pixels
+
+    Returns:
+        Largest allowed deviation from the drawn path, in canvas pixels
+    """
+    return max(STROKE_SIMPLIFY_MIN_TOLERANCE, thickness * STROKE_SIMPLIFY_TOLERANCE)
+
+
+class StrokeSimplifier:
+    """
+    Incremental Ramer-Douglas-Peucker ("opening window") simplifier
+
+    Points after the last kept vertex are held back while the segment from
+    that vertex to the newest point stays within the tolerance of all of
+    them. When it no longer does, the previous point is kept and becomes
+    the new anchor. At most `window` points are held back, so each new
+    point costs one vectorized distance check over a bounded buffer.
+    """
+
+    def __init__(self, tolerance, window=STROKE_SIMPLIFY_WINDOW):
+        self.tolerance_sq = float(tolerance) ** 2
+        self.window = window
+        self.pending = np.empty((window, 2), dtype=np.float64)
+        self.count = 0
+        self.anchor = None
+        self.last_time = 0.0
+
+    def add(self, point, timestamp=0.0):
+        """
+        Feed the next stroke point
+
+        Args:
+            point: Tuple (x, y)
+            timestamp: Time of the point in seconds
+
+        Returns:
+            List of (x, y, timestamp) vertices that became final (0 or 1)
+        """
+        x, y = point
+        if self.anchor is None:
+            self.anchor = np.array((x, y), dtype=np.float64)
+            return [(x, y, timestamp)]
+
+        kept = []
+        n = self.count
+        if n and (n == self.window or
+                  self._max_distance_sq(self.pending[:n], (x, y)) > self.tolerance_sq):
+            # The previous point is as far as the chord can reach
+            vertex = self.pending[n - 1]
+            kept.append((int(vertex[0]), int(vertex[1]), self.last_time))
+            self.anchor[:] = vertex
+            n = 0
+
+        self.pending[n] = (x, y)
+        self.count = n + 1
+        self.last_time = timestamp
+        return kept
+
+    def finish(self):
+        """
+        End the stroke
+
+        Returns:
+            List of remaining (x, y, timestamp) vertices (the last point)
+        """
+        kept = []
+        if self.count:
+            vertex = self.pending[self.count - 1]
+            kept.append((int(vertex[0]), int(vertex[1]), self.last_time))
+        self.count = 0
+        self.anchor = None
+        return kept
+
+    def _max_distance_sq(self, points, end):
+        """Largest squared distance from points to the segment anchor-end"""
+        direction = np.subtract(end, self.anchor)
+        offsets = points - self.anchor
+        length_sq = direction @ direction
+        if length_sq > 0:
+            t = np.clip(offsets @ direction / length_sq, 0.0, 1.0)
+            offsets = offsets - t[:, None] * direction
+        return np.einsum('ij,ij->i', offsets, offsets).max()
+
+
+def _write_uvarint(out, value):
+    """Append an unsigned LEB128 varint"""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _write_svarint(out, value):
+    """Append a zigzag-encoded signed varint"""
+    _write_uvarint(out, -2 * value - 1 if value < 0 else 2 * value)
+
+
+def _read_uvarint(data, pos):
+    """
+    Read an unsigned varint
+
+    Returns:
+        Tuple (value, position after it)
+    """
+    value = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _read_svarint(data, pos):
+    """Read a zigzag-encoded signed varint"""
+    value, pos = _read_uvarint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def encode_strokes(strokes, quantum=STROKE_TIME_QUANTUM):
+    """
+    Pack strokes into the binary stroke format
+
+    Args:
+        strokes: List of dictionaries with 'color' (BGR), 'brush_size',
+            'opacity', 'eraser' and 'points' (list of (x, y, seconds))
+        quantum: Seconds per stored timestamp tick
+
+    Returns:
+        Bytes
+    """
+    out = bytearray(MAGIC)
+    _write_uvarint(out, int(round(quantum * 1e6)))
+    _write_uvarint(out, len(strokes))
+
+    previous_x = previous_y = previous_tick = 0
+    for stroke in strokes:
+        out.append(FLAG_ERASER if stroke['eraser'] else 0)
+        out.extend(int(c) for c in stroke['color'])
+        out.append(int(round(stroke['opacity'] * 255)))
+        _write_uvarint(out, int(stroke['brush_size']))
+        _write_uvarint(out, len(stroke['points']))
+
+        for x, y, timestamp in stroke['points']:
+            tick = int(round(timestamp / quantum))
+            _write_svarint(out, int(x) - previous_x)
+            _write_svarint(out, int(y) - previous_y)
+            _write_svarint(out, tick - previous_tick)
+            previous_x, previous_y, previous_tick = int(x), int(y), tick
+    return bytes(out)
+
+
+def decode_strokes(data):
+    """
+    Unpack the binary stroke format
+
+    Args:
+        data: Bytes written by encode_strokes
+
+    Returns:
+        List of stroke dictionaries (timestamps rounded to the quantum)
+    """
+    if data[:4] != MAGIC:
+        raise ValueError("Not a stroke file")
+    quantum, pos = _read_uvarint(data, 4)
+    quantum /= 1e6
+    count, pos = _read_uvarint(data, pos)
+
+    strokes = []
+    x = y = tick = 0
+    for _ in range(count):
+        flags, b, g, r, opacity = data[pos:pos + 5]
+        pos += 5
+        brush_size, pos = _read_uvarint(data, pos)
+        length, pos = _read_uvarint(data, pos)
+
+        points = []
+        for _ in range(length):
+            dx, pos = _read_svarint(data, pos)
+            dy, pos = _read_svarint(data, pos)
+            dt, pos = _read_svarint(data, pos)
+            x, y, tick = x + dx, y + dy, tick + dt
+            points.append((x, y, round(tick * quantum, 6)))
+
+        strokes.append({
+            'color': (b, g, r),
+            'brush_size': brush_size,
+            'opacity': opacity / 255,
+            'eraser': bool(flags & FLAG_ERASER),
+            'points': points,
+        })
+    return strokes
+
+
+def save_strokes(filename, strokes):
+    """Write strokes to a binary stroke file"""
+    with open(filename, 'wb') as f:
+        f.write(encode_strokes(strokes))
+    return filename
+
+
+def load_strokes(filename):
+    """Read strokes from a binary stroke file"""
+    with open(filename, 'rb') as f:
+        return decode_strokes(f.read())
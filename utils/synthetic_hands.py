@@ -0,0 +1,234 @@
+"""
+Synthetic Hands Module
+Builds plausible 21-point hand landmarks without a camera
+"""
+
+import numpy as np
+from config.settings import INDEX_TIP, CAMERA_WIDTH, CAMERA_HEIGHT
+
+# Fingers extended for each gesture [thumb, index, middle, ring, pinky]
+# (the same patterns GestureRecognizer looks for)
+GESTURE_FINGERS = {
+    'DRAW': [0, 1, 0, 0, 0],
+    'SELECT': [0, 1, 1, 0, 0],
+    'CLEAR': [1, 1, 1, 1, 1],
+    'ADJUST': [1, 1, 0, 0, 0],
+    'PAN': [0, 1, 1, 1, 0],
+    'NONE': [0, 0, 0, 0, 0],
+}
+
+# Knuckle (MCP) positions relative to the wrist, in hand-size units with y
+# pointing down; x is multiplied by the thumb side
+_KNUCKLES = [(0.30, -0.95), (0.05, -1.00), (-0.20, -0.95), (-0.42, -0.85)]
+
+# Joint offsets from the knuckle (PIP, DIP, TIP) for an extended finger
+# and for a folded one (tip curled back below the PIP joint)
+_EXTENDED = [(0.0, -0.40), (0.0, -0.65), (0.0, -0.85)]
+_FOLDED = [(0.0, -0.30), (0.0, -0.18), (0.0, -0.08)]
+
+# Thumb CMC and MCP, then IP and TIP when out or tucked in
+_THUMB_BASE = [(0.25, -0.20), (0.45, -0.40)]
+_THUMB_OUT = [(0.65, -0.55), (0.85, -0.70)]
+_THUMB_IN = [(0.50, -0.60), (0.32, -0.68)]
+
+# (gesture, mirrored) -> unit-size pose
+_TEMPLATES = {}
+
+
+def _template(gesture, mirrored):
+    """Unit-size pose with the index fingertip at the origin (cached)"""
+    key = (gesture, mirrored)
+    if key not in _TEMPLATES:
+        thumb, *fingers = GESTURE_FINGERS[gesture]
+        # GestureRecognizer reads an extended thumb as pointing left when
+        # the view is mirrored and right when it is not
+        side = -1.0 if mirrored else 1.0
+
+        points = [(0.0, 0.0)]
+        points += _THUMB_BASE + (_THUMB_OUT if thumb else _THUMB_IN)
+        for (kx, ky), up in zip(_KNUCKLES, fingers):
+            points.append((kx, ky))
+            for dx, dy in (_EXTENDED if up else _FOLDED):
+                points.append((kx + dx, ky + dy))
+
+        points = np.array(points, dtype=np.float32)
+        points[:, 0] *= side
+        points -= points[INDEX_TIP]
+        _TEMPLATES[key] = points
+    return _TEMPLATES[key]
+
+
+def hand_points(gesture, tip, hand_size=120, mirrored=True):
+    """
+    Lay out the 21 landmarks of an upright hand making a gesture
+
+    Args:
+        gesture: Key of GESTURE_FINGERS
+        tip: Tuple (x, y) where the index fingertip should be
+        hand_size: Wrist to middle knuckle distance in pixels
+        mirrored: Whether the view is mirrored (decides the thumb side)
+
+    Returns:
+        (21, 2) float array of pixel coordinates
+    """
+    return _template(gesture, mirrored) * hand_size + \
+        np.asarray(tip, dtype=np.float32)
+
+
+def to_landmarks(points):
+    """
+    Convert landmark coordinates to the HandDetector.get_landmarks format
+
+    Args:
+        points: (21, 2) array of pixel coordinates
+
+    Returns:
+        Landmark dictionary {index: {'x', 'y', 'z'}}
+    """
+    landmarks = {}
+    for idx, (x, y) in enumerate(np.rint(points).astype(int)):
+        # Fingertips sit slightly closer to the camera than the wrist
+        landmarks[idx] = {'x': int(x), 'y': int(y), 'z': -0.01 * (idx % 4)}
+    return landmarks
+
+
+class SyntheticHandStream:
+    """
+    Endless stream of landmark frames for one or more moving hands
+
+    Each hand holds a gesture for a random time, morphs into the next one,
+    wanders around the frame, jitters like real landmarks and sometimes
+    disappears for a few frames as if occluded. Durations are given in
+    seconds, so the same stream can be sampled at any frame rate.
+    """
+
+    def __init__(self, hands=1, rate=30, gestures=('DRAW', 'SELECT', 'CLEAR'),
+                 hold=(0.5, 2.0), transition=0.15, noise=1.5, dropout=0.01,
+                 dropout_frames=(3, 15), hand_size=(90, 150), max_speed=900,
+                 frame_size=(CAMERA_WIDTH, CAMERA_HEIGHT), mirrored=True,
+                 seed=None):
+        """
+        Args:
+            hands: Number of hands
+            rate: Frames per second the stream is sampled at
+            gestures: Gestures each hand cycles through (random order)
+            hold: (min, max) seconds a gesture is held
+            transition: Seconds spent morphing between two gestures
+            noise: Standard deviation of per-landmark jitter in pixels
+            dropout: Chance per frame that a visible hand gets occluded
+            dropout_frames: (min, max) frames an occlusion lasts
+            hand_size: (min, max) wrist to middle knuckle distance in pixels
+            max_speed: Fastest fingertip movement in pixels per second
+            frame_size: Tuple (width, height) of the frame
+            mirrored: Whether the view is mirrored (decides the thumb side)
+            seed: Random seed for a repeatable stream
+        """
+        self.rng = np.random.default_rng(seed)
+        self.rate = rate
+        self.gestures = list(gestures)
+        self.hold = hold
+        self.transition_frames = max(1, int(round(transition * rate)))
+        self.noise = noise
+        self.dropout = dropout
+        self.dropout_frames = dropout_frames
+        self.max_speed = max_speed
+        self.mirrored = mirrored
+
+        width, height = frame_size
+        self.sizes = self.rng.uniform(*hand_size, size=hands).astype(np.float32)
+        # Keep the whole hand (which hangs below the fingertip) in frame
+        self.low = np.stack([self.sizes, self.sizes * 0.2], axis=1)
+        self.high = np.stack([width - self.sizes, height - self.sizes * 2.0],
+                             axis=1)
+
+        self.tips = self.rng.uniform(self.low, self.high).astype(np.float32)
+        self.velocities = np.zeros((hands, 2), dtype=np.float32)
+
+        self.current = [str(self.rng.choice(self.gestures)) for _ in range(hands)]
+        self.target = list(self.current)
+        self.hold_left = [self._hold_frames() for _ in range(hands)]
+        self.transition_left = [0] * hands
+        self.hidden_left = [0] * hands
+
+        # Ids of the hands in the last frame, in landmarks_list order
+        self.visible_hands = []
+
+    def _hold_frames(self):
+        """Random number of frames to hold a gesture"""
+        return max(1, int(self.rng.uniform(*self.hold) * self.rate))
+
+    def _advance_gestures(self, hand):
+        """Step one hand's gesture schedule"""
+        if self.transition_left[hand]:
+            self.transition_left[hand] -= 1
+            if not self.transition_left[hand]:
+                self.current[hand] = self.target[hand]
+                self.hold_left[hand] = self._hold_frames()
+            return
+
+        self.hold_left[hand] -= 1
+        if self.hold_left[hand] <= 0 and len(self.gestures) > 1:
+            choices = [g for g in self.gestures if g != self.current[hand]]
+            self.target[hand] = str(self.rng.choice(choices))
+            self.transition_left[hand] = self.transition_frames
+
+    def _advance_motion(self):
+        """Random-walk every fingertip, bouncing off the frame edges"""
+        dt = 1.0 / self.rate
+        self.velocities += self.rng.normal(
+            0, self.max_speed * 2, self.velocities.shape).astype(np.float32) * dt
+        speed = np.linalg.norm(self.velocities, axis=1, keepdims=True)
+        self.velocities *= np.minimum(1.0, self.max_speed / np.maximum(speed, 1e-6))
+
+        self.tips += self.velocities * dt
+        outside = (self.tips < self.low) | (self.tips > self.high)
+        self.velocities[outside] *= -1
+        np.clip(self.tips, self.low, self.high, out=self.tips)
+
+    def next_frame(self):
+        """
+        Produce the next frame of landmarks
+
+        Returns:
+            Tuple (landmarks_list, labels): landmark dictionaries of the
+            visible hands (HandDetector.get_landmarks format) and the
+            gesture each one is making, or 'TRANSITION' while morphing
+        """
+        self._advance_motion()
+
+        poses = []
+        labels = []
+        visible = []
+        for hand in range(len(self.current)):
+            self._advance_gestures(hand)
+
+            if self.hidden_left[hand]:
+                self.hidden_left[hand] -= 1
+                continue
+            if self.rng.random() < self.dropout:
+                self.hidden_left[hand] = int(self.rng.integers(
+                    self.dropout_frames[0], self.dropout_frames[1] + 1))
+                continue
+
+            pose = _template(self.current[hand], self.mirrored)
+            if self.transition_left[hand]:
+                t = 1.0 - self.transition_left[hand] / (self.transition_frames + 1)
+                pose = (1.0 - t) * pose + \
+                    t * _template(self.target[hand], self.mirrored)
+                labels.append('TRANSITION')
+            else:
+                labels.append(self.current[hand])
+            poses.append(pose)
+            visible.append(hand)
+
+        self.visible_hands = visible
+        if not poses:
+            return [], []
+
+        # All visible hands are scaled, placed and jittered in one go
+        points = np.stack(poses) * self.sizes[visible, None, None] + \
+            self.tips[visible, None, :]
+        if self.noise:
+            points += self.rng.normal(0, self.noise, points.shape)
+
+        return [to_landmarks(hand) for hand in points], labels
@@ -0,0 +1,288 @@
+"""
+Tiled Canvas Module
+Large sparse drawing surface with a pan/zoom viewport
+"""
+
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+from config.settings import (
+    CAMERA_WIDTH, CAMERA_HEIGHT, TILE_SIZE, ZOOM_LEVELS, DEFAULT_ZOOM_INDEX,
+    TILE_CACHE_SIZE
+)
+from utils.canvas import Canvas
+from utils.preview import PreviewPyramid
+
+
+class TiledCanvas(Canvas):
+    """
+    Canvas stored as fixed-size tiles that exist only where there is ink
+
+    Drawing points arrive in screen (viewport) coordinates and are mapped
+    to world coordinates through the current pan offset and zoom. The
+    viewport image returned by get_canvas() is assembled from tiles that
+    were scaled to the current zoom level, which are kept in an LRU cache.
+    """
+
+    # The dense buffer is only the viewport: regions run on past its edges
+    supports_fill = False
+
+    def __init__(self):
+        # The dense buffer is only the viewport, sized like the display
+        super().__init__(CAMERA_WIDTH, CAMERA_HEIGHT)
+
+        # (tile_x, tile_y) -> TILE_SIZE x TILE_SIZE BGR array
+        self.tiles = {}
+
+        # Viewport: world coordinates of the screen's top-left corner
+        self.offset_x = 0.0
+        self.offset_y = 0.0
+        self.zoom_index = DEFAULT_ZOOM_INDEX
+
+        # (tile_key, zoom_index) -> tile scaled to that zoom level
+        self.tile_cache = OrderedDict()
+
+        # self.canvas is the viewport buffer; repaint only what changed
+        self.view_dirty = True
+        self.dirty_tiles = set()
+
+    @property
+    def zoom(self):
+        """Current zoom factor"""
+        return ZOOM_LEVELS[self.zoom_index]
+
+    def set_display_size(self, width, height):
+        """
+        Resize the viewport to match the display
+
+        Args:
+            width: Display (camera frame) width in pixels
+            height: Display (camera frame) height in pixels
+        """
+        if self.display_size == (width, height):
+            return
+        self.display_size = (width, height)
+        self.width, self.height = width, height
+        self.canvas = np.zeros((height, width, 3), dtype=np.uint8)
+        # Display sized, so it has no levels and passes the viewport through
+        self.preview = PreviewPyramid((width, height), self.display_size)
+        self.previous_point = None
+        self.view_dirty = True
+
+    def screen_to_world(self, point):
+        """
+        Convert a viewport point to world coordinates
+
+        Args:
+            point: Tuple (x, y) in screen pixels
+
+        Returns:
+            Tuple (x, y) of floats in world pixels
+        """
+        return (self.offset_x + point[0] / self.zoom,
+                self.offset_y + point[1] / self.zoom)
+
+    def clear(self):
+        """Clear the canvas (drops every tile)"""
+        self.tiles = {}
+        self.tile_cache.clear()
+        self.dirty_tiles.clear()
+        self.view_dirty = True
+        self.previous_point = None
+
+    def draw(self, point):
+        """
+        Draw on the tiles under a stroke segment (or erase)
+
+        Args:
+            point: Tuple (x, y) of the drawing point in screen pixels
+        """
+        if point is None:
+            self.previous_point = None
+            return
+
+        draw_color = (0, 0, 0) if self.eraser_mode else self.current_color
+        thickness = self.brush_size if not self.eraser_mode else self.brush_size * 2
+        # Brush size is in screen pixels, so it stays the same on screen
+        thickness = max(1, int(round(thickness / self.zoom)))
+
+        end = self.screen_to_world(point)
+        start = self.screen_to_world(self.previous_point) \
+            if self.previous_point is not None else end
+        is_segment = self.previous_point is not None
+
+        pad = thickness + 1
+        tx0 = int((min(start[0], end[0]) - pad) // TILE_SIZE)
+        ty0 = int((min(start[1], end[1]) - pad) // TILE_SIZE)
+        tx1 = int((max(start[0], end[0]) + pad) // TILE_SIZE)
+        ty1 = int((max(start[1], end[1]) + pad) // TILE_SIZE)
+
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                key = (tx, ty)
+                tile = self.tiles.get(key)
+                if tile is None:
+                    # Erasing empty space never allocates
+                    if self.eraser_mode:
+                        continue
+                    tile = np.zeros((TILE_SIZE, TILE_SIZE, 3), dtype=np.uint8)
+                    self.tiles[key] = tile
+
+                origin_x = tx * TILE_SIZE
+                origin_y = ty * TILE_SIZE
+                local_start = (int(round(start[0] - origin_x)),
+                               int(round(start[1] - origin_y)))
+                local_end = (int(round(end[0] - origin_x)),
+                             int(round(end[1] - origin_y)))
+
+                self._stamp(tile, local_start, local_end, is_segment,
+                            draw_color, thickness)
+                self._invalidate_tile(key)
+
+        self.previous_point = point
+
+    def _stamp(self, tile, start, end, is_segment, draw_color, thickness):
+        """Draw a segment (or dot) on one tile, clipped by OpenCV"""
+        start = start if is_segment else None
+        if self.opacity >= 1.0 or self.eraser_mode:
+            # A dot is the line's round cap, as on the plain canvas
+            cv2.line(tile, start if start is not None else end, end,
+                     draw_color, thickness)
+            return
+
+        # The shared point of two segments rounds to the same tile pixel,
+        # so the later one clears the cap the earlier one blended
+        self._draw_translucent(start, end, draw_color, thickness, self.opacity,
+                               image=tile)
+
+    def _invalidate_tile(self, key):
+        """Drop cached renders of a tile and queue it for repaint"""
+        for zoom_index in range(len(ZOOM_LEVELS)):
+            self.tile_cache.pop((key, zoom_index), None)
+        self.dirty_tiles.add(key)
+
+    def pan(self, dx, dy):
+        """
+        Move the viewport so the content follows a drag
+
+        Args:
+            dx, dy: Drag distance in screen pixels
+        """
+        if dx == 0 and dy == 0:
+            return
+        self.offset_x -= dx / self.zoom
+        self.offset_y -= dy / self.zoom
+        self.view_dirty = True
+
+    def set_zoom(self, zoom_index, center=None):
+        """
+        Change zoom level, keeping the world point under center in place
+
+        Args:
+            zoom_index: Index into ZOOM_LEVELS
+            center: Screen point to zoom around (default: viewport center)
+        """
+        zoom_index = max(0, min(len(ZOOM_LEVELS) - 1, int(zoom_index)))
+        if zoom_index == self.zoom_index:
+            return
+        if center is None:
+            center = (self.width / 2, self.height / 2)
+
+        world_x, world_y = self.screen_to_world(center)
+        self.zoom_index = zoom_index
+        self.offset_x = world_x - center[0] / self.zoom
+        self.offset_y = world_y - center[1] / self.zoom
+
+        # The previous stroke point is in old screen space
+        self.previous_point = None
+        self.view_dirty = True
+
+    def _scaled_tile(self, key):
+        """Get a tile rendered at the current zoom level (LRU cached)"""
+        cache_key = (key, self.zoom_index)
+        scaled = self.tile_cache.get(cache_key)
+        if scaled is not None:
+            self.tile_cache.move_to_end(cache_key)
+            return scaled
+
+        tile = self.tiles[key]
+        size = int(TILE_SIZE * self.zoom)
+        if size == TILE_SIZE:
+            scaled = tile
+        else:
+            interpolation = cv2.INTER_AREA if size < TILE_SIZE else cv2.INTER_NEAREST
+            scaled = cv2.resize(tile, (size, size), interpolation=interpolation)
+
+        self.tile_cache[cache_key] = scaled
+        if len(self.tile_cache) > TILE_CACHE_SIZE:
+            self.tile_cache.popitem(last=False)
+        return scaled
+
+    def _paint_tile(self, key):
+        """Copy the visible part of a scaled tile into the viewport"""
+        size = int(TILE_SIZE * self.zoom)
+        screen_x = int(round((key[0] * TILE_SIZE - self.offset_x) * self.zoom))
+        screen_y = int(round((key[1] * TILE_SIZE - self.offset_y) * self.zoom))
+
+        x0, y0 = max(0, screen_x), max(0, screen_y)
+        x1 = min(self.width, screen_x + size)
+        y1 = min(self.height, screen_y + size)
+        if x0 >= x1 or y0 >= y1:
+            return
+
+        scaled = self._scaled_tile(key)
+        self.canvas[y0:y1, x0:x1] = scaled[y0 - screen_y:y1 - screen_y,
+                                           x0 - screen_x:x1 - screen_x]
+
+    def get_canvas(self):
+        """Get the viewport image (repaints only what changed)"""
+        if self.view_dirty or self.dirty_tiles:
+            # Tile edges do not line up with the viewport, so any repaint
+            # counts as a change of the whole viewport
+            self.changed = (0, 0, self.width, self.height)
+        if self.view_dirty:
+            self.canvas[:] = 0
+            for key in self.tiles:
+                self._paint_tile(key)
+            self.view_dirty = False
+        else:
+            for key in self.dirty_tiles:
+                if key in self.tiles:
+                    self._paint_tile(key)
+        self.dirty_tiles.clear()
+        return self.canvas
+
+    def get_preview(self):
+        """The viewport already is display resolution"""
+        return self.get_canvas()
+
+    def memory_bytes(self):
+        """Bytes held by tiles (grows with ink, not with canvas extent)"""
+        return sum(tile.nbytes for tile in self.tiles.values())
+
+    def save_canvas(self, filename='drawing.png'):
+        """
+        Save all inked tiles at full resolution
+
+        Args:
+            filename: Name of the file to save
+        """
+        if not self.tiles:
+            cv2.imwrite(filename, self.get_canvas())
+            return filename
+
+        xs = [key[0] for key in self.tiles]
+        ys = [key[1] for key in self.tiles]
+        min_x, min_y = min(xs), min(ys)
+        image = np.zeros(
+            ((max(ys) - min_y + 1) * TILE_SIZE, (max(xs) - min_x + 1) * TILE_SIZE, 3),
+            dtype=np.uint8
+        )
+        for (tx, ty), tile in self.tiles.items():
+            x = (tx - min_x) * TILE_SIZE
+            y = (ty - min_y) * TILE_SIZE
+            image[y:y + TILE_SIZE, x:x + TILE_SIZE] = tile
+
+        cv2.imwrite(filename, image)
+        return filename
@@ -0,0 +1,255 @@
+"""
+Timelapse Module
+Records how a drawing develops and encodes it to video in the background
+"""
+
+import multiprocessing
+import queue
+import time
+
+import cv2
+import numpy as np
+from config.settings import (
+    TIMELAPSE_CAPTURE_INTERVAL, TIMELAPSE_SPEEDUP, TIMELAPSE_FPS,
+    TIMELAPSE_FORMAT, TIMELAPSE_MAX_WIDTH, TIMELAPSE_PIP, TIMELAPSE_PIP_SCALE,
+    TIMELAPSE_END_HOLD
+)
+
+# Video codec per container
+FOURCC = {'mp4': 'mp4v', 'avi': 'MJPG'}
+
+
+def _encoder_worker(commands, results):
+    """
+    Worker process: keep the recording and encode it on request
+
+    Patches are stored PNG-compressed and camera thumbnails as JPEG, so a
+    long session costs little memory.
+    """
+    # (time, canvas shape, rect, png patch, jpeg thumbnail)
+    records = []
+
+    while True:
+        command = commands.get()
+        kind = command[0]
+
+        if kind == 'capture':
+            _, timestamp, shape, rect, patch, thumbnail = command
+            if patch is not None:
+                patch = cv2.imencode('.png', patch)[1]
+            if thumbnail is not None:
+                thumbnail = cv2.imencode('.jpg', thumbnail)[1]
+            records.append((timestamp, shape, rect, patch, thumbnail))
+
+        elif kind == 'export':
+            _, filename, speedup, fps, with_pip = command
+            try:
+                frames = _encode(records, filename, speedup, fps, with_pip)
+                results.put(('done', filename, frames))
+            except Exception as error:  # noqa: BLE001 - reported to the app
+                results.put(('failed', filename, str(error)))
+
+        elif kind == 'stop':
+            break
+
+
+def _encode(records, filename, speedup, fps, with_pip):
+    """
+    Replay the records into a video file
+
+    Each output frame advances the session clock by speedup / fps seconds
+    and shows the canvas as it was at that moment.
+
+    Returns:
+        Number of frames written
+    """
+    if not records:
+        return 0
+
+    canvas = None
+    thumbnail = None
+    writer = None
+    output_size = None
+    step = speedup / fps
+    next_time = records[0][0]
+    frames = 0
+
+    def write_frame():
+        nonlocal frames
+        writer.write(_compose(canvas, thumbnail if with_pip else None, output_size))
+        frames += 1
+
+    try:
+        for timestamp, shape, rect, patch, thumb in records:
+            while writer is not None and next_time < timestamp:
+                write_frame()
+                next_time += step
+
+            if canvas is None or canvas.shape != tuple(shape):
+                canvas = np.zeros(shape, dtype=np.uint8)
+            if patch is not None:
+                x0, y0, x1, y1 = rect
+                canvas[y0:y1, x0:x1] = cv2.imdecode(patch, cv2.IMREAD_COLOR)
+            if thumb is not None:
+                thumbnail = cv2.imdecode(thumb, cv2.IMREAD_COLOR)
+
+            if writer is None:
+                height, width = canvas.shape[:2]
+                out_width = min(width, TIMELAPSE_MAX_WIDTH)
+                # Codecs want even dimensions
+                output_size = (out_width // 2 * 2,
+                               int(height * out_width / width) // 2 * 2)
+                extension = filename.rsplit('.', 1)[-1].lower()
+                fourcc = cv2.VideoWriter_fourcc(*FOURCC.get(extension, 'mp4v'))
+                writer = cv2.VideoWriter(filename, fourcc, fps, output_size)
+                if not writer.isOpened():
+                    raise RuntimeError(f"cannot open a video writer for {filename}")
+
+        # Show the finished drawing for a moment
+        for _ in range(max(1, int(TIMELAPSE_END_HOLD * fps))):
+            write_frame()
+    finally:
+        if writer is not None:
+            writer.release()
+    return frames
+
+
+def _compose(canvas, thumbnail, output_size):
+    """Scale the canvas to the output size and add the camera inset"""
+    if (canvas.shape[1], canvas.shape[0]) == output_size:
+        frame = canvas.copy()
+    else:
+        frame = cv2.resize(canvas, output_size, interpolation=cv2.INTER_AREA)
+
+    if thumbnail is not None:
+        width = int(output_size[0] * TIMELAPSE_PIP_SCALE)
+        height = int(thumbnail.shape[0] * width / thumbnail.shape[1])
+        inset = cv2.resize(thumbnail, (width, height), interpolation=cv2.INTER_AREA)
+        x = output_size[0] - width - 10
+        y = output_size[1] - height - 10
+        frame[y:y + height, x:x + width] = inset
+        cv2.rectangle(frame, (x - 1, y - 1), (x + width, y + height),
+                      (255, 255, 255), 2)
+    return frame
+
+
+class TimelapseRecorder:
+    """
+    Session recorder with a background encoder process
+
+    Every TIMELAPSE_CAPTURE_INTERVAL seconds only the canvas area that
+    changed since the last capture is copied and sent to the encoder,
+    together with a small camera thumbnail for the picture-in-picture.
+    Frames in between cost a clock check.
+    """
+
+    def __init__(self, interval=TIMELAPSE_CAPTURE_INTERVAL, pip=TIMELAPSE_PIP):
+        self.interval = interval
+        self.pip = pip
+        self.last_capture = None
+        self.pending_exports = 0
+
+        ctx = multiprocessing.get_context('spawn')
+        self.commands = ctx.Queue()
+        self.results = ctx.Queue()
+        self.process = ctx.Process(target=_encoder_worker,
+                                   args=(self.commands, self.results),
+                                   daemon=True)
+        self.process.start()
+
+    def capture(self, canvas, frame=None):
+        """
+        Record the canvas if a capture is due
+
+        Args:
+            canvas: Canvas being drawn on (after this frame's rendering)
+            frame: Camera frame for the picture-in-picture
+        """
+        self.poll()
+
+        now = time.time()
+        if self.last_capture is not None and now - self.last_capture < self.interval:
+            return
+
+        rect = canvas.pop_changes()
+        if self.last_capture is None:
+            # Start from whatever is already on the canvas
+            rect = (0, 0, canvas.canvas.shape[1], canvas.canvas.shape[0])
+        self.last_capture = now
+
+        patch = None
+        if rect is not None:
+            x0, y0, x1, y1 = rect
+            # Copied: the queue pickles it later, from another thread
+            patch = canvas.canvas[y0:y1, x0:x1].copy()
+
+        thumbnail = None
+        if self.pip and frame is not None:
+            h, w = frame.shape[:2]
+            size = (max(1, int(w * TIMELAPSE_PIP_SCALE)),
+                    max(1, int(h * TIMELAPSE_PIP_SCALE)))
+            # Linear is ~10x cheaper than area resampling; at inset size
+            # the difference does not show
+            thumbnail = cv2.resize(frame, size, interpolation=cv2.INTER_LINEAR)
+
+        if patch is None and thumbnail is None:
+            return
+        self.commands.put(('capture', now, canvas.canvas.shape, rect,
+                           patch, thumbnail))
+
+    def export(self, filename=None, speedup=TIMELAPSE_SPEEDUP, fps=TIMELAPSE_FPS):
+        """
+        Encode everything recorded so far (in the background)
+
+        Args:
+            filename: Output video (default: timelapse_<timestamp>.<format>)
+            speedup: How many times faster than real time
+            fps: Frame rate of the video
+
+        Returns:
+            The output filename
+        """
+        if filename is None:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            filename = f"timelapse_{timestamp}.{TIMELAPSE_FORMAT}"
+        self.commands.put(('export', filename, speedup, fps, self.pip))
+        self.pending_exports += 1
+        print(f"🎬 Encoding timelapse in the background: {filename}")
+        return filename
+
+    def poll(self, timeout=None):
+        """
+        Report finished exports
+
+        Args:
+            timeout: Seconds to wait for one result (None = do not wait)
+        """
+        while self.pending_exports:
+            try:
+                if timeout is None:
+                    status, filename, detail = self.results.get_nowait()
+                else:
+                    status, filename, detail = self.results.get(timeout=timeout)
+            except queue.Empty:
+                return
+            self.pending_exports -= 1
+            if status == 'done':
+                print(f"🎬 Timelapse saved as: {filename} ({detail} frames)")
+            else:
+                print(f"❌ Timelapse export failed for {filename}: {detail}")
+
+    def close(self, export=True, timeout=600):
+        """
+        Stop recording, optionally exporting the session first
+
+        Args:
+            export: Encode the whole session before stopping
+            timeout: Longest wait for pending exports, in seconds
+        """
+        if export and self.last_capture is not None:
+            self.export()
+        if self.pending_exports:
+            print("⏳ Finishing timelapse encoding...")
+            self.poll(timeout=timeout)
+        self.commands.put(('stop',))
+        self.process.join(timeout=5)